@@ -0,0 +1,108 @@
+"""
+Micro benchmark of the software debounce of the binary sensor.
+
+Measures the CPU cost per edge of `BinarySensor._pin_changed` on the mock pin
+factory for every debounce mode, with a burst of contact bounce edges followed
+by a stable level. The settle timers run on a real timer scheduler, its thread
+is kept alive for the whole measurement, so the timings do not include the
+thread startup. The output changes and the settle timer starts are reported
+separately (per burst).
+
+Run from the repository root:
+
+    python -m benchmarks.debounce
+"""
+
+import time
+import timeit
+
+import tests.mocked_modules  # noqa: F401
+from gpiozero import Device
+from tests.test__mocks import MockFactory
+
+import custom_components.gpio_integration._devices as devices
+from custom_components.gpio_integration._debounce import DEBOUNCE_MODES
+from custom_components.gpio_integration._devices import BinarySensor
+from custom_components.gpio_integration._scheduler import Scheduler
+
+BOUNCE_TIME = 0.005
+REPEAT = 200
+BURST_GAP_SEC = 0.1
+
+
+class CountingTimers:
+    """The timer scheduler of the settle jobs, counting the timer starts."""
+
+    def __init__(self):
+        self.scheduler = Scheduler(min_gap_sec=0)
+        # the thread exits without jobs, a job far ahead keeps it running
+        self.scheduler.schedule(lambda: None, 3600, delay_sec=3600)
+        self.starts = 0
+
+    def call_later(self, callback, delay_sec):
+        self.starts += 1
+        return self.scheduler.call_later(callback, delay_sec)
+
+    def cancel(self, job, wait=True):
+        self.scheduler.cancel(job, wait)
+
+
+def bounce_edges(count: int) -> list[tuple[float, int]]:
+    """Contact bounce to high: 0.3ms high and 0.1ms low glitches, ending high."""
+    edges = []
+    ticks = 0.0
+    for index in range(count):
+        state = (index + 1) % 2
+        edges.append((ticks, state))
+        ticks += 0.000_3 if state else 0.000_1
+
+    return edges
+
+
+def bench(mode: str, pin: int, edges, timers: CountingTimers) -> None:
+    device = BinarySensor(pin, bounce_time=BOUNCE_TIME, debounce_mode=mode)
+    changes = []
+    device.on_state_changed = lambda: changes.append(device.last_value)
+    starts = timers.starts
+    # the bursts are BURST_GAP_SEC apart and end on alternate levels, the ticks
+    # of the factory (read by the settle timer) follow the edges
+    clock = [device.pin_factory.ticks()]
+    bursts = [0]
+    device.pin_factory.ticks = lambda: clock[0]
+
+    def run():
+        start = clock[0] + BURST_GAP_SEC
+        flip = bursts[0] % 2
+        bursts[0] += 1
+        for ticks, state in edges:
+            clock[0] = start + ticks
+            device._pin_changed(clock[0], state ^ flip)
+
+    seconds = min(timeit.repeat(run, number=REPEAT, repeat=5)) / REPEAT
+    # the settle of the last burst
+    time.sleep(BOUNCE_TIME * 4)
+    bursts = bursts[0]
+    print(
+        f"{mode:<10} {seconds * 1e6 / len(edges):6.2f} us/edge"
+        f" {len(changes) / bursts:6.2f} output changes/burst"
+        f" {(timers.starts - starts) / bursts:6.2f} timer starts/burst"
+    )
+    device.close()
+
+
+def main() -> None:
+    Device.pin_factory = MockFactory()
+    timers = CountingTimers()
+    devices.get_timer_scheduler = lambda: timers
+    edges = bounce_edges(51)
+    print(f"{len(edges)} edges per burst, {BOUNCE_TIME * 1000}ms bounce time")
+    print("(the factory mode relies on the pin library, so every edge passes here)")
+    for pin, mode in enumerate(DEBOUNCE_MODES, start=1):
+        bench(mode, pin, edges, timers)
+
+    timers.scheduler.shutdown()
+    Device.pin_factory.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Micro benchmark of the DHT22 frame capture and decoding.
+
+Compares the former per edge decoding (a `BitInfo` per edge and
+`dword_from_deque`, kept here as `BitInfoDHT22`) with the `EdgeInputDevice`
+capture mode used by `SingleWireSensor`, that records the raw ticks in a ring
+buffer and decodes the frame in a single pass.
+
+Run from the repository root:
+
+    python -m benchmarks.dht22_decoder
+"""
+
+import timeit
+from collections import deque
+from threading import RLock
+
+import tests.mocked_modules  # noqa: F401
+from gpiozero import Device
+from tests.test__mocks import MockFactory
+
+from custom_components.gpio_integration._devices import (
+    SINGLE_WIRE_FRAME_BITS,
+    SINGLE_WIRE_PROTOCOLS,
+    SingleWireSensor,
+)
+
+FRAME = "00000010 10001100 00000001 01011111 11101110"
+REPEAT = 2000
+
+
+def frame_edges(bits: str) -> list[tuple[float, int]]:
+    """Return the (ticks, state) of every edge the sensor sends for the frame."""
+    levels = [(1, 0.01), (0, 0.000_08), (1, 0.000_08)]
+    for bit in bits.replace(" ", ""):
+        levels.append((0, 0.000_05))
+        levels.append((1, 0.000_026 if bit == "0" else 0.000_07))
+
+    ticks = 0.0
+    edges = []
+    for level, duration in levels:
+        ticks += duration
+        edges.append((ticks, level ^ 1))
+
+    return edges
+
+
+class BitInfo:
+    def __init__(self, state: int, duration_ms: float):
+        self.state = state
+        self.duration_ms = duration_ms
+
+    def check(self, state: int, min_ms: float, max_ms) -> bool:
+        return self.state == state and min_ms <= self.duration_ms <= max_ms
+
+    def between(self, min_ms: float, max_ms: float) -> bool:
+        return min_ms <= self.duration_ms <= max_ms
+
+
+def dword_from_deque(deque: deque[BitInfo], bit_count: int) -> int:
+    dword = 0b0000
+    for _ in range(bit_count):
+        dword <<= 1
+        bit = deque.popleft()
+        if bit.between(0.055, 0.085):
+            dword |= 0b0001
+        elif not bit.between(0.02, 0.035):
+            raise ValueError("Invalid bit duration")
+    return dword
+
+
+class BitInfoDHT22:
+    """The former DHT22 decoding with a `BitInfo` object per edge."""
+
+    def __init__(self, pin_factory):
+        self._ticks_diff = pin_factory.ticks_diff
+        self._lock = RLock()
+        self._deque: deque[BitInfo] = deque(maxlen=SINGLE_WIRE_FRAME_BITS)
+        self.frame = None
+        self.reset()
+
+    def reset(self) -> None:
+        self._deque.clear()
+        self._transfer = False
+        self._state_index = 0
+        self._last_state = 0
+        self._last_event = 0.0
+
+    def _pin_changed(self, ticks: float, state: int):
+        if self._state_index == 0:
+            self._last_state = 1 if state == 0 else 0
+        elif state == self._last_state:
+            raise ValueError("Invalid state change")
+
+        with self._lock:
+            elapsed_ms = self._ticks_diff(ticks, self._last_event) * 1000.0
+            self._state_changed(BitInfo(self._last_state, elapsed_ms))
+            self._last_state = state
+            self._last_event = ticks
+            self._state_index += 1
+
+    def _state_changed(self, info: BitInfo) -> None:
+        if not self._transfer:
+            if info.check(1, 0.07, 0.09):
+                self._transfer = True
+            return
+
+        if info.state == 1:
+            self._deque.append(info)
+            if self._deque.maxlen == len(self._deque):
+                self.frame = (
+                    dword_from_deque(self._deque, 16),
+                    dword_from_deque(self._deque, 16),
+                    dword_from_deque(self._deque, 8),
+                )
+
+
+class Sink:
+    def __init__(self):
+        self.data = None
+
+    def on_data(self, data):
+        self.data = data
+
+
+def bench(name: str, reset, pin_changed, edges) -> None:
+    def run():
+        reset()
+        for ticks, state in edges:
+            pin_changed(ticks, state)
+
+    seconds = min(timeit.repeat(run, number=REPEAT, repeat=5)) / REPEAT
+    print(
+        f"{name:<24} {seconds * 1e6:8.1f} us/frame"
+        f" {seconds * 1e6 / len(edges):6.2f} us/edge"
+    )
+
+
+def main() -> None:
+    Device.pin_factory = MockFactory()
+    edges = frame_edges(FRAME)
+    print(f"{len(edges)} edges per frame")
+
+    legacy = BitInfoDHT22(Device.pin_factory)
+    bench("BitInfo per edge", legacy.reset, legacy._pin_changed, edges)
+    assert legacy.frame is not None
+
+    sink = Sink()
+    device = SingleWireSensor(2, SINGLE_WIRE_PROTOCOLS["DHT22"])
+    device.on_data_received = sink.on_data
+
+    def reset():
+        device._capture.clear(0.0)
+        device._capture_until = 1 + 2 * SINGLE_WIRE_FRAME_BITS
+
+    bench("raw ticks + batch decode", reset, device._capture_edge, edges)
+    assert sink.data is not None
+
+
+if __name__ == "__main__":
+    main()
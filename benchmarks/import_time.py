@@ -0,0 +1,84 @@
+"""
+Import time benchmark of the integration on Home Assistant startup.
+
+Every scenario runs in a fresh interpreter and measures the time to import
+the integration, create the hub of a config entry and import the platforms
+of the entry. The `all modules` scenario imports every controller, schema
+and platform module, as the startup did before the per-type loading. The
+Home Assistant modules are mocked, so only the integration modules are part
+of the measurement.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time
+"""
+
+import statistics
+import subprocess
+import sys
+
+REPEAT = 15
+
+SETUP = """
+import sys
+import time
+import tests.mocked_modules
+from homeassistant.const import CONF_NAME, CONF_PORT
+started = time.perf_counter()
+"""
+
+REPORT = """
+elapsed_ms = (time.perf_counter() - started) * 1000
+modules = [m for m in sys.modules if m.startswith("custom_components.")]
+print(f"{elapsed_ms} {len(modules)}")
+"""
+
+SCENARIOS = {
+    "switch entry": """
+from custom_components.gpio_integration.hub import Hub
+Hub({"type": "switch", CONF_NAME: "Switch", CONF_PORT: 17})
+import custom_components.gpio_integration.switch
+""",
+    "pwm light entry": """
+from custom_components.gpio_integration.hub import Hub
+Hub({"type": "light_pwm_led", CONF_NAME: "Light", CONF_PORT: 18})
+import custom_components.gpio_integration.light
+""",
+    "all modules": """
+import custom_components.gpio_integration.config_flow
+import custom_components.gpio_integration.controllers.cover
+import custom_components.gpio_integration.controllers.sensor
+import custom_components.gpio_integration.binary_sensor
+import custom_components.gpio_integration.cover
+import custom_components.gpio_integration.fan
+import custom_components.gpio_integration.light
+import custom_components.gpio_integration.number
+import custom_components.gpio_integration.sensor
+import custom_components.gpio_integration.switch
+""",
+}
+
+
+def run(code: str) -> tuple[float, int]:
+    output = subprocess.run(
+        [sys.executable, "-c", SETUP + code + REPORT],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    elapsed_ms, modules = output.split()
+    return float(elapsed_ms), int(modules)
+
+
+def main() -> None:
+    print(f"median of {REPEAT} fresh interpreters")
+    for name, code in SCENARIOS.items():
+        # the first run compiles the changed modules
+        run(code)
+        results = [run(code) for _ in range(REPEAT)]
+        elapsed_ms = statistics.median(result[0] for result in results)
+        print(f"{name:<16} {elapsed_ms:7.2f} ms {results[0][1]:3d} modules")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,22 @@
 """Load Platform integration."""
 
+from gpiozero import Factory
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import EVENT_HOMEASSISTANT_STOP, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_HOST, EVENT_HOMEASSISTANT_STOP, Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.typing import ConfigType
 
-from ._pin_factory import cleanup_default_factory, set_config_options
+from ._pin_factory import (
+    PinFactoryProbeStore,
+    PinFactoryUnavailable,
+    acquire_pin_factory,
+    cleanup_default_factory,
+    release_pin_factory,
+    set_config_options,
+    set_pin_factory_lost_listener,
+)
+from ._scheduler import get_scheduler, get_timer_scheduler
 from .core import DOMAIN
 from .hub import Hub
 from .schemas import DOMAIN_DEFAULT_CONFIG
@@ -23,30 +34,79 @@ PLATFORMS = [
 # Schema to validate the configuration for this integration
 CONFIG_SCHEMA = DOMAIN_DEFAULT_CONFIG
 
+DATA_PROBE_STORE = f"{DOMAIN}_probe_store"
+# entry id -> the pigpio factory of the remote host held by the entry
+DATA_PIN_FACTORIES = f"{DOMAIN}_pin_factories"
 
-def setup(hass: HomeAssistant, config: ConfigType) -> bool:
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Raspberry PI GPIO component."""
 
     if DOMAIN in config:
         data = config[DOMAIN]
         set_config_options(data)
 
+    # the pin factory found on the last start is tried first
+    probe_store = PinFactoryProbeStore(hass)
+    await probe_store.async_load()
+    hass.data[DATA_PROBE_STORE] = probe_store
+
+    @callback
+    def reload_host_entries(host: str) -> None:
+        """The devices of a lost pigpio host are created again on a new connection."""
+        for entry_id, hub in hass.data.get(DOMAIN, {}).items():
+            if hub.host == host:
+                hass.async_create_task(hass.config_entries.async_reload(entry_id))
+
+    set_pin_factory_lost_listener(
+        lambda host: hass.loop.call_soon_threadsafe(reload_host_entries, host)
+    )
+
     def cleanup_gpio(event):
         """Stuff to do before stopping."""
+        get_scheduler().shutdown()
+        get_timer_scheduler().shutdown()
         cleanup_default_factory()
 
-    hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, cleanup_gpio)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, cleanup_gpio)
     return True
 
 
+def _create_hub(data: dict) -> tuple[Hub, Factory | None]:
+    """Connect to the host of the entry and create the hub (blocking I/O)."""
+    host = data.get(CONF_HOST) or ""
+    if host == "":
+        return Hub(data), None
+
+    # connect to the remote host before the hub and the platforms create the devices
+    factory = acquire_pin_factory(host)
+    try:
+        return Hub(data), factory
+    except Exception:
+        release_pin_factory(factory)
+        raise
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up from a config entry."""
-    hub = Hub(entry.data)
+    try:
+        # the pigpio connect has no timeout, so it must not block the event loop
+        hub, factory = await hass.async_add_executor_job(_create_hub, entry.data)
+    except PinFactoryUnavailable as error:
+        raise ConfigEntryNotReady(str(error)) from error
+
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = hub
+    if factory is not None:
+        hass.data.setdefault(DATA_PIN_FACTORIES, {})[entry.entry_id] = factory
 
     # This creates each HA object for each platform your device requires.
     # It's done by calling the `async_setup_entry` function in each platform module.
     await hass.config_entries.async_forward_entry_setups(entry, hub.platforms)
+
+    # the platform devices may have discovered the pin factory
+    if DATA_PROBE_STORE in hass.data:
+        await hass.data[DATA_PROBE_STORE].async_save()
+
     return True
 
 
@@ -59,5 +119,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, platforms)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        factory = hass.data.get(DATA_PIN_FACTORIES, {}).pop(entry.entry_id, None)
+        if factory is not None:
+            # other entries of the host may still hold the factory
+            await hass.async_add_executor_job(release_pin_factory, factory)
 
     return unload_ok
@@ -1,9 +1,10 @@
-import datetime
-import threading
+from typing import Callable
 
+from homeassistant.core import callback
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.event import async_call_later
 
+from ._scheduler import ScheduledJob, get_scheduler
 from .core import DOMAIN, get_logger
 
 _LOGGER = get_logger()
@@ -51,53 +52,70 @@ class DeviceMixin:
 
 
 class AutoUpdMixin:
+    """
+    Re-check the state at a deadline instead of polling it on an interval.
+    The deadline is armed only when the state can expire, so idle entities
+    have no timer at all.
+    """
+
+    _auto_update_cancel: Callable[[], None] | None = None
+
     @property
     def should_auto_update_state(self) -> bool:
         pass
 
-    def enable_state_auto_update(self, interval_sec: int) -> None:
-        _LOGGER.debug(f"{self._io!s} auto-update activated")
-        timer_cancel = async_track_time_interval(
-            self.hass,
-            self._auto_update_callback,
-            datetime.timedelta(seconds=interval_sec),
-            cancel_on_shutdown=True,
+    @property
+    def auto_update_delay_sec(self) -> float | None:
+        """The seconds until the state should be re-checked or `None` when it can't expire."""
+        return None
+
+    @callback
+    def schedule_state_auto_update(self, delay_sec: float) -> None:
+        """Re-check the state after `delay_sec`, replacing the current deadline."""
+        self.cancel_state_auto_update()
+        self._auto_update_cancel = async_call_later(
+            self.hass, delay_sec, self._auto_update_callback
         )
 
-        self.async_on_remove(timer_cancel)
+    def cancel_state_auto_update(self) -> None:
+        if self._auto_update_cancel is not None:
+            self._auto_update_cancel()
+            self._auto_update_cancel = None
 
+    @callback
     def _auto_update_callback(self, _=None):
+        self._auto_update_cancel = None
         if self.should_auto_update_state:
             _LOGGER.debug(f"{self._io!s} auto-update scheduled")
             self.schedule_update_ha_state(force_refresh=True)
 
+        delay_sec = self.auto_update_delay_sec
+        if delay_sec is not None:
+            self.schedule_state_auto_update(delay_sec)
+
 
 class AutoReadLoop:
     def __init__(self) -> None:
-        self._loop_stop_event = threading.Event()
-        self._loop_thread = None
-
-    def start_auto_read_loop(self, interval_sec: int):
-        """Start async loop to read data every `data: interval_sec` seconds."""
-        self._loop_stop_event.clear()
-        self._loop_thread = threading.Thread(
-            target=self._auto_read_loop, args=(interval_sec,)
+        self._read_job: ScheduledJob | None = None
+
+    def start_auto_read_loop(self, interval_sec: int, delay_sec: float = None):
+        """
+        Read data every `data: interval_sec` seconds from the shared scheduler.
+        The first read is after `delay_sec` or at the phase allocated by the scheduler.
+        """
+        self.stop_auto_read_loop()
+        self._read_job = get_scheduler().schedule(
+            self._auto_read, interval_sec, delay_sec
         )
-        self._loop_thread.start()
         _LOGGER.debug(f"{self!r}: auto read loop started")
 
     def stop_auto_read_loop(self):
-        """Stop the async loop."""
-        self._loop_stop_event.set()
-        if self._loop_thread is not None:
-            self._loop_thread.join()
-            if self._loop_thread.is_alive():
-                _LOGGER.warning(f"{self!r}: failed to stop auto read loop")
-
-            self._loop_thread = None
+        """Stop the auto read loop."""
+        if self._read_job is not None:
+            get_scheduler().cancel(self._read_job)
+            self._read_job = None
             _LOGGER.debug(f"{self!r}: auto read loop stopped")
 
-    def _auto_read_loop(self, interval_sec: int):
-        while not self._loop_stop_event.wait(interval_sec):
-            _LOGGER.debug(f"{self!r}: auto read")
-            self._read()
+    def _auto_read(self):
+        _LOGGER.debug(f"{self!r}: auto read")
+        self._read()
@@ -0,0 +1,160 @@
+"""Conversion of the analog sensor voltage to the sensor value."""
+
+import bisect
+from array import array
+
+CALIBRATION_LINEAR = "linear"
+CALIBRATION_TABLE = "table"
+CALIBRATION_POLYNOMIAL = "polynomial"
+CALIBRATION_NAMES = [CALIBRATION_LINEAR, CALIBRATION_TABLE, CALIBRATION_POLYNOMIAL]
+
+# The number of precomputed values between 0V and the reference voltage (12-bit ADC)
+LOOKUP_SIZE = 4096
+
+
+class Calibration:
+    """Convert the voltage to the sensor value (base class of the calibrations)."""
+
+    def value(self, voltage: float) -> float:
+        return voltage
+
+    def __repr__(self) -> str:
+        return self.__class__.__name__
+
+
+class LinearStepCalibration(Calibration):
+    """`min_value` at `min_voltage` and `step_value` for every `step_voltage` above it."""
+
+    def __init__(
+        self,
+        min_voltage: float,
+        min_value: float,
+        step_voltage: float,
+        step_value: float,
+    ):
+        self.min_voltage = min_voltage
+        self.min_value = min_value
+        self.step_voltage = step_voltage
+        self.step_value = step_value
+
+    def value(self, voltage: float) -> float:
+        if voltage < self.min_voltage:
+            return self.min_value
+
+        steps = (voltage - self.min_voltage) / self.step_voltage
+        return self.min_value + (steps * self.step_value)
+
+
+class TableCalibration(Calibration):
+    """
+    Linear interpolation between the `(voltage, value)` points of the table.
+    The voltages outside the table get the value of the nearest point.
+    """
+
+    def __init__(self, points: list[tuple[float, float]]):
+        if len(points) < 2:
+            raise ValueError("The table must have at least 2 points")
+
+        points = sorted(points)
+        self.voltages = [voltage for voltage, _ in points]
+        self.values = [value for _, value in points]
+        if len(set(self.voltages)) != len(self.voltages):
+            raise ValueError("The table voltages must be unique")
+
+    def value(self, voltage: float) -> float:
+        index = bisect.bisect_right(self.voltages, voltage)
+        if index == 0:
+            return self.values[0]
+        elif index == len(self.voltages):
+            return self.values[-1]
+
+        v0, v1 = self.voltages[index - 1], self.voltages[index]
+        y0, y1 = self.values[index - 1], self.values[index]
+        return y0 + (y1 - y0) * (voltage - v0) / (v1 - v0)
+
+
+class PolynomialCalibration(Calibration):
+    """`c0 + c1 * voltage + c2 * voltage^2 + ...` of the `coefficients`."""
+
+    def __init__(self, coefficients: list[float]):
+        if len(coefficients) == 0:
+            raise ValueError("The polynomial must have at least 1 coefficient")
+
+        self.coefficients = coefficients
+
+    def value(self, voltage: float) -> float:
+        result = 0.0
+        for coefficient in reversed(self.coefficients):
+            result = result * voltage + coefficient
+
+        return result
+
+
+class LookupCalibration(Calibration):
+    """
+    Precomputed values of a calibration at `size` voltages between 0V and the
+    `reference_voltage`, interpolated between the 2 nearest values.
+    """
+
+    def __init__(
+        self, calibration: Calibration, reference_voltage: float, size=LOOKUP_SIZE
+    ):
+        self.calibration = calibration
+        self.reference_voltage = reference_voltage
+        self._scale = (size - 1) / reference_voltage
+        self._values = array(
+            "d", (calibration.value(index / self._scale) for index in range(size))
+        )
+
+    def value(self, voltage: float) -> float:
+        position = min(max(voltage, 0.0) * self._scale, len(self._values) - 1)
+        index = int(position)
+        if index == len(self._values) - 1:
+            return self._values[index]
+
+        fraction = position - index
+        low = self._values[index]
+        return low + (self._values[index + 1] - low) * fraction
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.calibration!r})"
+
+
+def parse_table(text: str) -> list[tuple[float, float]]:
+    """Parse the `voltage:value` points separated by commas (e.g. '0.5:10, 1.5:30')."""
+    points = []
+    for item in text.split(","):
+        voltage, separator, value = item.partition(":")
+        if separator == "":
+            raise ValueError(f"Invalid table point: '{item.strip()}'")
+
+        points.append((float(voltage), float(value)))
+
+    return points
+
+
+def parse_coefficients(text: str) -> list[float]:
+    """Parse the coefficients separated by commas, from c0 (e.g. '-10, 20.5, 0.3')."""
+    return [float(item) for item in text.split(",")]
+
+
+def create_calibration(
+    name: str,
+    data: str,
+    reference_voltage: float,
+    linear: LinearStepCalibration,
+) -> Calibration:
+    """
+    Return the calibration by name (`CALIBRATION_NAMES`). The table and the
+    polynomial are parsed from `data` and precomputed to a lookup array.
+    """
+    if name == CALIBRATION_LINEAR:
+        return linear
+    elif name == CALIBRATION_TABLE:
+        calibration = TableCalibration(parse_table(data))
+    elif name == CALIBRATION_POLYNOMIAL:
+        calibration = PolynomialCalibration(parse_coefficients(data))
+    else:
+        raise ValueError(f"Unknown calibration: {name}")
+
+    return LookupCalibration(calibration, reference_voltage)
@@ -0,0 +1,77 @@
+"""Pulse counting of the binary sensor edges, with O(1) work per edge."""
+
+import time
+from collections import namedtuple
+from threading import Lock
+from typing import Callable
+
+PulseSnapshot = namedtuple("PulseSnapshot", ["time", "edges", "pulses", "active_sec"])
+PulseRates = namedtuple("PulseRates", ["edges_per_minute", "duty_cycle"])
+
+
+class PulseCounter:
+    """
+    Count the edges, the pulses (rising edges) and the time the input is active.
+
+    `edge(level)` is called from the pin thread for every (debounced) state
+    change and only updates the counters. The rates are calculated from two
+    snapshots, so the cost does not depend on the number of edges.
+    """
+
+    def __init__(
+        self, level: bool = False, clock: Callable[[], float] = time.monotonic
+    ):
+        self._clock = clock
+        self._lock = Lock()
+        self.edges = 0
+        self.pulses = 0
+        self._level = level
+        self._since = clock()
+        self._active_sec = 0.0
+
+    def start(self, level: bool) -> None:
+        """Set the current input level, without counting an edge."""
+        with self._lock:
+            self._add_active(self._clock())
+            self._level = level
+
+    def edge(self, level: bool) -> None:
+        now = self._clock()
+        with self._lock:
+            if level == self._level:
+                return
+
+            self._add_active(now)
+            self._level = level
+            self.edges += 1
+            if level:
+                self.pulses += 1
+
+    def snapshot(self) -> PulseSnapshot:
+        now = self._clock()
+        with self._lock:
+            self._add_active(now)
+            return PulseSnapshot(now, self.edges, self.pulses, self._active_sec)
+
+    def _add_active(self, now: float) -> None:
+        if self._level:
+            self._active_sec += now - self._since
+
+        self._since = now
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.pulses} pulses)"
+
+
+def pulse_rates(previous: PulseSnapshot, current: PulseSnapshot) -> PulseRates:
+    """The edges per minute and the active time in % between two snapshots."""
+    elapsed = current.time - previous.time
+    if elapsed <= 0:
+        return PulseRates(None, None)
+
+    edges = current.edges - previous.edges
+    active_sec = current.active_sec - previous.active_sec
+    return PulseRates(
+        round(edges * 60.0 / elapsed, 2),
+        round(min(100.0, active_sec * 100.0 / elapsed), 1),
+    )
@@ -0,0 +1,157 @@
+"""Software debounce of the raw pin edges, independent of the pin factory."""
+
+from collections import deque
+
+DEBOUNCE_FACTORY = "factory"
+DEBOUNCE_STABLE = "stable"
+DEBOUNCE_INTEGRATE = "integrate"
+DEBOUNCE_MAJORITY = "majority"
+DEBOUNCE_MODES = [
+    DEBOUNCE_FACTORY,
+    DEBOUNCE_STABLE,
+    DEBOUNCE_INTEGRATE,
+    DEBOUNCE_MAJORITY,
+]
+
+# The maximum number of edges the majority vote keeps in its window
+MAX_MAJORITY_EDGES = 256
+
+
+class Debouncer:
+    """
+    Filter the raw levels to a debounced output level.
+
+    `edge(t, level)` is called for every raw edge and `settle(t)` when there
+    are no edges, both with the time in seconds. They return the new output
+    when it changed or `None`. While `pending` the output can still change
+    without a new edge, so `settle` should be called after `time_sec`.
+    """
+
+    def __init__(self, time_sec: float, level: bool):
+        if time_sec <= 0:
+            raise ValueError("time_sec must be greater than 0")
+
+        self.time_sec = time_sec
+        self.output = level
+        self.raw = level
+
+    @property
+    def pending(self) -> bool:
+        return self.raw != self.output
+
+    def edge(self, t: float, level: bool) -> bool | None:
+        changed = self.settle(t)
+        self.raw = level
+        return changed
+
+    def settle(self, t: float) -> bool | None:
+        pass
+
+    def _set_output(self, level: bool) -> bool | None:
+        if level == self.output:
+            return None
+
+        self.output = level
+        return level
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.time_sec}s)"
+
+
+class StableDebouncer(Debouncer):
+    """Change the output when the raw level was stable for `time_sec`."""
+
+    def __init__(self, time_sec: float, level: bool):
+        super().__init__(time_sec, level)
+        self._raw_since = 0.0
+
+    def edge(self, t: float, level: bool) -> bool | None:
+        changed = self.settle(t)
+        if level != self.raw:
+            self.raw = level
+            self._raw_since = t
+
+        return changed
+
+    def settle(self, t: float) -> bool | None:
+        if t - self._raw_since >= self.time_sec:
+            return self._set_output(self.raw)
+
+        return None
+
+
+class IntegratingDebouncer(Debouncer):
+    """
+    Integrate the time of the raw level (up while high, down while low) between
+    0 and `time_sec` and change the output when the integrator is saturated.
+    """
+
+    def __init__(self, time_sec: float, level: bool):
+        super().__init__(time_sec, level)
+        self._integrator = time_sec if level else 0.0
+        self._last = 0.0
+
+    def settle(self, t: float) -> bool | None:
+        elapsed = max(0.0, t - self._last)
+        self._last = t
+        if self.raw:
+            self._integrator = min(self.time_sec, self._integrator + elapsed)
+            if self._integrator >= self.time_sec:
+                return self._set_output(True)
+        else:
+            self._integrator = max(0.0, self._integrator - elapsed)
+            if self._integrator <= 0.0:
+                return self._set_output(False)
+
+        return None
+
+
+class MajorityDebouncer(Debouncer):
+    """The level the raw input had for the majority of the last `time_sec`."""
+
+    def __init__(self, time_sec: float, level: bool):
+        super().__init__(time_sec, level)
+        self._edges: deque[tuple[float, bool]] = deque(
+            [(-time_sec, level)], maxlen=MAX_MAJORITY_EDGES
+        )
+
+    def edge(self, t: float, level: bool) -> bool | None:
+        changed = self.settle(t)
+        self.raw = level
+        self._edges.append((t, level))
+        return changed
+
+    def settle(self, t: float) -> bool | None:
+        edges = self._edges
+        start = t - self.time_sec
+        # keep the last edge before the window, it's the level at the window start
+        while len(edges) > 1 and edges[1][0] <= start:
+            edges.popleft()
+
+        high = 0.0
+        end = t
+        for edge_t, level in reversed(edges):
+            if level:
+                high += end - max(edge_t, start)
+            end = edge_t
+
+        if high * 2 > self.time_sec:
+            return self._set_output(True)
+        elif high * 2 < self.time_sec:
+            return self._set_output(False)
+
+        return None
+
+
+def create_debouncer(mode: str, time_sec: float, level: bool) -> Debouncer | None:
+    """Return the debouncer for the mode (`DEBOUNCE_MODES`) or `None` for the pin factory."""
+    if mode == DEBOUNCE_STABLE:
+        return StableDebouncer(time_sec, level)
+    elif mode == DEBOUNCE_INTEGRATE:
+        return IntegratingDebouncer(time_sec, level)
+    elif mode == DEBOUNCE_MAJORITY:
+        return MajorityDebouncer(time_sec, level)
+    elif mode == DEBOUNCE_FACTORY:
+        return None
+
+    raise ValueError(f"Unknown debounce mode: {mode}")
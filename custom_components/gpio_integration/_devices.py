@@ -1,6 +1,9 @@
-# cspell:ignore leds
-from collections import deque, namedtuple
-from threading import RLock
+# cspell:ignore leds, lgpio
+import math
+from array import array
+from collections import namedtuple
+from threading import Event, Lock
+from time import monotonic, perf_counter, thread_time
 from typing import Callable, Literal
 from weakref import WeakMethod
 
@@ -21,11 +24,10 @@ from gpiozero import (
     PWMOutputDevice,
     event,
 )
-from gpiozero import (
-    DistanceSensor as GZDistanceSensor,
-)
-
-from ._pin_factory import get_pin_factory
+from ._counter import PulseCounter
+from ._debounce import DEBOUNCE_FACTORY, Debouncer, create_debouncer
+from ._pin_factory import get_pin_factory, get_pin_factory_host, get_pin_factory_name
+from ._scheduler import ScheduledJob, get_timer_scheduler
 from .core import get_logger, sleep_sec
 
 _LOGGER = get_logger()
@@ -74,14 +76,44 @@ class Switch(AsStringMixin, DigitalOutputDevice):
 
 
 class BinarySensor(AsStringMixin, DigitalInputDevice):
-    def __init__(self, pin: int, active_high=True, bounce_time=None):
+    """
+    Digital input that fires `on_state_changed` on every value change.
+
+    With the `factory` debounce mode the `bounce_time` is passed to the pin
+    factory, otherwise the raw edges are debounced in software (see `_debounce`)
+    and settled from the timer scheduler, not behind the sensor reads.
+    The debounced value changes are counted by the optional `counter`.
+    """
+
+    def __init__(
+        self,
+        pin: int,
+        active_high=True,
+        bounce_time=None,
+        debounce_mode: str = DEBOUNCE_FACTORY,
+        counter: PulseCounter | None = None,
+    ):
+        software_debounce = debounce_mode != DEBOUNCE_FACTORY and bool(bounce_time)
+        self._debouncer: Debouncer | None = None
+        self._counter = counter
         super().__init__(
             pin,
             pin_factory=get_pin_factory(),
             pull_up=not active_high,
             active_state=None,
-            bounce_time=bounce_time,
+            bounce_time=None if software_debounce else bounce_time,
         )
+        self._last_value = bool(self.value)
+        self._debounce_lock = Lock()
+        self._debounce_job: ScheduledJob | None = None
+        self._debounce_ticks = self.pin_factory.ticks()
+        self._debounce_elapsed = 0.0
+        if counter is not None:
+            counter.start(self._last_value)
+        if software_debounce:
+            self._debouncer = create_debouncer(
+                debounce_mode, bounce_time, self._last_value
+            )
 
     on_state_changed: Callable[[DigitalInputDevice], None] = event(
         """
@@ -90,26 +122,173 @@ class BinarySensor(AsStringMixin, DigitalInputDevice):
         """
     )
 
+    @property
+    def last_value(self) -> bool:
+        """The value of the last edge (without reading the pin)."""
+        return self._last_value
+
     def _pin_changed(self, ticks, state):
-        super()._pin_changed(ticks, state)
+        value = bool(self._state_to_value(state))
+        if self._debouncer is not None:
+            with self._debounce_lock:
+                value = self._debouncer.edge(self._debounce_time(ticks), value)
+                self._schedule_settle()
+
+            if value is None:
+                return
+
+        self._value_changed(ticks, value)
+
+    def _value_changed(self, ticks, value: bool):
+        self._last_value = value
+        if self._counter is not None:
+            self._counter.edge(value)
+        self._fire_events(ticks, value)
         if self.on_state_changed:
             self.on_state_changed()
 
+    def _debounce_time(self, ticks) -> float:
+        """The seconds since the device was created (safe for wrapping ticks)."""
+        elapsed = self.pin_factory.ticks_diff(ticks, self._debounce_ticks)
+        if elapsed > 0:
+            self._debounce_ticks = ticks
+            self._debounce_elapsed += elapsed
+
+        return self._debounce_elapsed
+
+    def _schedule_settle(self):
+        if self._debounce_job is None and self._debouncer.pending:
+            self._debounce_job = get_timer_scheduler().call_later(
+                self._settle, self._debouncer.time_sec
+            )
+
+    def _settle(self):
+        ticks = self.pin_factory.ticks()
+        with self._debounce_lock:
+            self._debounce_job = None
+            if self._debouncer is None:
+                return
+
+            value = self._debouncer.settle(self._debounce_time(ticks))
+            self._schedule_settle()
+
+        if value is not None:
+            self._value_changed(ticks, value)
+
+    def close(self):
+        job = getattr(self, "_debounce_job", None)
+        if job is not None:
+            get_timer_scheduler().cancel(job)
+
+        self._debouncer = None
+        super().close()
+
     @property
     def any_event_time_sec(self) -> float | None:
         active_time = self.active_time
         return active_time if active_time is not None else self.inactive_time
 
 
-class DistanceSensor(AsStringMixin, GZDistanceSensor):
-    def __init__(self, echo: int, trigger: int, max_distance: float | int):
-        super().__init__(
-            echo,
-            trigger,
-            max_distance=max_distance,
-            partial=True,  # prevent timeouts
-            pin_factory=get_pin_factory(),
-        )
+# The speed of sound in dry air at 0°C and at 20°C (m/s)
+SPEED_OF_SOUND_0C = 331.3
+SPEED_OF_SOUND = 343.26
+ULTRASONIC_TRIGGER_SEC = 0.000_01
+# The min time between 2 measurements, so a late echo does not cross-talk (HC-SR04)
+ULTRASONIC_CYCLE_SEC = 0.06
+# The time to wait for the echo on top of the echo time of the max distance
+ULTRASONIC_ECHO_MARGIN_SEC = 0.01
+
+
+def speed_of_sound(temperature: float) -> float:
+    """The speed of sound in dry air (m/s) at the temperature in °C."""
+    return SPEED_OF_SOUND_0C * math.sqrt(1 + temperature / 273.15)
+
+
+class DistanceSensor(AsStringMixin, InputDevice):
+    """
+    HC-SR04 ultrasonic distance sensor, measured on demand with `measure()`.
+
+    The echo pulse is timed from the pin library callbacks (see
+    `create_edge_backend`), so the sensor has no thread of its own and only
+    sends a trigger when it's measured. `measure` blocks until the echo and
+    for at least `cycle_sec`, so sensors measured one after the other (e.g.
+    from the shared scheduler) do not receive the echoes of each other.
+    """
+
+    def __init__(
+        self,
+        echo: int,
+        trigger: int,
+        max_distance: float | int,
+        speed_of_sound: float = SPEED_OF_SOUND,
+    ):
+        super().__init__(echo, pin_factory=get_pin_factory(), pull_up=False)
+        self.pin.edges = "both"
+        self.max_distance = max_distance
+        self.speed_of_sound = speed_of_sound
+        self.cycle_sec = ULTRASONIC_CYCLE_SEC
+        self._trigger = DigitalOutputDevice(trigger, pin_factory=get_pin_factory())
+        self._echo_received = Event()
+        self._echo_start = None
+        self._echo_sec: float | None = None
+        self._backend = create_edge_backend(self.pin)
+        self._backend.start(self._echo_edge)
+
+    @property
+    def trigger(self) -> DigitalOutputDevice:
+        return self._trigger
+
+    @property
+    def echo_timeout_sec(self) -> float:
+        return 2 * self.max_distance / self.speed_of_sound + ULTRASONIC_ECHO_MARGIN_SEC
+
+    def measure(self) -> float | None:
+        """
+        The distance in meters (`max_distance` when the echo is longer)
+        or `None` when the sensor did not respond.
+        """
+        started = monotonic()
+        self._echo_start = None
+        self._echo_sec = None
+        self._echo_received.clear()
+        self._send_trigger()
+        received = self._echo_received.wait(self.echo_timeout_sec)
+        echo_started = self._echo_start is not None
+        echo_sec = self._echo_sec
+
+        remaining = self.cycle_sec - (monotonic() - started)
+        if remaining > 0:
+            sleep_sec(remaining)
+
+        if received and echo_sec is not None:
+            return min(echo_sec * self.speed_of_sound / 2, self.max_distance)
+        elif echo_started:
+            return self.max_distance
+
+        return None
+
+    def _send_trigger(self) -> None:
+        self._trigger.on()
+        sleep_sec(ULTRASONIC_TRIGGER_SEC)
+        self._trigger.off()
+
+    def _echo_edge(self, ticks: float, state: int) -> None:
+        if state:
+            self._echo_start = ticks
+        elif self._echo_start is not None and not self._echo_received.is_set():
+            self._echo_sec = self.pin_factory.ticks_diff(ticks, self._echo_start)
+            self._echo_received.set()
+
+    def close(self):
+        if getattr(self, "_backend", None) is not None:
+            self._backend.stop()
+            self._backend = None
+
+        if getattr(self, "_trigger", None) is not None:
+            self._trigger.close()
+            self._trigger = None
+
+        super().close()
 
 
 class Servo(AsStringMixin, AngularServo):
@@ -177,6 +356,20 @@ MCP_CLASS_MAP = {
 
 MCP_NAMES = list(MCP_CLASS_MAP.keys())
 
+MCP_CHANNELS = {
+    "MCP3001": 1,
+    "MCP3002": 2,
+    "MCP3004": 4,
+    "MCP3008": 8,
+    "MCP3201": 1,
+    "MCP3202": 2,
+    "MCP3204": 4,
+    "MCP3208": 8,
+}
+
+# The max age of a bus scan that is served from the cache
+ANALOG_SCAN_MAX_AGE_SEC = 1.0
+
 
 def create_analog_device(
     model: Literal[
@@ -200,25 +393,430 @@ def create_analog_device(
     return MCP_CLASS_MAP[model](channel=channel, pin_factory=get_pin_factory())
 
 
-class BitInfo:
-    def __init__(self, state: int, duration_ms: float):
-        self.state = state
-        self.duration_ms = duration_ms
+AnalogSamples = namedtuple("AnalogSamples", ["values", "spi_time_ms"])
 
-    def check(self, state: int, min_ms: float, max_ms) -> bool:
-        return self.state == state and min_ms <= self.duration_ms <= max_ms
 
-    def between(self, min_ms: float, max_ms: float) -> bool:
-        return min_ms <= self.duration_ms <= max_ms
+def select_analog_channel(device, channel: int) -> None:
+    """
+    Switch the channel of the MCP device. gpiozero has no setter for the
+    channel, the command of every read is built from `MCP3xxx._channel`
+    (verified against gpiozero 2.0.1), so a change of it fails here, not silently.
+    """
+    if not hasattr(device, "_channel"):
+        raise RuntimeError(f"{type(device).__name__} has no channel to select")
+
+    device._channel = channel
+    if device.channel != channel:
+        raise RuntimeError(f"{type(device).__name__} did not select channel {channel}")
+
+
+def read_analog_samples(device, count: int) -> AnalogSamples:
+    """
+    Read `count` back-to-back conversions of the analog device and the time
+    spent on the SPI bus. The MCP chips start a conversion on the chip select,
+    so every sample is a separate transfer.
+    """
+    start = perf_counter()
+    values = [device.value for _ in range(count)]
+    return AnalogSamples(values, (perf_counter() - start) * 1000.0)
+
+
+class AnalogBus:
+    """
+    A single SPI device of a MCP chip, shared by all channels of the chip.
+
+    The channels are added with `attach(channel, samples)` and the first
+    `read` of a channel scans all attached channels in one pass (switching the
+    channel of the device). The scan is served from the cache to the other
+    channels for `ANALOG_SCAN_MAX_AGE_SEC`.
+    """
+
+    def __init__(self, model: str, clock=monotonic):
+        self.model = model
+        self.host = get_pin_factory_host()
+        self._clock = clock
+        self._lock = Lock()
+        self._channels: dict[int, int] = {}
+        self._samples: dict[int, AnalogSamples] = {}
+        self._scanned_at: float | None = None
+        self._io = create_analog_device(model)
+
+    @property
+    def channels(self) -> list[int]:
+        return list(self._channels)
+
+    def attach(self, channel: int, samples: int = 1) -> None:
+        """Add the channel to the scan with the number of samples per scan."""
+        if not 0 <= channel < MCP_CHANNELS[self.model]:
+            raise ValueError(f"{self.model} has no channel {channel}")
+
+        with self._lock:
+            if channel in self._channels:
+                raise ValueError(f"{self.model} channel {channel} is in use")
+
+            self._channels[channel] = samples
+            self._scanned_at = None
+
+    def detach(self, channel: int) -> None:
+        with self._lock:
+            self._channels.pop(channel, None)
+            self._samples.pop(channel, None)
+
+    def read(self, channel: int) -> AnalogSamples:
+        """The samples of the channel from the last scan, scanning when it's too old."""
+        with self._lock:
+            now = self._clock()
+            if (
+                self._scanned_at is None
+                or now - self._scanned_at >= ANALOG_SCAN_MAX_AGE_SEC
+                or channel not in self._samples
+            ):
+                self._scan()
+                self._scanned_at = now
+
+            return self._samples[channel]
+
+    def close(self) -> None:
+        if self._io is not None:
+            self._io.close()
+            self._io = None
+
+    def _scan(self) -> None:
+        for channel, count in self._channels.items():
+            if MCP_CHANNELS[self.model] > 1:
+                select_analog_channel(self._io, channel)
+
+            self._samples[channel] = read_analog_samples(self._io, count)
+
+    def __repr__(self) -> str:
+        return f"{self.model} {self.channels} ({self.__class__.__name__})"
+
+
+# The buses by (host, model), see `use_pin_factory_host`
+_ANALOG_BUSES: dict[tuple[str, str], AnalogBus] = {}
+_ANALOG_BUSES_LOCK = Lock()
+
+
+def attach_analog_channel(model: str, channel: int, samples: int = 1) -> AnalogBus:
+    """Return the shared bus of the chip with the channel attached."""
+    if model not in MCP_NAMES:
+        raise ValueError(f"Invalid model: {model}")
+
+    key = (get_pin_factory_host(), model)
+    with _ANALOG_BUSES_LOCK:
+        bus = _ANALOG_BUSES.get(key)
+        if bus is None:
+            bus = _ANALOG_BUSES[key] = AnalogBus(model)
+
+        try:
+            bus.attach(channel, samples)
+        except ValueError:
+            if not bus.channels:
+                _release_analog_bus(bus)
+            raise
+
+    return bus
+
+
+def detach_analog_channel(bus: AnalogBus, channel: int) -> None:
+    """Detach the channel and close the bus after the last channel."""
+    with _ANALOG_BUSES_LOCK:
+        bus.detach(channel)
+        if not bus.channels:
+            _release_analog_bus(bus)
+
+
+def _release_analog_bus(bus: AnalogBus) -> None:
+    key = (bus.host, bus.model)
+    if _ANALOG_BUSES.get(key) is bus:
+        del _ANALOG_BUSES[key]
+
+    bus.close()
+
+
+CaptureStats = namedtuple(
+    "CaptureStats", ["edges", "max_latency_us", "mean_latency_us"]
+)
+
+
+class EdgeCapture:
+    """
+    Fixed size ring buffer with the raw ticks, states and callback arrival times
+    of the edges in a single capture.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.origin = 0.0
+        self.count = 0
+        self.ticks = array("d", bytes(8 * size))
+        self.states = bytearray(size)
+        self.arrivals = array("d", bytes(8 * size))
+
+    @property
+    def wrapped(self) -> bool:
+        return self.count > self.size
+
+    def clear(self, origin: float) -> None:
+        self.origin = origin
+        self.count = 0
+
+    def _ordered(self, buffer):
+        if not self.wrapped:
+            return buffer[: self.count]
+
+        index = self.count % self.size
+        # the oldest edge has no previous edge, so it's skipped
+        return buffer[index + 1 :] + buffer[:index]
+
+    def edge_states(self) -> bytearray:
+        """The states after every edge in the capture order."""
+        return self._ordered(self.states)
+
+    def durations_ms(self, ticks_diff: Callable[[float, float], float]) -> list[float]:
+        """The duration of the level before every edge in the capture order."""
+        ticks = self._ordered(self.ticks)
+        first = self.ticks[self.count % self.size] if self.wrapped else self.origin
+        previous = array("d", (first,)) + ticks[:-1]
+        return [
+            ticks_diff(later, earlier) * 1000.0
+            for later, earlier in zip(ticks, previous)
+        ]
+
+    def stats(self, ticks_diff: Callable[[float, float], float]) -> CaptureStats:
+        """
+        The delay of the python callbacks compared to the edge ticks,
+        relative to the first edge in the capture.
+        """
+        ticks = self._ordered(self.ticks)
+        arrivals = self._ordered(self.arrivals)
+        if len(ticks) == 0:
+            return CaptureStats(self.count, 0.0, 0.0)
+
+        latencies = [
+            (arrival - arrivals[0]) - ticks_diff(edge, ticks[0])
+            for edge, arrival in zip(ticks, arrivals)
+        ]
+        return CaptureStats(
+            self.count,
+            max(latencies) * 1e6,
+            sum(latencies) / len(latencies) * 1e6,
+        )
+
+
+class WhenChangedEdgeBackend:
+    """Receive the edges through the gpiozero `when_changed` event."""
+
+    hardware_timestamps = False
+
+    def __init__(self, pin, edges: str = "both"):
+        self._pin = pin
+        self._edges = edges
+
+    def start(self, callback: Callable[[float, int], None]) -> None:
+        self._pin.edges = self._edges
+        self._pin.when_changed = callback
+
+    def stop(self) -> None:
+        self._pin.when_changed = None
+
+
+class PiGPIOEdgeBackend:
+    """
+    Receive the edges directly from the pigpio callbacks. The ticks are the
+    pigpio daemon timestamps of the edges (microseconds).
+    """
+
+    hardware_timestamps = True
+    # pigpio.RISING_EDGE, pigpio.FALLING_EDGE and pigpio.EITHER_EDGE
+    EDGES = {"rising": 0, "falling": 1, "both": 2}
+    TIMEOUT_LEVEL = 2  # pigpio watchdog timeout
+
+    def __init__(self, pin, edges: str = "both"):
+        self._pin = pin
+        self._edge = self.EDGES[edges]
+        self._callback = None
+
+    def start(self, callback: Callable[[float, int], None]) -> None:
+        def on_edge(gpio: int, level: int, tick: int) -> None:
+            if level != self.TIMEOUT_LEVEL:
+                callback(tick, level)
+
+        self.stop()
+        self._callback = self._pin.factory.connection.callback(
+            self._pin._number, self._edge, on_edge
+        )
+
+    def stop(self) -> None:
+        if self._callback is not None:
+            self._callback.cancel()
+            self._callback = None
+
+
+class LGPIOEdgeBackend:
+    """
+    Receive the edges directly from the lgpio alerts. The ticks are the lgpio
+    alert timestamps of the edges (converted to seconds).
+    """
+
+    hardware_timestamps = True
+
+    def __init__(self, pin, edges: str = "both"):
+        self._pin = pin
+        self._edges = edges
+        self._callback = None
+
+    def start(self, callback: Callable[[float, int], None]) -> None:
+        import lgpio
+
+        edge = {
+            "rising": lgpio.RISING_EDGE,
+            "falling": lgpio.FALLING_EDGE,
+            "both": lgpio.BOTH_EDGES,
+        }[self._edges]
+
+        def on_edge(chip: int, gpio: int, level: int, timestamp: int) -> None:
+            if level != lgpio.TIMEOUT:
+                callback(timestamp / 1_000_000_000, level)
+
+        self.stop()
+        handle = self._pin.factory._handle
+        number = self._pin._number
+        flags = lgpio.gpio_get_mode(handle, number) & self._pin.GPIO_LINE_FLAGS_MASK
+        lgpio.gpio_claim_alert(handle, number, edge, flags)
+        self._callback = lgpio.callback(handle, number, edge, on_edge)
+
+    def stop(self) -> None:
+        if self._callback is not None:
+            import lgpio
+
+            self._callback.cancel()
+            self._callback = None
+            handle = self._pin.factory._handle
+            number = self._pin._number
+            flags = lgpio.gpio_get_mode(handle, number) & self._pin.GPIO_LINE_FLAGS_MASK
+            lgpio.gpio_claim_input(handle, number, flags)
+
+
+EDGE_BACKENDS = {
+    "pigpio": PiGPIOEdgeBackend,
+    "lgpio": LGPIOEdgeBackend,
+}
+
+
+def create_edge_backend(pin, edges: str = "both"):
+    """
+    Return the edge backend with native timestamps for the pin factory,
+    or fall back to the gpiozero `when_changed` event. `edges` is "rising",
+    "falling" or "both".
+    """
+    backend_class = EDGE_BACKENDS.get(get_pin_factory_name(pin.factory))
+    return (backend_class or WhenChangedEdgeBackend)(pin, edges)
+
+
+FrequencyWindow = namedtuple("FrequencyWindow", ["pulses", "frequency_hz"])
 
-    def __repr__(self):
-        return f"({self.state}[{self.duration_ms:.2f}ms])"
+
+class FrequencyCounter(AsStringMixin, InputDevice):
+    """
+    Count the pulses (rising edges) of a pulse train and estimate its frequency.
+
+    The edges are received from the pin library callbacks (see
+    `create_edge_backend`) and every edge only increments the count and keeps
+    its tick, so pulse trains of a few kHz are not processed per edge in python.
+    `window()` returns the pulses since the previous call and the frequency:
+    from the tick deltas of the pulse intervals that ended in the window when
+    the pin library timestamps the edges, otherwise from the pulse count and
+    the window time.
+    """
+
+    def __init__(self, pin: int, active_high=True, clock=monotonic):
+        super().__init__(
+            pin,
+            pin_factory=get_pin_factory(),
+            pull_up=not active_high,
+            active_state=None,
+        )
+
+        # only the edges that start a pulse reach python
+        edges = "rising" if active_high else "falling"
+        self.pin.edges = edges
+        self._clock = clock
+        self._lock = Lock()
+        self._pulses = 0
+        self._intervals = 0
+        self._first_tick = None
+        self._last_tick = None
+        self._window_start = clock()
+        self._active_level = 1 if active_high else 0
+        self._backend = create_edge_backend(self.pin, edges)
+        self._backend.start(self._count_edge)
+
+    @property
+    def hardware_timestamps(self) -> bool:
+        """Whether the edge ticks are timestamped by the pin library."""
+        return self._backend is not None and self._backend.hardware_timestamps
+
+    def window(self) -> FrequencyWindow:
+        """The pulses and the frequency since the previous window."""
+        now = self._clock()
+        with self._lock:
+            pulses = self._pulses
+            intervals = self._intervals
+            first_tick = self._first_tick
+            last_tick = self._last_tick
+            self._pulses = 0
+            self._intervals = 0
+            self._first_tick = None
+
+        elapsed = now - self._window_start
+        self._window_start = now
+        if not self.hardware_timestamps:
+            return FrequencyWindow(pulses, pulses / elapsed if elapsed > 0 else 0.0)
+
+        if intervals == 0:
+            return FrequencyWindow(pulses, 0.0)
+
+        span = self.pin_factory.ticks_diff(last_tick, first_tick)
+        return FrequencyWindow(pulses, intervals / span if span > 0 else 0.0)
+
+    def _count_edge(self, ticks: float, state: int):
+        if state != self._active_level:
+            return
+
+        with self._lock:
+            self._pulses += 1
+            if self._last_tick is not None:
+                # the interval from the previous pulse, even from the previous window
+                self._intervals += 1
+                if self._first_tick is None:
+                    self._first_tick = self._last_tick
+
+            self._last_tick = ticks
+
+    def close(self):
+        if getattr(self, "_backend", None) is not None:
+            self._backend.stop()
+            self._backend = None
+
+        super().close()
 
 
 class EdgeInputDevice(InputDevice):
+    """
+    Input device that captures the edges after `read()`.
+
+    The edges are only recorded in an `EdgeCapture` ring buffer of
+    `capture_size` edges and `_capture_completed` is called when
+    `_capture_until` edges are captured. The capture receives the edges from
+    the pin library callbacks with their native timestamps when supported
+    (see `create_edge_backend`).
+    """
+
     def __init__(
         self,
         pin: int,
+        capture_size: int,
         active_high=True,
         bounce_time: float = None,
     ):
@@ -231,103 +829,176 @@ class EdgeInputDevice(InputDevice):
 
         self.pin.bounce = bounce_time
         self.pin.edges = "both"
-        self._lock = RLock()
-        self._last_state = 0
-        self._state_index = 0
-        self._last_event = 0
+        self._capture = EdgeCapture(capture_size)
+        self._capture_until = capture_size
+        self._backend = create_edge_backend(self.pin)
+
+    @property
+    def hardware_timestamps(self) -> bool:
+        """Whether the edge ticks are timestamped by the pin library."""
+        return self._backend is not None and self._backend.hardware_timestamps
+
+    @property
+    def capture_stats(self) -> CaptureStats:
+        """Statistics of the last capture."""
+        return self._capture.stats(self.pin_factory.ticks_diff)
+
+    @property
+    def captured_edges(self) -> int:
+        """The number of edges in the last capture."""
+        return self._capture.count
 
     def read(self) -> None:
-        self._state_index = 0
-        self._last_state = 0
-        self._last_event = self.pin_factory.ticks()
         self.pin.function = "input"
-        self.pin.when_changed = self._pin_changed
+        self._start_edges()
+
+    def _start_edges(self) -> None:
+        """Start capturing the edges without changing the pin function."""
+        self._capture.clear(self.pin_factory.ticks())
+        self._backend.start(self._capture_edge)
+
         _LOGGER.debug(f"{self!r}: reading")
 
     def stop(self) -> None:
-        self.pin.when_changed = None
+        self._backend.stop()
         _LOGGER.debug(f"{self!r}: stopped")
 
-    def _state_changed(self, state: BitInfo) -> None:
+    def _capture_completed(self, capture: EdgeCapture) -> None:
         pass
 
     def close(self):
-        self._lock = None
-        super().close()
+        if getattr(self, "_backend", None) is not None:
+            self._backend.stop()
+            self._backend = None
 
-    def _pin_changed(self, ticks: float, state: int):
-        if self._state_index == 0:
-            self._last_state = 1 if state == 0 else 0
-        elif state == self._last_state:
-            self.stop()
-            raise ValueError("Invalid state change")
+        super().close()
 
-        with self._lock:
-            elapsed_ms = self.pin_factory.ticks_diff(ticks, self._last_event) * 1000.0
-            state_time = BitInfo(self._last_state, elapsed_ms)
-            self._state_changed(state_time)
-            self._last_state = state
-            self._last_event = ticks
-            self._state_index += 1
+    def _capture_edge(self, ticks: float, state: int):
+        capture = self._capture
+        index = capture.count % capture.size
+        capture.ticks[index] = ticks
+        capture.states[index] = state
+        capture.arrivals[index] = perf_counter()
+        capture.count += 1
+        if capture.count >= self._capture_until:
+            self._capture_completed(capture)
 
 
 DHT22Data = namedtuple("DHT22Data", ["temperature", "humidity"])
 
 
-class PulseMixin:
-    def _send_and_wait(self, state: int, duration_sec: float) -> None:
-        self.pin.value = state
-        sleep_sec(duration_sec)
+SINGLE_WIRE_FRAME_BITS = 40
+# The sensor response (80us low and 80us high) is expected in the first edges,
+# after the edges of the start signal when the pin library sends it (see
+# `PiGPIOStartSignal`)
+SINGLE_WIRE_MAX_START_EDGES = 7
+# The start edges and 2 edges (low, high) per bit
+SINGLE_WIRE_CAPTURE_SIZE = SINGLE_WIRE_MAX_START_EDGES + 2 * SINGLE_WIRE_FRAME_BITS
 
 
-def dword_from_deque(deque: deque[BitInfo], bit_count: int) -> int:
-    dword = 0b0000
-    for _ in range(bit_count):
-        dword <<= 1
-        bit = deque.popleft()
-        if bit.between(0.055, 0.085):
-            dword |= 0b0001
-        elif not bit.between(0.02, 0.035):
-            raise ValueError("Invalid bit duration")
-    return dword
+def decode_dht22_values(humidity: int, temperature: int) -> DHT22Data:
+    """Tenths of a unit with the temperature sign in the highest bit."""
+    temperature_sign = -1 if temperature & 0b1000_0000_0000_0000 else 1
+    temperature &= 0b0111_1111_1111_1111
+    return DHT22Data(temperature_sign * temperature / 10.0, humidity / 10.0)
 
 
-class DHT22(AsStringMixin, PulseMixin, EdgeInputDevice):
-    def __init__(self, pin: int):
-        super().__init__(
-            pin,
-            bounce_time=0.000_005,
-        )
-        self._on_data_received = None
-        self._on_invalid_check_sum = None
-        self._transfer = False
-        self._deque: deque[BitInfo] = deque(maxlen=40)
-
-    def _state_changed(self, info: BitInfo) -> None:
-        if not self._transfer:
-            if self._state_index > 4:
-                self.stop()
-                _LOGGER.warning(f"{self!r}: invalid start bits")
-            elif info.check(1, 0.07, 0.09):
-                self._transfer = True
-                _LOGGER.debug(f"{self!r}: transfer started")
+def decode_dht11_values(humidity: int, temperature: int) -> DHT22Data:
+    """
+    Integral and decimal bytes with the temperature sign in the highest bit
+    of the decimal byte.
+    """
+    temperature_sign = -1 if temperature & 0b1000_0000 else 1
+    return DHT22Data(
+        temperature_sign * ((temperature >> 8) + (temperature & 0b0111_1111) / 10.0),
+        (humidity >> 8) + (humidity & 0b1111_1111) / 10.0,
+    )
 
-            return
 
-        if info.state == 1:
-            self._deque.append(info)
-            if self._deque.maxlen == len(self._deque):
-                self.stop()
-                _LOGGER.debug(f"{self!r} deque full")
-                self._process()
+class SingleWireProtocol:
+    """
+    Timings and frame layout of a single-wire sensor (DHT family).
+
+    The host holds the line low for `start_low_sec`, the sensor responds with
+    a low and a high level (`response_ms`) and then sends 40 bits, each a 50us
+    low and a high level with the bit value as width (`zero_ms` or `one_ms`).
+    The frame is the humidity (16 bits), temperature (16 bits) and check sum
+    (8 bits). The level durations are (min, max) in milliseconds.
+    """
 
-    def _process(self) -> None:
-        humidity = dword_from_deque(self._deque, 16)
-        temperature = dword_from_deque(self._deque, 16)
-        check_sum = dword_from_deque(self._deque, 8)
+    def __init__(
+        self,
+        name: str,
+        start_low_sec: float,
+        min_sampling_sec: float,
+        decode_values: Callable[[int, int], DHT22Data],
+        response_ms: tuple[float, float],
+        zero_ms: tuple[float, float],
+        one_ms: tuple[float, float],
+    ):
+        self.name = name
+        self.start_low_sec = start_low_sec
+        self.min_sampling_sec = min_sampling_sec
+        self.decode_values = decode_values
+        self.response_ms = response_ms
+        self.zero_ms = zero_ms
+        self.one_ms = one_ms
+
+    def __repr__(self) -> str:
+        return self.name
+
+    def find_start(self, durations_ms: list[float], first_level: int) -> int:
+        """
+        Return the index of the sensor response high level (80us) after the
+        response low level (80us) or -1 when it's not in the first durations.
 
-        _LOGGER.debug(f"{self!r}: {humidity=}, {temperature=}, {check_sum=}")
+        The high level after the start signal (the host high and the sensor
+        delay) can be as long as the response high level, but it follows the
+        long start low level, so both response levels are matched.
+        """
+        low, high = self.response_ms
+        # the levels alternate, so only every second duration is a high level
+        first_high = first_level ^ 1
+        if first_high == 0:
+            first_high = 2
+
+        for index in range(first_high, SINGLE_WIRE_MAX_START_EDGES, 2):
+            if index >= len(durations_ms):
+                break
+
+            if (
+                low <= durations_ms[index - 1] <= high
+                and low <= durations_ms[index] <= high
+            ):
+                return index
+
+        return -1
+
+    def frame_from_durations(self, durations_ms: list[float], start: int) -> int:
+        """Decode the 40 bits frame from the level durations in a single pass."""
+        end = start + 2 + 2 * SINGLE_WIRE_FRAME_BITS
+        if end > len(durations_ms) + 1:
+            raise ValueError("Incomplete frame")
+
+        one_low, one_high = self.one_ms
+        zero_low, zero_high = self.zero_ms
+        # every high level after a 50us low is a bit
+        frame = 0
+        for width in durations_ms[start + 2 : end : 2]:
+            if one_low <= width <= one_high:
+                frame = (frame << 1) | 0b0001
+            elif zero_low <= width <= zero_high:
+                frame <<= 1
+            else:
+                raise ValueError("Invalid bit duration")
 
+        return frame
+
+    def decode(self, frame: int) -> DHT22Data | None:
+        """Return the values of the frame or `None` when the check sum is invalid."""
+        humidity = frame >> 24
+        temperature = (frame >> 8) & 0b1111_1111_1111_1111
+        check_sum = frame & 0b1111_1111
         sum = (
             (humidity >> 8)
             + (humidity & 0b1111_1111)
@@ -335,33 +1006,247 @@ class DHT22(AsStringMixin, PulseMixin, EdgeInputDevice):
             + (temperature & 0b1111_1111)
         ) & 0b1111_1111
         if sum != check_sum:
+            return None
+
+        return self.decode_values(humidity, temperature)
+
+
+# The DHT22 family responds with 80us levels and sends 26us (0) and 70us (1)
+# bits, the DHT11 responds with 83us low and 87us high and sends 23-27us (0)
+# and 68-74us (1) bits.
+DHT22_TIMINGS = {
+    "response_ms": (0.07, 0.09),
+    "zero_ms": (0.02, 0.035),
+    "one_ms": (0.055, 0.085),
+}
+DHT11_TIMINGS = {
+    "response_ms": (0.075, 0.1),
+    "zero_ms": (0.015, 0.035),
+    "one_ms": (0.06, 0.09),
+}
+
+SINGLE_WIRE_PROTOCOLS = {
+    "DHT22": SingleWireProtocol(
+        "DHT22", 0.018, 2.0, decode_dht22_values, **DHT22_TIMINGS
+    ),
+    "AM2302": SingleWireProtocol(
+        "AM2302", 0.018, 2.0, decode_dht22_values, **DHT22_TIMINGS
+    ),
+    "AM2320": SingleWireProtocol(
+        "AM2320", 0.001, 2.0, decode_dht22_values, **DHT22_TIMINGS
+    ),
+    "DHT11": SingleWireProtocol(
+        "DHT11", 0.018, 1.0, decode_dht11_values, **DHT11_TIMINGS
+    ),
+}
+SINGLE_WIRE_PROTOCOL_NAMES = list(SINGLE_WIRE_PROTOCOLS.keys())
+
+
+StartSignalTime = namedtuple("StartSignalTime", ["blocked_ms", "cpu_ms"])
+
+
+class SleepStartSignal:
+    """
+    Send the start signal (1ms high, `low_sec` low, 40us high) from Python
+    with `sleep` between the levels and switch the pin to input.
+    """
+
+    name = "sleep"
+
+    def __init__(self, pin, low_sec: float):
+        self._pin = pin
+        self._low_sec = low_sec
+
+    def send(self, start_edges: Callable[[], None]) -> None:
+        self._pin.function = "output"
+        self._pin.state = 1
+        sleep_sec(0.001)
+        self._pin.state = 0
+        sleep_sec(self._low_sec)
+        self._pin.state = 1
+        sleep_sec(0.000_04)
+        self._pin.function = "input"
+        start_edges()
+
+    def close(self) -> None:
+        pass
+
+
+class PiGPIOStartSignal:
+    """
+    Send the start signal from a script stored in the pigpio daemon.
+    The daemon times the levels and switches the pin to input, while the
+    edges are already captured, so `send` returns immediately.
+    """
+
+    name = "pigpio"
+    SCRIPT = "m {0} w w {0} 1 mils 1 w {0} 0 mils {1} w {0} 1 mics 40 m {0} r"
+    SCRIPT_INITING = 0  # pigpio.PI_SCRIPT_INITING
+
+    def __init__(self, pin, low_sec: float):
+        self._pin = pin
+        self._low_ms = round(low_sec * 1000)
+        self._script = None
+        self._fallback = SleepStartSignal(pin, low_sec)
+
+    def send(self, start_edges: Callable[[], None]) -> None:
+        connection = self._pin.factory.connection
+        if self._script is None:
+            script = self.SCRIPT.format(self._pin._number, self._low_ms).encode()
+            self._script = connection.store_script(script)
+
+        status, _ = connection.script_status(self._script)
+        if status == self.SCRIPT_INITING:
+            self._fallback.send(start_edges)
+            return
+
+        start_edges()
+        connection.run_script(self._script)
+
+    def close(self) -> None:
+        if self._script is not None:
+            self._pin.factory.connection.delete_script(self._script)
+            self._script = None
+
+
+class LGPIOStartSignal:
+    """
+    Hold the line low for `low_sec` and release it by claiming the pin for
+    the lgpio alerts, so the line is released and the edges are captured in
+    a single lgpio call (without the 40us sleep).
+    """
+
+    name = "lgpio"
+
+    def __init__(self, pin, low_sec: float):
+        self._pin = pin
+        self._low_sec = low_sec
+
+    def send(self, start_edges: Callable[[], None]) -> None:
+        import lgpio
+
+        handle = self._pin.factory._handle
+        number = self._pin._number
+        lgpio.gpio_claim_output(handle, number, 0)
+        sleep_sec(self._low_sec)
+        start_edges()
+
+    def close(self) -> None:
+        pass
+
+
+START_SIGNALS = {
+    "pigpio": PiGPIOStartSignal,
+    "lgpio": LGPIOStartSignal,
+}
+
+
+def create_start_signal(pin, low_sec: float):
+    """
+    Return the start signal timed by the pin library when supported,
+    or fall back to sending it from Python with `sleep`.
+    """
+    start_signal_class = START_SIGNALS.get(get_pin_factory_name(pin.factory))
+    return (start_signal_class or SleepStartSignal)(pin, low_sec)
+
+
+class SingleWireSensor(AsStringMixin, EdgeInputDevice):
+    """Temperature and humidity sensor that sends the frame by `protocol`."""
+
+    def __init__(self, pin: int, protocol: SingleWireProtocol):
+        super().__init__(
+            pin,
+            bounce_time=0.000_005,
+            capture_size=SINGLE_WIRE_CAPTURE_SIZE,
+        )
+        self.protocol = protocol
+        self._on_data_received = None
+        self._on_invalid_check_sum = None
+        self._on_invalid_start_bits = None
+        self._on_invalid_frame = None
+        self._start_signal = create_start_signal(self.pin, protocol.start_low_sec)
+        self._start_signal_time: StartSignalTime | None = None
+
+    @property
+    def start_signal(self) -> str:
+        """The name of the start signal backend."""
+        return self._start_signal.name
+
+    @property
+    def start_signal_time(self) -> StartSignalTime | None:
+        """The time the last `read()` spent sending the start signal."""
+        return self._start_signal_time
+
+    def _capture_completed(self, capture: EdgeCapture) -> None:
+        durations = capture.durations_ms(self.pin_factory.ticks_diff)
+        states = capture.edge_states()
+
+        start = self.protocol.find_start(durations, states[0] ^ 1)
+        if start < 0:
+            self.stop()
+            _LOGGER.warning(f"{self!r}: invalid start bits")
+            if self.on_invalid_start_bits is not None:
+                self.on_invalid_start_bits()
+            return
+
+        # wait for the rest of the frame
+        self._capture_until = start + 1 + 2 * SINGLE_WIRE_FRAME_BITS
+        if capture.count < self._capture_until:
+            return
+
+        self.stop()
+        _LOGGER.debug(f"{self!r}: frame captured")
+
+        try:
+            odd = states[0::2]
+            even = states[1::2]
+            if odd.count(odd[0]) != len(odd) or even.count(odd[0]) != 0:
+                raise ValueError("Invalid state change")
+
+            frame = self.protocol.frame_from_durations(durations, start)
+        except ValueError as e:
+            # raised on the edge callback thread, so it's passed to the callback
+            _LOGGER.warning(f"{self!r}: invalid frame ({e!s})")
+            if self.on_invalid_frame is None:
+                raise
+
+            self.on_invalid_frame()
+            return
+
+        self._process(frame)
+
+    def _process(self, frame: int) -> None:
+        _LOGGER.debug(f"{self!r}: {self.protocol!r} frame {frame:#012x}")
+
+        data = self.protocol.decode(frame)
+        if data is None:
             _LOGGER.warning(f"{self!r}: invalid check sum")
             if self.on_invalid_check_sum is not None:
                 self.on_invalid_check_sum()
             else:
                 raise ValueError("Invalid check sum")
         else:
-            temperature_sign = -1 if temperature & 0b1000_0000 else 1
-            temperature &= 0b0111_1111_1111_1111
-            self.on_data_received(
-                DHT22Data(
-                    temperature_sign * temperature / 10.0,
-                    humidity / 10.0,
-                )
-            )
+            self.on_data_received(data)
 
     def read(self) -> None:
-        self._deque.clear()
-        self._transfer = False
+        self._capture_until = 1 + 2 * SINGLE_WIRE_FRAME_BITS
 
-        self.pin.when_changed = None
-        self.pin.function = "output"
+        self._backend.stop()
 
-        self._send_and_wait(1, 0.001)  # 10 ms
-        self._send_and_wait(0, 0.018)  # 18 ms
-        self._send_and_wait(1, 0.000_04)  # 40 us
+        started = perf_counter()
+        cpu_started = thread_time()
+        self._start_signal.send(self._start_edges)
+        self._start_signal_time = StartSignalTime(
+            (perf_counter() - started) * 1000.0,
+            (thread_time() - cpu_started) * 1000.0,
+        )
+
+    def close(self):
+        if getattr(self, "_start_signal", None) is not None:
+            self._start_signal.close()
+            self._start_signal = None
 
-        super().read()
+        super().close()
 
     def set_on_data_received(self, callback: Callable[[DHT22Data], None]) -> None:
         self._on_data_received = None if callback is None else WeakMethod(callback)
@@ -369,6 +1254,12 @@ class DHT22(AsStringMixin, PulseMixin, EdgeInputDevice):
     def set_on_invalid_check_sum(self, callback: Callable[[], None]) -> None:
         self._on_invalid_check_sum = None if callback is None else WeakMethod(callback)
 
+    def set_on_invalid_start_bits(self, callback: Callable[[], None]) -> None:
+        self._on_invalid_start_bits = None if callback is None else WeakMethod(callback)
+
+    def set_on_invalid_frame(self, callback: Callable[[], None]) -> None:
+        self._on_invalid_frame = None if callback is None else WeakMethod(callback)
+
     on_data_received: Callable[[DHT22Data], None] = property(
         fget=lambda self: (
             None if self._on_data_received is None else self._on_data_received()
@@ -381,9 +1272,34 @@ class DHT22(AsStringMixin, PulseMixin, EdgeInputDevice):
     )
 
     on_invalid_check_sum: Callable[[], None] = property(
-        fget=lambda self: self._on_invalid_check_sum(),
+        fget=lambda self: (
+            None if self._on_invalid_check_sum is None else self._on_invalid_check_sum()
+        ),
         fset=lambda self, value: self.set_on_invalid_check_sum(value),
         doc="""
             Event that is fired when an invalid check sum is received from the sensor.
             """,
     )
+
+    on_invalid_start_bits: Callable[[], None] = property(
+        fget=lambda self: (
+            None
+            if self._on_invalid_start_bits is None
+            else self._on_invalid_start_bits()
+        ),
+        fset=lambda self, value: self.set_on_invalid_start_bits(value),
+        doc="""
+            Event that is fired when the sensor response is not found in the edges.
+            """,
+    )
+
+    on_invalid_frame: Callable[[], None] = property(
+        fget=lambda self: (
+            None if self._on_invalid_frame is None else self._on_invalid_frame()
+        ),
+        fset=lambda self, value: self.set_on_invalid_frame(value),
+        doc="""
+            Event that is fired when the frame has an invalid bit duration,
+            an invalid state change or is incomplete.
+            """,
+    )
@@ -0,0 +1,190 @@
+"""
+Streaming filters for the sensor values with a fixed-size sample window
+and reducers of a burst of samples to a single value.
+"""
+
+from array import array
+
+FILTER_NONE = "none"
+FILTER_MEDIAN = "median"
+FILTER_HAMPEL = "hampel"
+FILTER_EMA = "ema"
+FILTER_NAMES = [FILTER_NONE, FILTER_MEDIAN, FILTER_HAMPEL, FILTER_EMA]
+
+MIN_FILTER_WINDOW = 3
+MAX_FILTER_WINDOW = 15
+
+REDUCER_MEAN = "mean"
+REDUCER_MEDIAN = "median"
+REDUCER_TRIMMED_MEAN = "trimmed_mean"
+REDUCER_NAMES = [REDUCER_MEAN, REDUCER_MEDIAN, REDUCER_TRIMMED_MEAN]
+
+# The fraction of the lowest and of the highest samples the trimmed mean drops
+TRIM_FRACTION = 0.25
+
+# Scale of the median absolute deviation to the standard deviation (normal distribution)
+MAD_SCALE = 1.4826
+
+
+def _median(values: list[float]) -> float:
+    values.sort()
+    middle = len(values) // 2
+    if len(values) % 2 == 1:
+        return values[middle]
+
+    return (values[middle - 1] + values[middle]) / 2
+
+
+class ValueFilter:
+    """Pass the values through (base class of the filters)."""
+
+    def __init__(self) -> None:
+        self.value: float | None = None
+
+    def update(self, value: float) -> float:
+        """Add a new sample and return the filtered value."""
+        self.value = value
+        return self.value
+
+    def __repr__(self) -> str:
+        return self.__class__.__name__
+
+
+class WindowFilter(ValueFilter):
+    """Filter with the last `window` samples in a ring buffer."""
+
+    def __init__(self, window: int) -> None:
+        super().__init__()
+        if window < 1:
+            raise ValueError("window must be greater than 0")
+
+        self.window = window
+        self._samples = array("d", bytes(8 * window))
+        self._count = 0
+
+    @property
+    def samples(self) -> list[float]:
+        """The samples in the window (unordered)."""
+        return self._samples.tolist()[: min(self._count, self.window)]
+
+    def _add(self, value: float) -> None:
+        self._samples[self._count % self.window] = value
+        self._count += 1
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.window})"
+
+
+class MedianFilter(WindowFilter):
+    """The median of the last `window` samples."""
+
+    def update(self, value: float) -> float:
+        self._add(value)
+        self.value = _median(self.samples)
+        return self.value
+
+
+class HampelFilter(WindowFilter):
+    """
+    Replace a sample with the window median when it is more than `threshold`
+    scaled median absolute deviations away from it, otherwise keep the sample.
+    """
+
+    def __init__(self, window: int, threshold: float = 3.0) -> None:
+        super().__init__(window)
+        self.threshold = threshold
+
+    def update(self, value: float) -> float:
+        self._add(value)
+        samples = self.samples
+        if len(samples) < MIN_FILTER_WINDOW:
+            self.value = value
+            return self.value
+
+        median = _median(samples)
+        deviation = MAD_SCALE * _median([abs(sample - median) for sample in samples])
+        if abs(value - median) > self.threshold * deviation:
+            self.value = median
+        else:
+            self.value = value
+
+        return self.value
+
+
+class EMAFilter(ValueFilter):
+    """Exponential moving average with the smoothing of a `window` samples average."""
+
+    def __init__(self, window: int) -> None:
+        super().__init__()
+        self.window = window
+        self.alpha = 2.0 / (window + 1)
+
+    def update(self, value: float) -> float:
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+
+        return self.value
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.window})"
+
+
+class RateLimitFilter(ValueFilter):
+    """Limit the change between 2 samples to `max_step` (0 = no limit)."""
+
+    def __init__(self, max_step: float) -> None:
+        super().__init__()
+        if max_step < 0:
+            raise ValueError("max_step must not be negative")
+
+        self.max_step = max_step
+
+    def update(self, value: float) -> float:
+        if self.value is None or self.max_step == 0:
+            self.value = value
+        else:
+            step = min(max(value - self.value, -self.max_step), self.max_step)
+            self.value += step
+
+        return self.value
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.max_step})"
+
+
+def create_filter(name: str, window: int) -> ValueFilter:
+    """Return a new filter by name (`FILTER_NAMES`)."""
+    if name == FILTER_MEDIAN:
+        return MedianFilter(window)
+    elif name == FILTER_HAMPEL:
+        return HampelFilter(window)
+    elif name == FILTER_EMA:
+        return EMAFilter(window)
+    elif name == FILTER_NONE:
+        return ValueFilter()
+
+    raise ValueError(f"Unknown filter: {name}")
+
+
+def _trimmed_mean(values: list[float]) -> float:
+    values.sort()
+    trim = int(len(values) * TRIM_FRACTION)
+    kept = values[trim : len(values) - trim]
+    return sum(kept) / len(kept)
+
+
+def reduce_samples(name: str, values: list[float]) -> float:
+    """Reduce the samples to a single value by the reducer name (`REDUCER_NAMES`)."""
+    if len(values) == 0:
+        raise ValueError("values must not be empty")
+
+    if name == REDUCER_MEAN:
+        return sum(values) / len(values)
+    elif name == REDUCER_MEDIAN:
+        return _median(list(values))
+    elif name == REDUCER_TRIMMED_MEAN:
+        return _trimmed_mean(list(values))
+
+    raise ValueError(f"Unknown reducer: {name}")
@@ -1,15 +1,39 @@
-# cspell:ignore lgpio, fromlist
-from typing import Type
+# cspell:ignore lgpio
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import Callable, Type
 
 from gpiozero import Device, Factory
 from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
 
-from .core import get_logger
+from ._scheduler import (
+    ExponentialBackoff,
+    ScheduledJob,
+    Scheduler,
+)
+from .core import DOMAIN, get_logger, import_attribute
 from .schemas import CONF_INTERFACE
 
 _LOGGER = get_logger()
 
+PIN_FACTORY_STORAGE_KEY = f"{DOMAIN}.pin_factory"
+PIN_FACTORY_STORAGE_VERSION = 1
+
+FactoryProbe = namedtuple("FactoryProbe", ["name", "duration_ms", "error"])
+
+PIGPIO_RECONNECT_MIN_SEC = 5.0
+PIGPIO_RECONNECT_MAX_SEC = 300.0
+PIGPIO_CHECK_INTERVAL_SEC = 30.0
+
 PIN_FACTORY_OPTIONS = dict({})
+# The result of the last discovery: {"factory": name, "failures": {name: error}}
+PIN_FACTORY_PROBE_CACHE = dict({})
+_DISCOVERY: list[FactoryProbe] = []
 PIN_FACTORIES = {
     "pigpio": "gpiozero.pins.pigpio:PiGPIOFactory",
     "lgpio": "gpiozero.pins.lgpio:LGPIOFactory",
@@ -31,14 +55,18 @@ def get_config_option(key: str):
 
 
 def _get_pin_factory_class_by_name(name: str) -> Type[Factory]:
-    mod_name, cls_name = PIN_FACTORIES[name].split(":", 1)
-    if mod_name.startswith("."):
-        path = f"{__package__}{mod_name[1:]}"
-    else:
-        path = mod_name
-    module = __import__(path, fromlist=(cls_name,))
-    pin_cls = getattr(module, cls_name)
-    return pin_cls
+    return import_attribute(PIN_FACTORIES[name])
+
+
+def get_pin_factory_name(pin_factory: Factory) -> str | None:
+    """Return the `PIN_FACTORIES` name of the pin factory instance."""
+    cls = type(pin_factory)
+    path = f"{cls.__module__}:{cls.__name__}"
+    for name, factory_path in PIN_FACTORIES.items():
+        if factory_path == path:
+            return name
+
+    return None
 
 
 def create_pin_factory(name: str, pin_factory_class: type[Factory]) -> Factory:
@@ -50,18 +78,322 @@ def create_pin_factory(name: str, pin_factory_class: type[Factory]) -> Factory:
     return pin_factory_class()
 
 
+def set_probe_cache(data: dict | None) -> None:
+    """Set the result of a previous discovery, its factory is tried first."""
+    PIN_FACTORY_PROBE_CACHE.clear()
+    if isinstance(data, dict) and data.get("factory") in PIN_FACTORIES:
+        PIN_FACTORY_PROBE_CACHE["factory"] = data["factory"]
+        PIN_FACTORY_PROBE_CACHE["failures"] = dict(data.get("failures") or {})
+
+
+def get_probe_cache() -> dict:
+    return dict(PIN_FACTORY_PROBE_CACHE)
+
+
+def get_discovery() -> dict:
+    """The time of every factory probed by the last discovery."""
+    return {
+        "cached_factory": PIN_FACTORY_PROBE_CACHE.get("factory"),
+        "total_ms": round(sum(probe.duration_ms for probe in _DISCOVERY), 2),
+        "probes": [probe._asdict() for probe in _DISCOVERY],
+    }
+
+
+def _probe_order() -> list[str]:
+    cached = PIN_FACTORY_PROBE_CACHE.get("factory")
+    names = list(PIN_FACTORIES.keys())
+    if cached in names:
+        names.remove(cached)
+        names.insert(0, cached)
+
+    return names
+
+
+def _update_probe_cache(probes: list[FactoryProbe]) -> None:
+    failures = dict(PIN_FACTORY_PROBE_CACHE.get("failures", {}))
+    for probe in probes:
+        if probe.error is None:
+            failures.pop(probe.name, None)
+            PIN_FACTORY_PROBE_CACHE["factory"] = probe.name
+        else:
+            failures[probe.name] = probe.error
+
+    PIN_FACTORY_PROBE_CACHE["failures"] = failures
+
+
 def _find_pin_factory() -> Factory:
-    for name in PIN_FACTORIES.keys():
+    _DISCOVERY.clear()
+    pin_factory = None
+    for name in _probe_order():
+        started = perf_counter()
         try:
             pin_factory_class = _get_pin_factory_class_by_name(name)
-            return create_pin_factory(name, pin_factory_class)
+            pin_factory = create_pin_factory(name, pin_factory_class)
+            error = None
         except Exception as e:
+            pin_factory = None
+            error = str(e)
             _LOGGER.warning(f"Falling back from {name}: {e!s}")
 
-    raise RuntimeError("No default pin factory available")
+        duration_ms = round((perf_counter() - started) * 1000, 2)
+        _DISCOVERY.append(FactoryProbe(name, duration_ms, error))
+        if pin_factory is not None:
+            break
+
+    _update_probe_cache(_DISCOVERY)
+    _LOGGER.debug(
+        "Pin factory discovery "
+        + ", ".join(
+            f"{probe.name} {probe.duration_ms}ms"
+            + ("" if probe.error is None else " (failed)")
+            for probe in _DISCOVERY
+        )
+    )
+    if pin_factory is None:
+        raise RuntimeError("No default pin factory available")
+
+    return pin_factory
+
+
+class PinFactoryProbeStore:
+    """Keep the result of the pin factory discovery in the Home Assistant storage."""
+
+    def __init__(self, hass: HomeAssistant):
+        self._store = Store(hass, PIN_FACTORY_STORAGE_VERSION, PIN_FACTORY_STORAGE_KEY)
+        self._saved: dict | None = None
+
+    async def async_load(self) -> None:
+        self._saved = await self._store.async_load()
+        set_probe_cache(self._saved)
+
+    async def async_save(self) -> None:
+        """Save the probe cache when a discovery changed it."""
+        data = get_probe_cache()
+        if "factory" in data and data != self._saved:
+            await self._store.async_save(data)
+            self._saved = data
+
+
+class PinFactoryUnavailable(RuntimeError):
+    """The pin factory of the host can not be created now (retry later)."""
+
+
+class PiGPIOPool:
+    """
+    One pigpio factory (one daemon socket) per remote host, shared by all
+    devices of the host. Every host has its own lock, so connecting to a slow
+    host does not block the others. After a failed connect the host is not
+    retried before an exponential backoff.
+
+    The config entries hold the factory of their host with `acquire` and
+    `release`, a factory is closed only when no entry holds it. Every
+    `check_interval_sec` each host is probed with a round trip to its daemon
+    (in a thread of the pool, a dead host may block the socket): a lost factory
+    is replaced on the next `get` and `on_lost(host)` is called, so the entries
+    that hold it can be reloaded (their devices can not recover on the dead socket).
+    """
+
+    def __init__(
+        self,
+        create: Callable[[str], Factory] | None = None,
+        clock: Callable[[], float] = monotonic,
+        backoff: ExponentialBackoff | None = None,
+        scheduler: Scheduler | None = None,
+        check_interval_sec: float = PIGPIO_CHECK_INTERVAL_SEC,
+    ):
+        self._create = create or _create_pigpio_factory
+        self._clock = clock
+        self._backoff = backoff or ExponentialBackoff(
+            PIGPIO_RECONNECT_MIN_SEC, PIGPIO_RECONNECT_MAX_SEC
+        )
+        self._scheduler = scheduler or Scheduler(min_gap_sec=0)
+        self._check_interval_sec = check_interval_sec
+        self._check_job: ScheduledJob | None = None
+        self._lock = Lock()
+        self._host_locks: dict[str, Lock] = {}
+        self._factories: dict[str, Factory] = {}
+        # factory -> number of entries holding it (also the lost factories)
+        self._users: dict[Factory, int] = {}
+        # host -> (failed attempts, time of the next attempt)
+        self._failures: dict[str, tuple[int, float]] = {}
+        self.on_lost: Callable[[str], None] | None = None
+
+    @property
+    def hosts(self) -> list[str]:
+        return list(self._factories)
+
+    def get(self, host: str) -> Factory:
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, Lock())
+
+        with host_lock:
+            factory = self._factories.get(host)
+            if factory is not None and _is_connected(factory):
+                return factory
+
+            if factory is not None:
+                self._lost(host, factory)
+
+            attempts, retry_at = self._failures.get(host, (0, 0.0))
+            now = self._clock()
+            if now < retry_at:
+                raise PinFactoryUnavailable(
+                    f"pigpio {host}: next connect in {retry_at - now:.0f}s"
+                )
+
+            try:
+                factory = self._create(host)
+            except Exception as e:
+                delay = self._backoff.delay(attempts)
+                self._failures[host] = (attempts + 1, now + delay)
+                raise PinFactoryUnavailable(
+                    f"pigpio {host}: {e!s} (retry in {delay:.0f}s)"
+                ) from e
 
+            _LOGGER.debug(f"pigpio {host}: connected")
+            with self._lock:
+                self._failures.pop(host, None)
+                self._factories[host] = factory
+                self._start_check()
+
+            return factory
+
+    def acquire(self, host: str) -> Factory:
+        """Get the factory of the host and hold it until `release`."""
+        factory = self.get(host)
+        with self._lock:
+            self._users[factory] = self._users.get(factory, 0) + 1
+
+        return factory
+
+    def release(self, factory: Factory) -> None:
+        """Close the factory when the last entry holding it releases it."""
+        with self._lock:
+            users = self._users.pop(factory, 0) - 1
+            if users > 0:
+                self._users[factory] = users
+                return
+
+            for host, host_factory in list(self._factories.items()):
+                if host_factory is factory:
+                    del self._factories[host]
+
+            check_job = self._pop_check_job() if not self._factories else None
+
+        self._cancel_check(check_job)
+        _close_factory(factory)
+
+    def check(self) -> None:
+        """Replace the factories that lost their connection."""
+        with self._lock:
+            hosts = [(host, self._host_locks[host]) for host in self._factories]
+
+        for host, host_lock in hosts:
+            with host_lock:
+                factory = self._factories.get(host)
+                if factory is not None and not _is_connected(factory):
+                    self._lost(host, factory)
+
+    def close(self) -> None:
+        with self._lock:
+            factories = set(self._factories.values()) | set(self._users)
+            self._factories.clear()
+            self._users.clear()
+            self._failures.clear()
+            check_job = self._pop_check_job()
+
+        self._cancel_check(check_job)
+        for factory in factories:
+            _close_factory(factory)
+
+    def _lost(self, host: str, factory: Factory) -> None:
+        """Drop the lost factory of the host (called with the host lock)."""
+        _LOGGER.warning(f"pigpio {host}: connection lost")
+        with self._lock:
+            self._factories.pop(host, None)
+            in_use = factory in self._users
+
+        if not in_use:
+            _close_factory(factory)
+        elif self.on_lost is not None:
+            self.on_lost(host)
+
+    def _start_check(self) -> None:
+        if self._check_job is None and self._check_interval_sec > 0:
+            self._check_job = self._scheduler.schedule(
+                self.check, self._check_interval_sec
+            )
+
+    def _pop_check_job(self) -> ScheduledJob | None:
+        check_job, self._check_job = self._check_job, None
+        return check_job
+
+    def _cancel_check(self, check_job: ScheduledJob | None) -> None:
+        # outside of the pool lock, the running check may wait for it
+        if check_job is not None:
+            self._scheduler.cancel(check_job)
+
+
+def _create_pigpio_factory(host: str) -> Factory:
+    return _get_pin_factory_class_by_name("pigpio")(host=host)
+
+
+def _is_connected(factory: Factory) -> bool:
+    if not hasattr(factory, "connection"):
+        return True
+
+    # pigpio keeps `connected` set when the daemon goes away, only a round
+    # trip fails; the factory returns no connection once it is closed
+    connection = factory.connection
+    if connection is None or not getattr(connection, "connected", True):
+        return False
+
+    try:
+        connection.get_current_tick()
+    except Exception as e:
+        _LOGGER.debug(f"pigpio probe failed: {e!s}")
+        return False
+
+    return True
+
+
+def _close_factory(factory: Factory) -> None:
+    try:
+        factory.close()
+    except Exception as e:
+        _LOGGER.debug(f"Closing the pin factory failed: {e!s}")
+
+
+_PIGPIO_POOL = PiGPIOPool()
+_PIN_FACTORY_HOST: ContextVar[str] = ContextVar("pin_factory_host", default="")
+
+
+@contextmanager
+def use_pin_factory_host(host: str | None):
+    """The devices created in the block use the pin factory of the host."""
+    token = _PIN_FACTORY_HOST.set(host or "")
+    try:
+        yield
+    finally:
+        _PIN_FACTORY_HOST.reset(token)
+
+
+def get_pin_factory_host() -> str:
+    """The host of `use_pin_factory_host`, '' for the default pin factory."""
+    return _PIN_FACTORY_HOST.get()
+
+
+def get_pin_factory(host: str | None = None) -> Factory:
+    """
+    The pigpio factory of the remote host (by default the host of
+    `use_pin_factory_host`), otherwise the default pin factory.
+    """
+    if host is None:
+        host = get_pin_factory_host()
+
+    if host != "" and getattr(Device.pin_factory, "host", None) != host:
+        return _PIGPIO_POOL.get(host)
 
-def get_pin_factory() -> Factory:
     # use the gpiozero default pin factory if set
     pin_factory = Device.pin_factory
     if pin_factory is None:
@@ -82,7 +414,22 @@ def get_pin_factory() -> Factory:
     return pin_factory
 
 
+def acquire_pin_factory(host: str) -> Factory:
+    """Hold the pigpio factory of the remote host for a config entry."""
+    return _PIGPIO_POOL.acquire(host)
+
+
+def release_pin_factory(factory: Factory) -> None:
+    _PIGPIO_POOL.release(factory)
+
+
+def set_pin_factory_lost_listener(callback: Callable[[str], None] | None) -> None:
+    """`callback(host)` is called (in a worker thread) when a held host is lost."""
+    _PIGPIO_POOL.on_lost = callback
+
+
 def cleanup_default_factory():
+    _PIGPIO_POOL.close()
     pin_factory: Factory | None = Device.pin_factory
     if pin_factory is not None:
         pin_factory.close()
@@ -0,0 +1,312 @@
+"""Shared scheduler for the periodic hardware reads of the integration."""
+
+import heapq
+import itertools
+import math
+import random
+import threading
+import time
+from typing import Callable
+
+from .core import get_logger
+
+_LOGGER = get_logger()
+
+# Minimum time between 2 consecutive jobs, so bit-banged protocols do not collide.
+MIN_JOB_GAP_SEC = 0.05
+
+
+class ScheduledJob:
+    def __init__(
+        self,
+        callback: Callable[[], None],
+        interval_sec: float,
+        order: int,
+        phased: bool,
+        repeat: bool = True,
+    ):
+        self.callback = callback
+        self.interval_sec = interval_sec
+        self.order = order
+        self.phased = phased
+        self.repeat = repeat
+        self.phase = 0.0
+        self.due = 0.0
+        self.last_run = 0.0
+        self.entry = -1
+        self.cancelled = False
+
+    def __repr__(self) -> str:
+        if not self.repeat:
+            return f"{self.callback!r} (once)"
+
+        return f"{self.callback!r} (every {self.interval_sec}s)"
+
+
+class ExponentialBackoff:
+    """Exponential backoff delays with random jitter, limited to `max_sec`."""
+
+    def __init__(
+        self,
+        base_sec: float,
+        max_sec: float,
+        jitter: float = 0.25,
+        rand: Callable[[], float] = random.random,
+    ):
+        self.base_sec = base_sec
+        self.max_sec = max_sec
+        self.jitter = jitter
+        self._random = rand
+
+    def delay(self, attempt: int) -> float:
+        """The delay before the retry `attempt` (starting from 0)."""
+        delay = min(self.max_sec, self.base_sec * (2**attempt))
+        return delay + delay * self.jitter * self._random()
+
+
+class Scheduler:
+    """
+    Run all periodic jobs from a single thread.
+
+    Jobs are kept in a heap ordered by their next due time and are executed one
+    at a time with at least `min_gap_sec` between them. The thread is started
+    with the first job and exits when the last job is cancelled.
+
+    The phased jobs (of any interval) are spread evenly across the shortest
+    interval (job `i` of `n` runs at phase `i * shortest / n`) and are re-spread
+    when jobs are added or removed, so sensors do not wake up at the same moment.
+    A new job runs first at its phase, a re-spread job not before half an
+    interval after its last run.
+    """
+
+    def __init__(
+        self,
+        min_gap_sec: float = MIN_JOB_GAP_SEC,
+        clock: Callable[[], float] = time.monotonic,
+        autostart: bool = True,
+    ) -> None:
+        self._min_gap_sec = min_gap_sec
+        self._clock = clock
+        self._epoch = clock()
+        self._autostart = autostart
+        self._heap: list[tuple[float, int, ScheduledJob]] = []
+        self._counter = itertools.count()
+        self._jobs: set[ScheduledJob] = set()
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._running: ScheduledJob | None = None
+        self._last_run: float | None = None
+
+    @property
+    def jobs(self) -> int:
+        """The number of registered jobs."""
+        return len(self._jobs)
+
+    @property
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def schedule(
+        self,
+        callback: Callable[[], None],
+        interval_sec: float,
+        delay_sec: float | None = None,
+    ) -> ScheduledJob:
+        """
+        Run `callback` every `interval_sec`.
+        The first run is after `delay_sec` or, when not set, at the phase allocated
+        for the job.
+        """
+        if interval_sec <= 0:
+            raise ValueError("interval_sec must be greater than 0")
+
+        with self._condition:
+            now = self._clock()
+            job = ScheduledJob(
+                callback, interval_sec, next(self._counter), delay_sec is None
+            )
+            self._jobs.add(job)
+            if job.phased:
+                # never run, the first phase slot from now
+                job.last_run = now - interval_sec
+                self._allocate_phases()
+            else:
+                job.due = now + delay_sec
+                job.phase = (job.due - self._epoch) % interval_sec
+                self._push(job)
+
+            self._condition.notify()
+            self._start_thread()
+
+        _LOGGER.debug(f"scheduler: {job!r} added")
+        return job
+
+    def call_later(
+        self, callback: Callable[[], None], delay_sec: float
+    ) -> ScheduledJob:
+        """Run `callback` once after `delay_sec`."""
+        with self._condition:
+            job = ScheduledJob(
+                callback, delay_sec, next(self._counter), False, repeat=False
+            )
+            job.due = self._clock() + delay_sec
+            self._jobs.add(job)
+            self._push(job)
+            self._condition.notify()
+            self._start_thread()
+
+        _LOGGER.debug(f"scheduler: {job!r} added")
+        return job
+
+    def cancel(self, job: ScheduledJob, wait: bool = True) -> None:
+        """
+        Remove the job and wait for it to complete when it is running
+        (unless `wait` is false, for callers the running job may wait for).
+        """
+        with self._condition:
+            job.cancelled = True
+            if job in self._jobs:
+                self._jobs.discard(job)
+                if job.phased:
+                    self._allocate_phases()
+
+            self._condition.notify_all()
+            if wait and threading.current_thread() is not self._thread:
+                while self._running is job:
+                    self._condition.wait()
+
+        _LOGGER.debug(f"scheduler: {job!r} cancelled")
+
+    def shutdown(self) -> None:
+        """Cancel all jobs."""
+        with self._condition:
+            jobs = list(self._jobs)
+
+        for job in jobs:
+            self.cancel(job)
+
+    def run_pending(self) -> float | None:
+        """
+        Run the jobs that are due now.
+        Return the seconds until the next job or `None` when there are no jobs.
+        """
+        while True:
+            with self._condition:
+                wait = self._next_wait()
+                if wait is None or wait > 0:
+                    return wait
+
+                job = self._pop()
+
+            self._execute(job)
+
+    def _start_thread(self) -> None:
+        if self._autostart and self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="gpio_integration_scheduler", daemon=True
+            )
+            self._thread.start()
+
+    def _allocate_phases(self) -> None:
+        """Spread the phased jobs evenly across the shortest interval."""
+        group = [job for job in self._jobs if job.phased]
+        if not group:
+            return
+
+        group.sort(key=lambda job: job.order)
+        shortest = min(job.interval_sec for job in group)
+        for index, job in enumerate(group):
+            job.phase = shortest * index / len(group)
+            if job is not self._running:
+                due = self._next_due(job)
+                if due != job.due or job.entry < 0:
+                    job.due = due
+                    self._push(job)
+
+    def _next_due(self, job: ScheduledJob) -> float:
+        """
+        Return the first time matching the job phase, that is not in the past
+        and is at least half an interval after the job last run.
+        """
+        earliest = max(self._clock(), job.last_run + job.interval_sec / 2)
+        cycles = math.ceil((earliest - self._epoch - job.phase) / job.interval_sec)
+        return self._epoch + job.phase + cycles * job.interval_sec
+
+    def _push(self, job: ScheduledJob) -> None:
+        job.entry = next(self._counter)
+        heapq.heappush(self._heap, (job.due, job.entry, job))
+
+    def _peek(self) -> ScheduledJob | None:
+        """Return the next job, dropping the cancelled and re-scheduled entries."""
+        while self._heap:
+            _, entry, job = self._heap[0]
+            if not job.cancelled and entry == job.entry:
+                return job
+
+            heapq.heappop(self._heap)
+
+        return None
+
+    def _next_wait(self) -> float | None:
+        job = self._peek()
+        if job is None:
+            return None
+
+        ready_at = job.due
+        if self._last_run is not None:
+            ready_at = max(ready_at, self._last_run + self._min_gap_sec)
+
+        return ready_at - self._clock()
+
+    def _pop(self) -> ScheduledJob:
+        _, _, job = heapq.heappop(self._heap)
+        self._running = job
+        self._last_run = job.last_run = self._clock()
+        return job
+
+    def _execute(self, job: ScheduledJob) -> None:
+        try:
+            job.callback()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception(f"scheduler: {job!r} failed")
+        finally:
+            with self._condition:
+                self._running = None
+                if not job.repeat:
+                    self._jobs.discard(job)
+                elif not job.cancelled:
+                    # keep the phase and skip the runs that were missed
+                    job.due = self._next_due(job)
+                    self._push(job)
+
+                self._condition.notify_all()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                if not self._jobs:
+                    self._thread = None
+                    return
+
+                wait = self._next_wait()
+                if wait is None or wait > 0:
+                    self._condition.wait(wait)
+                    continue
+
+                job = self._pop()
+
+            self._execute(job)
+
+
+_SCHEDULER = Scheduler()
+# Short timers that must not wait for the reads (e.g. the debounce settle),
+# run from their own thread without a gap between the jobs.
+_TIMER_SCHEDULER = Scheduler(min_gap_sec=0)
+
+
+def get_scheduler() -> Scheduler:
+    return _SCHEDULER
+
+
+def get_timer_scheduler() -> Scheduler:
+    return _TIMER_SCHEDULER
@@ -0,0 +1,163 @@
+"""Read statistics of the sensors, shared in-process by id."""
+
+import bisect
+import time
+from weakref import WeakValueDictionary
+
+READ_LATENCY_BOUNDS_MS = (20, 30, 50, 100, 250, 500, 1000)
+EDGES_BOUNDS = (10, 40, 80, 83, 86)
+START_SIGNAL_BOUNDS_MS = (0.1, 0.5, 1, 5, 19, 20, 25, 50)
+
+
+class Histogram:
+    """Count of values per bucket (the last bucket is for values above all bounds)."""
+
+    def __init__(self, bounds: tuple[float, ...]):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.last: float | None = None
+        self.max: float | None = None
+
+    @property
+    def mean(self) -> float | None:
+        return self.total / self.count if self.count > 0 else None
+
+    def add(self, value: float) -> None:
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.last = value
+        self.max = value if self.max is None else max(self.max, value)
+
+    def as_dict(self) -> dict:
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count": self.count,
+            "last": self.last,
+            "mean": self.mean,
+            "max": self.max,
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class ReadStatistics:
+    """Counters and histograms of the reads of a single sensor."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._read_start: float | None = None
+        self.reads = 0
+        self.successful_reads = 0
+        self.checksum_failures = 0
+        self.start_bit_failures = 0
+        self.frame_failures = 0
+        self.timeouts = 0
+        self.retries = 0
+        self.poll_interval_sec: float | None = None
+        self.last_success: float | None = None
+        self.callback_latency_us: float | None = None
+        self.read_latency_ms = Histogram(READ_LATENCY_BOUNDS_MS)
+        self.edges = Histogram(EDGES_BOUNDS)
+        self.start_signal: str | None = None
+        self.start_signal_blocked_ms = Histogram(START_SIGNAL_BOUNDS_MS)
+        self.start_signal_cpu_ms = Histogram(START_SIGNAL_BOUNDS_MS)
+
+    @property
+    def success_rate(self) -> float | None:
+        """The percentage of the successful reads."""
+        if self.reads == 0:
+            return None
+
+        return round(self.successful_reads * 100.0 / self.reads, 1)
+
+    @property
+    def last_success_age_sec(self) -> float | None:
+        if self.last_success is None:
+            return None
+
+        return round(self._clock() - self.last_success, 1)
+
+    def read_started(self) -> None:
+        self.reads += 1
+        self._read_start = self._clock()
+
+    def start_signal_sent(self, name: str, blocked_ms: float, cpu_ms: float) -> None:
+        """Record the time the read spent sending the start signal."""
+        self.start_signal = name
+        self.start_signal_blocked_ms.add(blocked_ms)
+        self.start_signal_cpu_ms.add(cpu_ms)
+
+    def retry_started(self) -> None:
+        self.retries += 1
+
+    def read_succeeded(self, edges: int, callback_latency_us: float = None) -> None:
+        now = self._clock()
+        self.successful_reads += 1
+        self.last_success = now
+        self.edges.add(edges)
+        self.callback_latency_us = callback_latency_us
+        if self._read_start is not None:
+            self.read_latency_ms.add((now - self._read_start) * 1000.0)
+            self._read_start = None
+
+    def checksum_failed(self, edges: int) -> None:
+        self.checksum_failures += 1
+        self.edges.add(edges)
+
+    def start_bits_failed(self, edges: int) -> None:
+        self.start_bit_failures += 1
+        self.edges.add(edges)
+
+    def frame_failed(self, edges: int) -> None:
+        """An invalid bit duration or state change, or an incomplete frame."""
+        self.frame_failures += 1
+        self.edges.add(edges)
+
+    def timed_out(self, edges: int) -> None:
+        """The sensor did not send a complete frame in time."""
+        self.timeouts += 1
+        self.edges.add(edges)
+
+    def as_dict(self) -> dict:
+        return {
+            "reads": self.reads,
+            "successful_reads": self.successful_reads,
+            "success_rate": self.success_rate,
+            "checksum_failures": self.checksum_failures,
+            "start_bit_failures": self.start_bit_failures,
+            "frame_failures": self.frame_failures,
+            "timeouts": self.timeouts,
+            "retries": self.retries,
+            "poll_interval_sec": self.poll_interval_sec,
+            "last_success_age_sec": self.last_success_age_sec,
+            "callback_latency_us": self.callback_latency_us,
+            "read_latency_ms": self.read_latency_ms.as_dict(),
+            "edges": self.edges.as_dict(),
+            "start_signal": {
+                "backend": self.start_signal,
+                "blocked_ms": self.start_signal_blocked_ms.as_dict(),
+                "cpu_ms": self.start_signal_cpu_ms.as_dict(),
+            },
+        }
+
+
+_STATISTICS: WeakValueDictionary[str, ReadStatistics] = WeakValueDictionary()
+
+
+def register_statistics(id: str, statistics: ReadStatistics) -> None:
+    _STATISTICS[id] = statistics
+
+
+def unregister_statistics(id: str) -> None:
+    _STATISTICS.pop(id, None)
+
+
+def get_statistics(id: str | None = None) -> dict[str, dict]:
+    """Return the statistics of all sensors (or only the sensor `id`) by id."""
+    return {
+        key: statistics.as_dict()
+        for key, statistics in list(_STATISTICS.items())
+        if id is None or key == id
+    }
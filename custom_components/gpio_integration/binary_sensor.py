@@ -3,17 +3,25 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 
 from ._base import AutoUpdMixin, ClosableMixin, ReprMixin
+from ._counter import PulseCounter
 from ._devices import BinarySensor
+from ._pin_factory import use_pin_factory_host
 from .core import DOMAIN, get_logger
 from .hub import Hub
 from .schemas.binary_sensor import BinarySensorConfig
 
 _LOGGER = get_logger()
 
+# The delay after the edge event timeout before the state is re-checked
+AUTO_UPDATE_MARGIN_SEC = 0.2
+# The coalescing window of the pulse counter mode when none is configured
+COUNTER_COALESCE_WINDOW_SEC = 1.0
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -22,7 +30,11 @@ async def async_setup_entry(
 ) -> None:
     """Add binary sensor for passed config_entry in HA."""
     hub: Hub = hass.data[DOMAIN][config_entry.entry_id]
-    async_add_entities([GpioBinarySensor(hub.config)])
+    with use_pin_factory_host(hub.host):
+        counter = (
+            hub.controller.counter if hub.config.counter_interval_sec > 0 else None
+        )
+        async_add_entities([GpioBinarySensor(hub.config, counter)])
 
 
 def get_device_class(mode: str) -> BinarySensorDeviceClass:
@@ -45,7 +57,9 @@ def get_device_class(mode: str) -> BinarySensorDeviceClass:
 class GpioBinarySensor(ClosableMixin, ReprMixin, AutoUpdMixin, BinarySensorEntity):
     """Represent a binary sensor that uses Raspberry Pi GPIO."""
 
-    def __init__(self, config: BinarySensorConfig) -> None:
+    def __init__(
+        self, config: BinarySensorConfig, counter: PulseCounter | None = None
+    ) -> None:
         """Initialize the RPi binary sensor."""
         self._attr_name = config.name
         self._attr_unique_id = config.unique_id
@@ -55,17 +69,31 @@ class GpioBinarySensor(ClosableMixin, ReprMixin, AutoUpdMixin, BinarySensorEntit
         self._state = config.default_state
         self._rely_on_edge_events = config.edge_event_timeout_sec > 0
         self._edge_event_timeout_sec = config.edge_event_timeout_sec
-        self._auto_update_interval_sec = config.edge_event_timeout_sec + 0.2
 
         self._io = BinarySensor(
             config.pin,
             active_high=not config.invert_logic,
             bounce_time=config.bounce_time_ms / 1000,
+            debounce_mode=config.debounce_mode,
+            counter=counter,
         )
 
         self._io.on_state_changed = self.edge_detection_callback
         self._event_occurred = False
 
+        self._coalesce_window_sec = config.coalesce_window_ms / 1000
+        if counter is not None and self._coalesce_window_sec <= 0:
+            # the pulses are counted, not every pulse is written to the state machine
+            self._coalesce_window_sec = COUNTER_COALESCE_WINDOW_SEC
+        self._coalesce_cancel = None
+        self._coalesce_writes = False
+        self._pending_state = self._state
+        self._edges = 0
+        self._burst_start = 0
+        if self._coalesce_window_sec > 0:
+            # the edges of the burst, only when the writes are coalesced
+            self._attr_extra_state_attributes = {"edge_count": 0}
+
     @property
     def is_on(self) -> bool:
         return self._state
@@ -79,11 +107,76 @@ class GpioBinarySensor(ClosableMixin, ReprMixin, AutoUpdMixin, BinarySensorEntit
     def should_auto_update_state(self) -> bool:
         return self.is_sensor_active != self._state
 
+    @property
+    def auto_update_delay_sec(self) -> float | None:
+        """The time until the last edge event times out, while the sensor is active."""
+        if not self._rely_on_edge_events or not self.is_sensor_active:
+            return None
+
+        event_time = self._io.any_event_time_sec
+        return self._edge_event_timeout_sec - event_time + AUTO_UPDATE_MARGIN_SEC
+
     def edge_detection_callback(self, io: BinarySensor) -> None:
+        """Push the edge value to the event loop (called from the pin thread)."""
         self._event_occurred = True
-        if not self._rely_on_edge_events or (not self._state and io.is_active):
-            _LOGGER.debug(f"{self!r} schedule update")
-            self.schedule_update_ha_state(force_refresh=True)
+        self._edges += 1
+        value = io.last_value
+        if not self._rely_on_edge_events or (not self._state and value):
+            self._push_state(value)
+
+    def _push_state(self, state: bool) -> None:
+        if self.hass is None:
+            # not added to hass yet
+            self._state = state
+            return
+
+        self.hass.loop.call_soon_threadsafe(self._async_push_state, state)
+
+    @callback
+    def _async_push_state(self, state: bool) -> None:
+        if self._coalesce_window_sec <= 0:
+            if state != self._state:
+                self._async_write_state(state)
+        elif self._coalesce_cancel is None:
+            # leading edge of a burst, write now and coalesce the next edges
+            self._async_write_state(state)
+            self._async_open_coalesce_window()
+        else:
+            self._pending_state = state
+            self._coalesce_writes = True
+
+    @callback
+    def _async_open_coalesce_window(self) -> None:
+        self._coalesce_writes = False
+        self._coalesce_cancel = async_call_later(
+            self.hass, self._coalesce_window_sec, self._async_coalesce_window_ended
+        )
+
+    @callback
+    def _async_coalesce_window_ended(self, _=None) -> None:
+        """Write the trailing state of the burst, at most once per window."""
+        self._coalesce_cancel = None
+        if self._coalesce_writes:
+            self._async_write_state(self._pending_state)
+            self._async_open_coalesce_window()
+        else:
+            # no edges in the window, the burst has ended
+            self._burst_start = self._edges
+
+    @callback
+    def _async_write_state(self, state: bool) -> None:
+        self._state = state
+        if self._coalesce_window_sec > 0:
+            self._attr_extra_state_attributes = {
+                "edge_count": self._edges - self._burst_start
+            }
+        _LOGGER.debug(f"{self!r} pushed '{self._state}'")
+        self.async_write_ha_state()
+        if self._rely_on_edge_events and state:
+            # the state expires when there are no more edges
+            self.schedule_state_auto_update(
+                self._edge_event_timeout_sec + AUTO_UPDATE_MARGIN_SEC
+            )
 
     def update(self):
         """Update the GPIO state."""
@@ -98,13 +191,21 @@ class GpioBinarySensor(ClosableMixin, ReprMixin, AutoUpdMixin, BinarySensorEntit
 
     def _close(self) -> None:
         self._io.on_state_changed = None
+        self.cancel_state_auto_update()
+        if self._coalesce_cancel is not None:
+            self._coalesce_cancel()
+            self._coalesce_cancel = None
+
         super()._close()
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added."""
         await super().async_added_to_hass()
-        if self._auto_update_interval_sec > 0:
-            self.enable_state_auto_update(self._auto_update_interval_sec)
+        if self._rely_on_edge_events and self._state:
+            # the default state expires as if an edge has just happened
+            self.schedule_state_auto_update(
+                self._edge_event_timeout_sec + AUTO_UPDATE_MARGIN_SEC
+            )
 
     async def async_will_remove_from_hass(self) -> None:
         """On entity remove release the GPIO resources."""
@@ -2,13 +2,17 @@
 
 from enum import Enum
 
-import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_NAME
 from homeassistant.core import callback
 
 from .core import DOMAIN, get_logger
-from .schemas import CONF_VARIATION, InvalidPin, get_unique_id
+from .schemas import (
+    CONF_VARIATION,
+    InvalidPin,
+    fill_schema_defaults,
+    get_unique_id,
+)
 from .schemas.binary_sensor import (
     BINARY_SENSOR_SCHEMA,
     validate_binary_sensor_data,
@@ -35,10 +39,12 @@ from .schemas.sensor import (
     SENSOR_ANALOG_STEP_SCHEMA,
     SENSOR_DHT22_SCHEMA,
     SENSOR_DISTANCE_SCHEMA,
+    SENSOR_FREQUENCY_SCHEMA,
     SENSOR_VARIATION_SCHEMA,
     validate_sensor_analog_step_data,
     validate_sensor_dht22_data,
     validate_sensor_distance_data,
+    validate_sensor_frequency_data,
     validate_sensor_variation_data,
 )
 from .schemas.servo import SERVO_SCHEMA, validate_servo_data
@@ -99,6 +105,10 @@ CONF_ENTITIES: dict = {
         "schema": SENSOR_DISTANCE_SCHEMA,
         "validate": validate_sensor_distance_data,
     },
+    EntityTypes.SENSOR_FREQUENCY.value: {
+        "schema": SENSOR_FREQUENCY_SCHEMA,
+        "validate": validate_sensor_frequency_data,
+    },
     EntityTypes.SERVO.value: {
         "schema": SERVO_SCHEMA,
         "validate": validate_servo_data,
@@ -112,23 +122,7 @@ def fill_schema_missing_values(type: EntityTypes, configs: dict):
     add in any missing optional values from the base
     schema.
     """
-    base_schema = CONF_ENTITIES[type.value]["schema"]
-    if isinstance(base_schema.schema, dict):
-        for key in base_schema.schema.keys():
-            # Skip anything not an optional key
-            if not isinstance(key, vol.Optional):
-                continue
-
-            # If not present in config data, copy in default
-            if key.schema not in configs:
-                defVal = key.default()
-                _LOGGER.debug(
-                    'Hub: setting missing default for config "%s" to value "%s"',
-                    key.schema,
-                    defVal,
-                )
-
-                configs.setdefault(key.schema, defVal)
+    fill_schema_defaults(CONF_ENTITIES[type.value]["schema"], configs)
 
 
 def validate_config_data(entity_type: str, data_input: dict):
@@ -1,20 +1,76 @@
+import threading
+import time
+from collections import deque
+from weakref import WeakValueDictionary
+
 from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.const import EntityCategory
 
 from .._base import AutoReadLoop, ClosableMixin, ReprMixin
-from .._devices import DHT22, DHT22Data, DistanceSensor, create_analog_device
+from .._calibration import LinearStepCalibration, create_calibration
+from .._counter import PulseCounter, PulseRates, pulse_rates
+from .._devices import (
+    SINGLE_WIRE_PROTOCOLS,
+    DHT22Data,
+    DistanceSensor,
+    FrequencyCounter,
+    SingleWireSensor,
+    speed_of_sound,
+    attach_analog_channel,
+    detach_analog_channel,
+)
+from .._filters import MedianFilter, RateLimitFilter, create_filter, reduce_samples
+from .._scheduler import ExponentialBackoff, ScheduledJob, get_scheduler
+from .._stats import ReadStatistics, register_statistics, unregister_statistics
 from ..core import get_logger
-from ..schemas.sensor import AnalogStepConfig, DHT22Config, DistanceSensorConfig
+from ..schemas.binary_sensor import BinarySensorConfig
+from ..schemas.sensor import (
+    AnalogStepConfig,
+    DHT22Config,
+    DistanceSensorConfig,
+    FrequencySensorConfig,
+)
 
 _LOGGER = get_logger()
 
+DHT22_MAX_RETRIES = 3
+DHT22_MAX_BACKOFF_SEC = 16.0
+# The poll interval is adapted based on the result of the last read cycles.
+DHT22_CYCLES_WINDOW = 10
+DHT22_MAX_INTERVAL_FACTOR = 4
+DHT22_SLOW_DOWN_FAILURE_RATE = 0.5
+DHT22_SPEED_UP_FAILURE_RATE = 0.1
+# A read without a complete frame after this time failed (the frame takes ~25ms)
+DHT22_READ_TIMEOUT_SEC = 0.5
+# An older temperature is not used to correct the speed of sound
+TEMPERATURE_MAX_AGE_SEC = 600
+
 
 class SensorStateProvider:
+    """
+    The state of one or more `SensorRef`s. The provider is released when the
+    last open ref is closed, so removing one entity (e.g. a disabled
+    diagnostic) does not stop the others.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._open_refs: set["SensorRef"] = set()
+
     def get_state(self, id: str) -> float:
         pass
 
     def release(self) -> None:
         pass
 
+    def open_ref(self, ref: "SensorRef") -> None:
+        self._open_refs.add(ref)
+
+    def close_ref(self, ref: "SensorRef") -> None:
+        self._open_refs.discard(ref)
+        if not self._open_refs:
+            self.release()
+
 
 class SensorRef:
     def __init__(
@@ -26,12 +82,14 @@ class SensorRef:
         device_id: str,
         device_name: str,
         device_class: SensorDeviceClass | None = None,
+        entity_category: EntityCategory | None = None,
     ) -> None:
         self.name = name
         self.id = id
         self.device_id = device_id
         self.device_name = device_name
         self.device_class = device_class
+        self.entity_category = entity_category
         self.unit = unit
         self._provider = provider
 
@@ -39,9 +97,14 @@ class SensorRef:
     def state(self):
         return self._provider.get_state(self.id)
 
+    def open(self):
+        """Keep the provider until the ref is closed."""
+        if self._provider is not None:
+            self._provider.open_ref(self)
+
     def close(self):
         if self._provider is not None:
-            self._provider.release()
+            self._provider.close_ref(self)
             self._provider = None
 
 
@@ -52,8 +115,31 @@ class SensorsMixin(SensorStateProvider):
     def create_sensor(self, name: str, id: str, unit: str) -> SensorRef:
         return SensorRef(self, f"{self.name} {name}", id, unit, self.id, self.name)
 
+    def create_diagnostic_sensor(self, name: str, id: str, unit: str) -> SensorRef:
+        return SensorRef(
+            self,
+            f"{self.name} {name}",
+            id,
+            unit,
+            self.id,
+            self.name,
+            entity_category=EntityCategory.DIAGNOSTIC,
+        )
+
+
+_TEMPERATURE_SOURCES: WeakValueDictionary[str, "DHT22Controller"] = (
+    WeakValueDictionary()
+)
+
+
+def get_temperature_source(id: str) -> "DHT22Controller | None":
+    """The temperature sensor controller by its unique id."""
+    return _TEMPERATURE_SOURCES.get(id)
+
 
 class DHT22Controller(SensorsMixin, ReprMixin, AutoReadLoop):
+    """Single-wire temperature and humidity sensor (DHT22, DHT11, AM2302, AM2320)."""
+
     def __init__(self, config: DHT22Config) -> None:
         super().__init__()
         self.name = config.name
@@ -62,17 +148,74 @@ class DHT22Controller(SensorsMixin, ReprMixin, AutoReadLoop):
         self._humidity_id = f"{self.id}_H"
         self._temperature = 0.0
         self._humidity = 0.0
-        self._io = DHT22(config.pin)
+        self._temperature_filter = create_filter(config.filter, config.filter_window)
+        self._humidity_filter = create_filter(config.filter, config.filter_window)
+        self._protocol = SINGLE_WIRE_PROTOCOLS[config.protocol]
+        self._io = SingleWireSensor(config.pin, self._protocol)
         self._io.on_data_received = self._on_data
         self._io.on_invalid_check_sum = self._on_invalid_check_sum
+        self._io.on_invalid_start_bits = self._on_invalid_start_bits
+        self._io.on_invalid_frame = self._on_invalid_frame
+        self._clock = time.monotonic
+        self._lock = threading.Lock()
         self._retry = 0
+        self._retry_job: ScheduledJob | None = None
+        self._read_pending = False
+        self._timeout_job: ScheduledJob | None = None
+        self._backoff = ExponentialBackoff(
+            self._protocol.min_sampling_sec, DHT22_MAX_BACKOFF_SEC
+        )
+        self._last_read: float | None = None
+        self._cycles: deque[bool] = deque(maxlen=DHT22_CYCLES_WINDOW)
+        self._base_interval_sec = config.update_interval_sec
+
+        self.statistics = ReadStatistics()
+        register_statistics(self.id, self.statistics)
+        _TEMPERATURE_SOURCES[self.id] = self
+        self._diagnostics = {
+            f"{self.id}_success_rate": lambda: self.statistics.success_rate,
+            f"{self.id}_read_latency": lambda: self.statistics.read_latency_ms.last,
+            f"{self.id}_checksum_failures": lambda: self.statistics.checksum_failures,
+            f"{self.id}_start_failures": lambda: self.statistics.start_bit_failures,
+            f"{self.id}_retries": lambda: self.statistics.retries,
+            f"{self.id}_last_read_age": lambda: self.statistics.last_success_age_sec,
+        }
+
+        self._set_poll_interval(config.update_interval_sec)
 
-        self.start_auto_read_loop(config.update_interval_sec)
+    @property
+    def poll_interval_sec(self) -> float:
+        return self.statistics.poll_interval_sec
+
+    @property
+    def temperature(self) -> float | None:
+        """The filtered temperature, `None` when there is no recent successful read."""
+        age = self.statistics.last_success_age_sec
+        if age is None or age > TEMPERATURE_MAX_AGE_SEC:
+            return None
+
+        return self._temperature
 
     def get_sensors(self):
         return [
             self.create_sensor("Temperature", self._temperature_id, "C"),
             self.create_sensor("Humidity", self._humidity_id, "%"),
+            self.create_diagnostic_sensor(
+                "Read success rate", f"{self.id}_success_rate", "%"
+            ),
+            self.create_diagnostic_sensor(
+                "Read latency", f"{self.id}_read_latency", "ms"
+            ),
+            self.create_diagnostic_sensor(
+                "Checksum failures", f"{self.id}_checksum_failures", None
+            ),
+            self.create_diagnostic_sensor(
+                "Start bit failures", f"{self.id}_start_failures", None
+            ),
+            self.create_diagnostic_sensor("Read retries", f"{self.id}_retries", None),
+            self.create_diagnostic_sensor(
+                "Last read age", f"{self.id}_last_read_age", "s"
+            ),
         ]
 
     def get_state(self, id: str) -> float:
@@ -80,71 +223,314 @@ class DHT22Controller(SensorsMixin, ReprMixin, AutoReadLoop):
             return self._temperature
         elif id == self._humidity_id:
             return self._humidity
+        elif id in self._diagnostics:
+            return self._diagnostics[id]()
 
         raise ValueError(f"Unknown sensor id: {id}")
 
     def release(self) -> None:
+        # no read, retry or timeout may run on the closed device
+        self.stop_auto_read_loop()
+        self._cancel_retry()
+        self._finish_read()
         if self._io is not None:
             _LOGGER.debug(f"{self!r}: releasing")
             self._io.on_data_received = None
             self._io.on_invalid_check_sum = None
+            self._io.on_invalid_start_bits = None
+            self._io.on_invalid_frame = None
             self._io.close()
             self._io = None
-
-        self.stop_auto_read_loop()
+            unregister_statistics(self.id)
+            _TEMPERATURE_SOURCES.pop(self.id, None)
 
     def _on_data(self, data: DHT22Data):
-        self._temperature = data.temperature
-        self._humidity = data.humidity
-        self._retry = 0
-        _LOGGER.debug(f"{self!r}: data {data.temperature}C, {data.humidity}%")
+        self._finish_read(wait=False)
+        self._temperature = self._temperature_filter.update(data.temperature)
+        self._humidity = self._humidity_filter.update(data.humidity)
+        stats = self._io.capture_stats
+        self.statistics.read_succeeded(stats.edges, stats.max_latency_us)
+        with self._lock:
+            self._retry = 0
+            self._cycles.append(True)
+
+        _LOGGER.debug(
+            f"{self!r}: data {data.temperature}C, {data.humidity}%, "
+            f"filtered {self._temperature}C, {self._humidity}%"
+        )
 
     def _read(self):
+        """The periodic read, it replaces a pending retry of the previous read."""
+        if self._cancel_retry():
+            _LOGGER.debug(f"{self!r}: pending retry replaced by a periodic read")
+            with self._lock:
+                self._cycles.append(False)
+
+        with self._lock:
+            self._retry = 0
+
+        self._adapt_poll_interval()
+        self._start_read()
+
+    def _start_read(self):
+        now = self._clock()
+        if (
+            self._last_read is not None
+            and now - self._last_read < self._protocol.min_sampling_sec
+        ):
+            _LOGGER.debug(f"{self!r}: read skipped, within the sampling period")
+            return
+
+        self._last_read = now
+        self.statistics.read_started()
+        self._schedule_timeout()
         self._io.read()
+        if self._io.start_signal_time is not None:
+            self.statistics.start_signal_sent(
+                self._io.start_signal, *self._io.start_signal_time
+            )
+
+    def _schedule_timeout(self):
+        with self._lock:
+            job = self._timeout_job
+            self._read_pending = True
+            self._timeout_job = get_scheduler().call_later(
+                self._read_timed_out, DHT22_READ_TIMEOUT_SEC
+            )
+
+        if job is not None:
+            get_scheduler().cancel(job)
+
+    def _finish_read(self, wait: bool = True) -> bool:
+        """
+        Cancel the timeout of the read, `False` when no read is pending.
+        The edge callbacks don't `wait`: the running timeout stops the device,
+        which waits for the callback thread (the timeout checks `_read_pending`).
+        """
+        with self._lock:
+            pending = self._read_pending
+            job = self._timeout_job
+            self._read_pending = False
+            self._timeout_job = None
+
+        if job is not None:
+            get_scheduler().cancel(job, wait=wait)
+
+        return pending
+
+    def _read_timed_out(self):
+        # the job is running, so it's not cancelled
+        with self._lock:
+            pending = self._read_pending
+            self._read_pending = False
+            self._timeout_job = None
+
+        if not pending or self._io is None:
+            return
+
+        self._io.stop()
+        _LOGGER.warning(f"{self!r}: no response from the sensor")
+        self.statistics.timed_out(self._io.captured_edges)
+        self._schedule_retry()
+
+    def _retry_read(self):
+        with self._lock:
+            self._retry_job = None
+
+        if self._io is not None:
+            self._start_read()
+
+    def _schedule_retry(self):
+        """
+        Retry the failed read from the scheduler thread (not from the edge callback)
+        after an exponential backoff, that is never shorter than the sampling period.
+        """
+        with self._lock:
+            if self._retry >= DHT22_MAX_RETRIES:
+                _LOGGER.debug(f"{self!r}: no retries left")
+                self._cycles.append(False)
+                return
+
+            delay = self._backoff.delay(self._retry)
+            self._retry += 1
+            self.statistics.retry_started()
+            self._retry_job = get_scheduler().call_later(self._retry_read, delay)
+
+        _LOGGER.debug(f"{self!r}: retry {self._retry} in {delay:.1f}s")
+
+    def _cancel_retry(self) -> bool:
+        with self._lock:
+            job = self._retry_job
+            self._retry_job = None
+
+        if job is None:
+            return False
+
+        get_scheduler().cancel(job)
+        return True
+
+    def _adapt_poll_interval(self):
+        """
+        Slow down the polling while most read cycles fail and
+        go back to the configured interval when the reads recover.
+        """
+        with self._lock:
+            if len(self._cycles) < DHT22_CYCLES_WINDOW // 2:
+                return
+
+            failure_rate = self._cycles.count(False) / len(self._cycles)
+
+        interval = self.poll_interval_sec
+        max_interval = self._base_interval_sec * DHT22_MAX_INTERVAL_FACTOR
+        if failure_rate >= DHT22_SLOW_DOWN_FAILURE_RATE:
+            interval = min(interval * 2, max_interval)
+        elif failure_rate <= DHT22_SPEED_UP_FAILURE_RATE:
+            interval = max(interval / 2, self._base_interval_sec)
+
+        if interval != self.poll_interval_sec:
+            _LOGGER.info(
+                f"{self!r}: poll interval changed to {interval}s "
+                f"(failure rate {failure_rate:.0%})"
+            )
+            with self._lock:
+                self._cycles.clear()
+
+            self._set_poll_interval(interval)
+
+    def _set_poll_interval(self, interval_sec: float):
+        self.statistics.poll_interval_sec = interval_sec
+        self.start_auto_read_loop(interval_sec)
 
     def _on_invalid_check_sum(self):
+        self._finish_read(wait=False)
         _LOGGER.warning(f"{self!r}: invalid check sum")
-        if self._retry < 2:
-            self._io.read()
-            self._retry += 1
+        self.statistics.checksum_failed(self._io.captured_edges)
+        self._schedule_retry()
+
+    def _on_invalid_start_bits(self):
+        self._finish_read(wait=False)
+        self.statistics.start_bits_failed(self._io.captured_edges)
+        self._schedule_retry()
+
+    def _on_invalid_frame(self):
+        self._finish_read(wait=False)
+        self.statistics.frame_failed(self._io.captured_edges)
+        self._schedule_retry()
 
 
-class AnalogStepControl(SensorsMixin, ClosableMixin, ReprMixin):
+class AnalogStepControl(SensorsMixin, ReprMixin, AutoReadLoop):
+    """
+    Analog sensor on a MCP chip, the value is calculated from the voltage by
+    the calibration (voltage steps, a table or a polynomial).
+    The channel is read from the bus shared by all channels of the chip and
+    every read takes `oversampling` conversions and reduces them to one value.
+    The reads run from the shared scheduler and the state is the cached value.
+    """
+
     def __init__(self, config: AnalogStepConfig) -> None:
+        super().__init__()
         self.name = config.name
         self.id = config.unique_id
         self.sensor = SensorRef(
             self, self.name, self.id, config.native_unit, None, None
         )
-
-        self._min_voltage = config.min_voltage
-        self._min_value = config.min_value
-        self._step_voltage = config.step_voltage
-        self._step_value = config.step_value
-
-        self._io = create_analog_device(config.chip, config.channel)
+        self._oversampling_id = f"{self.id}_oversampling"
+        self._spi_time_id = f"{self.id}_spi_time"
+
+        self._reference_voltage = config.reference_voltage
+        self._calibration = create_calibration(
+            config.calibration,
+            config.calibration_data,
+            config.reference_voltage,
+            LinearStepCalibration(
+                config.min_voltage,
+                config.min_value,
+                config.step_voltage,
+                config.step_value,
+            ),
+        )
+        self._oversampling = config.oversampling
+        self._reducer = config.reducer
+        self._spi_time_ms: float | None = None
+        self._value: float | None = None
+
+        self._channel = config.channel
+        self._io = attach_analog_channel(
+            config.chip, config.channel, config.oversampling
+        )
+        self.start_auto_read_loop(config.update_interval_sec)
 
     def get_sensors(self):
-        return [self.sensor]
+        return [
+            self.sensor,
+            self._create_diagnostic_sensor("Oversampling", self._oversampling_id, None),
+            self._create_diagnostic_sensor("SPI time", self._spi_time_id, "ms"),
+        ]
 
     def get_state(self, id: str) -> float:
-        if id != self.id:
+        if id == self._oversampling_id:
+            return self._oversampling
+        elif id == self._spi_time_id:
+            return self._spi_time_ms
+        elif id != self.id:
             raise ValueError(f"{self!r}: unknown sensor id: {id}")
 
-        voltage: float = self._io.value * 3.3  # 3.3V
-        if voltage < self._min_voltage:
-            return self._min_value
-
-        steps = (voltage - self._min_voltage) / self._step_voltage
-        value = self._min_value + (steps * self._step_value)
-        return value
+        return self._value
 
     def release(self) -> None:
-        self._close()
+        self.stop_auto_read_loop()
+        if self._io is not None:
+            detach_analog_channel(self._io, self._channel)
+            self._io = None
+
+    def _create_diagnostic_sensor(self, name: str, id: str, unit: str) -> SensorRef:
+        # the analog sensor is not a device, so the diagnostics are not either
+        return SensorRef(
+            self,
+            f"{self.name} {name}",
+            id,
+            unit,
+            None,
+            None,
+            entity_category=EntityCategory.DIAGNOSTIC,
+        )
+
+    def _read(self):
+        samples = self._io.read(self._channel)
+        self._spi_time_ms = round(samples.spi_time_ms, 3)
+        voltage = (
+            reduce_samples(self._reducer, samples.values) * self._reference_voltage
+        )
+        self._value = self._calibration.value(voltage)
+
+
+class DistanceFilter:
+    """
+    The median of the last `window` distances (drops the spurious short echoes),
+    followed by a limit of the change between 2 published distances to `max_step`.
+    """
+
+    def __init__(self, window: int, max_step: float = 0.0) -> None:
+        self._median = MedianFilter(window)
+        self._limit = RateLimitFilter(max_step)
 
+    def update(self, distance: float) -> float:
+        return self._limit.update(self._median.update(distance))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self._median!r}, {self._limit!r})"
+
+
+class DistanceController(SensorsMixin, ClosableMixin, ReprMixin, AutoReadLoop):
+    """
+    Ultrasonic distance sensor, measured every `update_interval_sec` from the
+    shared scheduler. The scheduler runs one job at a time, so the triggers of
+    multiple sensors never overlap. The measurements pass a `DistanceFilter`
+    and the speed of sound follows the temperature of the linked sensor.
+    """
 
-class DistanceController(SensorsMixin, ClosableMixin, ReprMixin):
     def __init__(self, config: DistanceSensorConfig) -> None:
+        super().__init__()
         self.name = config.name
         self.id = config.unique_id
         self.sensor = SensorRef(
@@ -155,12 +541,127 @@ class DistanceController(SensorsMixin, ClosableMixin, ReprMixin):
             config.trigger_pin,
             config.max_distance,
         )
+        self._filter = DistanceFilter(
+            config.filter_window, config.max_rate * config.update_interval_sec
+        )
+        self._temperature_sensor = config.temperature_sensor
+        self._distance: float | None = None
+        self.start_auto_read_loop(config.update_interval_sec)
 
     def get_sensors(self):
         return [self.sensor]
 
     def get_state(self, _):
-        return self._io.distance
+        return self._distance
 
     def release(self) -> None:
+        self.stop_auto_read_loop()
         self._close()
+
+    def _read(self):
+        self._compensate_temperature()
+        distance = self._io.measure()
+        if distance is None:
+            _LOGGER.debug(f"{self!r}: no echo")
+            return
+
+        self._distance = round(self._filter.update(distance), 3)
+
+    def _compensate_temperature(self):
+        if self._temperature_sensor == "":
+            return
+
+        source = get_temperature_source(self._temperature_sensor)
+        temperature = source.temperature if source is not None else None
+        if temperature is not None:
+            self._io.speed_of_sound = speed_of_sound(temperature)
+
+
+class PulseCounterController(SensorsMixin, ReprMixin, AutoReadLoop):
+    """
+    Pulse count, edge rate and duty cycle of a binary sensor.
+    The `counter` is fed by the binary sensor edges and the rates are updated
+    every `counter_interval_sec` from the shared scheduler.
+    """
+
+    def __init__(self, config: BinarySensorConfig) -> None:
+        super().__init__()
+        self.name = config.name
+        self.id = config.unique_id
+        self._io = PulseCounter(config.default_state)
+        self._pulses_id = f"{self.id}_pulses"
+        self._edge_rate_id = f"{self.id}_edge_rate"
+        self._duty_cycle_id = f"{self.id}_duty_cycle"
+        self._snapshot = self._io.snapshot()
+        self._rates = PulseRates(None, None)
+        self.start_auto_read_loop(config.counter_interval_sec)
+
+    @property
+    def counter(self) -> PulseCounter:
+        """The counter to pass to the binary sensor device."""
+        return self._io
+
+    def get_sensors(self):
+        return [
+            self.create_sensor("Pulses", self._pulses_id, None),
+            self.create_sensor("Edge rate", self._edge_rate_id, "edges/min"),
+            self.create_sensor("Duty cycle", self._duty_cycle_id, "%"),
+        ]
+
+    def get_state(self, id: str) -> float:
+        if id == self._pulses_id:
+            return self._snapshot.pulses
+        elif id == self._edge_rate_id:
+            return self._rates.edges_per_minute
+        elif id == self._duty_cycle_id:
+            return self._rates.duty_cycle
+
+        raise ValueError(f"Unknown sensor id: {id}")
+
+    def release(self) -> None:
+        self.stop_auto_read_loop()
+
+    def _read(self):
+        snapshot = self._io.snapshot()
+        self._rates = pulse_rates(self._snapshot, snapshot)
+        self._snapshot = snapshot
+
+
+class FrequencyController(SensorsMixin, ReprMixin, AutoReadLoop):
+    """
+    Frequency of a pulse train (e.g. flow meter, anemometer or fan tachometer),
+    updated every `window_sec` from the shared scheduler.
+    The sensor value is the frequency in Hz multiplied by the `factor`.
+    """
+
+    def __init__(self, config: FrequencySensorConfig) -> None:
+        super().__init__()
+        self.name = config.name
+        self.id = config.unique_id
+        self.sensor = SensorRef(
+            self, self.name, self.id, config.native_unit, None, None
+        )
+        self._factor = config.factor
+        self._value: float | None = None
+        self._io = FrequencyCounter(config.pin)
+        self.start_auto_read_loop(config.window_sec)
+
+    def get_sensors(self):
+        return [self.sensor]
+
+    def get_state(self, id: str) -> float | None:
+        if id != self.id:
+            raise ValueError(f"{self!r}: unknown sensor id: {id}")
+
+        return self._value
+
+    def release(self) -> None:
+        self.stop_auto_read_loop()
+        if self._io is not None:
+            self._io.close()
+            self._io = None
+
+    def _read(self):
+        window = self._io.window()
+        self._value = round(window.frequency_hz * self._factor, 3)
+        _LOGGER.debug(f"{self!r}: {window.pulses} pulses, {window.frequency_hz:.3f}Hz")
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import importlib
 import logging
 import time
 
@@ -17,3 +18,14 @@ def get_logger():
 def sleep_sec(sec: float) -> None:
     """Sleep for the specified amount of seconds."""
     time.sleep(sec)
+
+
+def import_attribute(path: str):
+    """
+    Import the `module:attribute` path, e.g. 'gpiozero:MCP3008'. A module
+    starting with '.' is relative to the integration package.
+    """
+    module_name, attribute = path.split(":", 1)
+    package = __package__ if module_name.startswith(".") else None
+    module = importlib.import_module(module_name, package)
+    return getattr(module, attribute)
@@ -12,8 +12,10 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from ._base import ClosableMixin, DeviceMixin, ReprMixin
 from ._devices import BinarySensor, Switch
+from ._pin_factory import use_pin_factory_host
 from .core import DOMAIN, sleep_sec
-from .hub import Hub, Roller
+from .controllers.cover import Roller
+from .hub import Hub
 from .schemas.cover import ToggleRollerConfig
 from .schemas.main import EntityTypes
 
@@ -25,10 +27,11 @@ async def async_setup_entry(
 ) -> None:
     """Add cover for passed config_entry in HA."""
     hub: Hub = hass.data[DOMAIN][config_entry.entry_id]
-    if hub.is_type(EntityTypes.COVER_UP_DOWN):
-        async_add_entities([GpioCover(hub.controller)])
-    elif hub.is_type(EntityTypes.COVER_TOGGLE):
-        async_add_entities([GpioBasicCover(hub.config)])
+    with use_pin_factory_host(hub.host):
+        if hub.is_type(EntityTypes.COVER_UP_DOWN):
+            async_add_entities([GpioCover(hub.controller)])
+        elif hub.is_type(EntityTypes.COVER_TOGGLE):
+            async_add_entities([GpioBasicCover(hub.config)])
 
 
 def get_device_class(mode: str) -> CoverDeviceClass:
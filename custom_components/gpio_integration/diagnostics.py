@@ -0,0 +1,23 @@
+"""Diagnostics support for the GPIO integration."""
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from ._pin_factory import get_discovery
+from ._stats import get_statistics
+from .core import DOMAIN
+from .hub import Hub
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    """Return the read statistics of the sensors and the pin factory discovery."""
+    hub: Hub = hass.data[DOMAIN][entry.entry_id]
+    controller = getattr(hub, "controller", None)
+    id = getattr(controller, "id", None)
+    return {
+        "type": entry.data.get("type"),
+        "statistics": get_statistics(id) if id is not None else {},
+        "pin_factory_discovery": get_discovery(),
+    }
@@ -9,6 +9,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from ._base import ClosableMixin, ReprMixin
 from ._devices import PwmFromPercent
+from ._pin_factory import use_pin_factory_host
 from .core import DOMAIN, get_logger
 from .hub import Hub
 from .schemas.pwm import PwmConfig
@@ -23,7 +24,8 @@ async def async_setup_entry(
 ) -> None:
     """Add switch for passed config_entry in HA."""
     hub: Hub = hass.data[DOMAIN][config_entry.entry_id]
-    async_add_entities([GpioFan(hub.config)])
+    with use_pin_factory_host(hub.host):
+        async_add_entities([GpioFan(hub.config)])
 
 
 class GpioFan(ClosableMixin, ReprMixin, FanEntity):
@@ -1,23 +1,38 @@
-from homeassistant.const import Platform
-
-from .config_flow import fill_schema_missing_values
-from .controllers.cover import Roller
-from .controllers.sensor import AnalogStepControl, DHT22Controller, DistanceController
-from .core import get_logger
-from .schemas.binary_sensor import BinarySensorConfig
-from .schemas.cover import RollerConfig, ToggleRollerConfig
-from .schemas.light import RgbLightConfig
+from homeassistant.const import CONF_HOST, Platform
+
+from ._pin_factory import use_pin_factory_host
+from .core import get_logger, import_attribute
+from .schemas import fill_schema_defaults
 from .schemas.main import EntityTypes
-from .schemas.pwm import PwmConfig
-from .schemas.sensor import AnalogStepConfig, DHT22Config, DistanceSensorConfig
-from .schemas.servo import ServoConfig
-from .schemas.switch import SwitchConfig
 
 _LOGGER = get_logger()
 
+# The schema of every entity type, imported only for the configured type
+# (the same schemas as `config_flow.CONF_ENTITIES`).
+HUB_SCHEMAS = {
+    EntityTypes.COVER_UP_DOWN: ".schemas.cover:COVER_UP_DOWN_SCHEMA",
+    EntityTypes.COVER_TOGGLE: ".schemas.cover:COVER_TOGGLE_SCHEMA",
+    EntityTypes.BINARY_SENSOR: ".schemas.binary_sensor:BINARY_SENSOR_SCHEMA",
+    EntityTypes.SWITCH: ".schemas.switch:SWITCH_SCHEMA",
+    EntityTypes.LIGHT_PWM_LED: ".schemas.light:LIGHT_SCHEMA",
+    EntityTypes.LIGHT_RGB_LED: ".schemas.light:RGB_LIGHT_SCHEMA",
+    EntityTypes.FAN: ".schemas.fan:FAN_SCHEMA",
+    EntityTypes.SENSOR_DHT22: ".schemas.sensor:SENSOR_DHT22_SCHEMA",
+    EntityTypes.SENSOR_ANALOG_STEP: ".schemas.sensor:SENSOR_ANALOG_STEP_SCHEMA",
+    EntityTypes.SENSOR_DISTANCE: ".schemas.sensor:SENSOR_DISTANCE_SCHEMA",
+    EntityTypes.SENSOR_FREQUENCY: ".schemas.sensor:SENSOR_FREQUENCY_SCHEMA",
+    EntityTypes.SERVO: ".schemas.servo:SERVO_SCHEMA",
+}
+
 
 class Hub:
-    """Dummy hub for Hello World example."""
+    """
+    Dummy hub for Hello World example.
+
+    The config and the controller modules are imported in the branch of the
+    entity type, so an entry loads only the modules of its own type. The
+    devices of the entry use the pin factory of `host` (see `use_pin_factory_host`).
+    """
 
     def __init__(self, configs) -> None:
         """Init hub."""
@@ -26,47 +41,92 @@ class Hub:
         self._type = EntityTypes(configs["type"])
         _LOGGER.debug('Hub: type "%s"', self._type.name)
 
-        if self._type is not None and configs:
-            fill_schema_missing_values(self._type, configs)
+        if self._type in HUB_SCHEMAS and configs:
+            fill_schema_defaults(import_attribute(HUB_SCHEMAS[self._type]), configs)
 
+        self.host: str = configs.get(CONF_HOST) or ""
+        with use_pin_factory_host(self.host):
+            self._init_type(configs)
+
+    def _init_type(self, configs: dict) -> None:
         if self.is_type(EntityTypes.COVER_UP_DOWN):
+            from .controllers.cover import Roller
+            from .schemas.cover import RollerConfig
+
             self.config = RollerConfig(configs)
             self.controller = Roller(self.config)
             self.platforms = [Platform.COVER, Platform.NUMBER]
         elif self.is_type(EntityTypes.COVER_TOGGLE):
+            from .schemas.cover import ToggleRollerConfig
+
             self.config = ToggleRollerConfig(configs)
             self.platforms = [Platform.COVER]
         elif self.is_type(EntityTypes.BINARY_SENSOR):
+            from .schemas.binary_sensor import BinarySensorConfig
+
             self.config = BinarySensorConfig(configs)
             self.platforms = [Platform.BINARY_SENSOR]
+            if self.config.counter_interval_sec > 0:
+                from .controllers.sensor import PulseCounterController
+
+                self.controller = PulseCounterController(self.config)
+                self.sensors = self.controller.get_sensors()
+                self.platforms.append(Platform.SENSOR)
         elif self.is_type(EntityTypes.SWITCH):
+            from .schemas.switch import SwitchConfig
+
             self.config = SwitchConfig(configs)
             self.platforms = [Platform.SWITCH]
         elif self.is_type(EntityTypes.LIGHT_PWM_LED):
+            from .schemas.pwm import PwmConfig
+
             self.config = PwmConfig(configs)
             self.platforms = [Platform.LIGHT]
         elif self.is_type(EntityTypes.LIGHT_RGB_LED):
+            from .schemas.light import RgbLightConfig
+
             self.config = RgbLightConfig(configs)
             self.platforms = [Platform.LIGHT]
         elif self.is_type(EntityTypes.FAN):
+            from .schemas.pwm import PwmConfig
+
             self.config = PwmConfig(configs)
             self.platforms = [Platform.FAN]
         elif self.is_type(EntityTypes.SENSOR_DHT22):
+            from .controllers.sensor import DHT22Controller
+            from .schemas.sensor import DHT22Config
+
             self.config = DHT22Config(configs)
             self.controller = DHT22Controller(self.config)
             self.sensors = self.controller.get_sensors()
             self.platforms = [Platform.SENSOR]
         elif self.is_type(EntityTypes.SENSOR_ANALOG_STEP):
+            from .controllers.sensor import AnalogStepControl
+            from .schemas.sensor import AnalogStepConfig
+
             self.config = AnalogStepConfig(configs)
             self.controller = AnalogStepControl(self.config)
             self.sensors = self.controller.get_sensors()
             self.platforms = [Platform.SENSOR]
         elif self.is_type(EntityTypes.SENSOR_DISTANCE):
+            from .controllers.sensor import DistanceController
+            from .schemas.sensor import DistanceSensorConfig
+
             self.config = DistanceSensorConfig(configs)
             self.controller = DistanceController(self.config)
             self.sensors = self.controller.get_sensors()
             self.platforms = [Platform.SENSOR]
+        elif self.is_type(EntityTypes.SENSOR_FREQUENCY):
+            from .controllers.sensor import FrequencyController
+            from .schemas.sensor import FrequencySensorConfig
+
+            self.config = FrequencySensorConfig(configs)
+            self.controller = FrequencyController(self.config)
+            self.sensors = self.controller.get_sensors()
+            self.platforms = [Platform.SENSOR]
         elif self.is_type(EntityTypes.SERVO):
+            from .schemas.servo import ServoConfig
+
             self.config = ServoConfig(configs)
             self.platforms = [Platform.NUMBER]
 
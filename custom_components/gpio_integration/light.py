@@ -16,6 +16,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from ._base import ClosableMixin, ReprMixin
 from ._devices import Pwm, RgbLight, Switch
+from ._pin_factory import use_pin_factory_host
 from .core import DOMAIN, get_logger
 from .hub import Hub
 from .schemas.light import RgbLightConfig
@@ -33,10 +34,11 @@ async def async_setup_entry(
 ) -> None:
     """Add switch for passed config_entry in HA."""
     hub: Hub = hass.data[DOMAIN][config_entry.entry_id]
-    if hub.is_type(EntityTypes.LIGHT_PWM_LED):
-        async_add_entities([GpioLight(hub.config)])
-    elif hub.is_type(EntityTypes.LIGHT_RGB_LED):
-        async_add_entities([RgbGpioLight(hub.config)])
+    with use_pin_factory_host(hub.host):
+        if hub.is_type(EntityTypes.LIGHT_PWM_LED):
+            async_add_entities([GpioLight(hub.config)])
+        elif hub.is_type(EntityTypes.LIGHT_RGB_LED):
+            async_add_entities([RgbGpioLight(hub.config)])
 
 
 BLINKS: dict = {
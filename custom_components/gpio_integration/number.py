@@ -5,8 +5,10 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from ._base import ClosableMixin, DeviceMixin, ReprMixin
 from ._devices import Servo
+from ._pin_factory import use_pin_factory_host
 from .core import DOMAIN, get_logger
-from .hub import Hub, Roller
+from .controllers.cover import Roller
+from .hub import Hub
 from .schemas.main import EntityTypes
 from .schemas.servo import ServoConfig
 
@@ -20,10 +22,11 @@ async def async_setup_entry(
 ) -> None:
     """Add cover for passed config_entry in HA."""
     hub: Hub = hass.data[DOMAIN][config_entry.entry_id]
-    if hub.is_type(EntityTypes.COVER_UP_DOWN):
-        async_add_entities([GpioPosition(hub.controller)])
-    elif hub.is_type(EntityTypes.SERVO):
-        async_add_entities([GpioServo(hub.config)])
+    with use_pin_factory_host(hub.host):
+        if hub.is_type(EntityTypes.COVER_UP_DOWN):
+            async_add_entities([GpioPosition(hub.controller)])
+        elif hub.is_type(EntityTypes.SERVO):
+            async_add_entities([GpioServo(hub.config)])
 
 
 class GpioPosition(ClosableMixin, ReprMixin, DeviceMixin, NumberEntity):
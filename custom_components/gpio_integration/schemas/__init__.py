@@ -6,7 +6,9 @@ from homeassistant.const import CONF_HOST, CONF_NAME, CONF_UNIQUE_ID
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.selector import selector
 
-from ..core import DOMAIN
+from ..core import DOMAIN, get_logger
+
+_LOGGER = get_logger()
 
 CONF_COVERS = "covers"
 CONF_RELAY_CLOSE_PIN = "close_pin"
@@ -46,6 +48,26 @@ def get_unique_id(data: dict) -> str | None:
     return data.get(CONF_UNIQUE_ID) or data[CONF_NAME].lower().replace(" ", "_") or None
 
 
+def fill_schema_defaults(schema: vol.Schema, configs: dict) -> None:
+    """Add the default of every optional key of the schema missing in the config."""
+    if isinstance(schema.schema, dict):
+        for key in schema.schema.keys():
+            # Skip anything not an optional key
+            if not isinstance(key, vol.Optional):
+                continue
+
+            # If not present in config data, copy in default
+            if key.schema not in configs:
+                defVal = key.default()
+                _LOGGER.debug(
+                    'Hub: setting missing default for config "%s" to value "%s"',
+                    key.schema,
+                    defVal,
+                )
+
+                configs.setdefault(key.schema, defVal)
+
+
 # Selectors as described by https://www.home-assistant.io/docs/blueprint/selectors
 
 
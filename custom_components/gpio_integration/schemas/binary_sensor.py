@@ -2,8 +2,15 @@
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
-from homeassistant.const import CONF_MODE, CONF_NAME, CONF_PORT, CONF_UNIQUE_ID
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_MODE,
+    CONF_NAME,
+    CONF_PORT,
+    CONF_UNIQUE_ID,
+)
 
+from .._debounce import DEBOUNCE_FACTORY, DEBOUNCE_MODES
 from . import (
     CONF_BOUNCE_TIME,
     CONF_DEFAULT_STATE,
@@ -12,7 +19,11 @@ from . import (
     dropdown,
     get_unique_id,
 )
-from ._validators import v_name, v_pin, v_time
+from ._validators import v_assert, v_name, v_pin, v_positive_or_zero, v_time
+
+CONF_COALESCE_WINDOW = "coalesce_window_in_ms"
+CONF_DEBOUNCE_MODE = "debounce_mode"
+CONF_COUNTER_INTERVAL = "counter_interval_in_sec"
 
 
 def create_binary_sensor_schema(data: dict) -> vol.Schema:
@@ -29,6 +40,11 @@ def create_binary_sensor_schema(data: dict) -> vol.Schema:
                 default=data[CONF_BOUNCE_TIME],
                 description={"comment": "Bounce time for the sensor in milliseconds"},
             ): cv.positive_int,
+            vol.Optional(
+                CONF_DEBOUNCE_MODE,
+                default=data[CONF_DEBOUNCE_MODE],
+                description={"comment": "Debounce by the pin factory or in software"},
+            ): dropdown(DEBOUNCE_MODES),
             vol.Optional(
                 CONF_INVERT_LOGIC,
                 default=data[CONF_INVERT_LOGIC],
@@ -51,6 +67,17 @@ def create_binary_sensor_schema(data: dict) -> vol.Schema:
             vol.Optional(
                 CONF_EDGE_EVENT_TIMEOUT, default=data[CONF_EDGE_EVENT_TIMEOUT]
             ): cv.positive_int,
+            vol.Optional(
+                CONF_COALESCE_WINDOW,
+                default=data[CONF_COALESCE_WINDOW],
+                description={"comment": "Min time between state writes (0 = off)"},
+            ): cv.positive_int,
+            vol.Optional(
+                CONF_COUNTER_INTERVAL,
+                default=data[CONF_COUNTER_INTERVAL],
+                description={"comment": "Pulse counter update interval (0 = off)"},
+            ): cv.positive_int,
+            vol.Optional(CONF_HOST, default=data[CONF_HOST]): cv.string,
             vol.Optional(CONF_UNIQUE_ID, default=data[CONF_UNIQUE_ID]): cv.string,
         }
     )
@@ -61,10 +88,14 @@ BINARY_SENSOR_SCHEMA = create_binary_sensor_schema(
         CONF_NAME: None,
         CONF_PORT: None,
         CONF_BOUNCE_TIME: 200,
+        CONF_DEBOUNCE_MODE: DEBOUNCE_FACTORY,
         CONF_INVERT_LOGIC: False,
         CONF_MODE: "Door",
         CONF_DEFAULT_STATE: False,
         CONF_EDGE_EVENT_TIMEOUT: 0,
+        CONF_COALESCE_WINDOW: 0,
+        CONF_COUNTER_INTERVAL: 0,
+        CONF_HOST: "",
         CONF_UNIQUE_ID: "",
     }
 )
@@ -75,6 +106,11 @@ def validate_binary_sensor_data(data):
         v_name(data[CONF_NAME])
         and v_pin(data[CONF_PORT])
         and v_time(data[CONF_BOUNCE_TIME])
+        and v_positive_or_zero(data[CONF_COALESCE_WINDOW])
+        and v_positive_or_zero(data[CONF_COUNTER_INTERVAL])
+        and v_assert(
+            data[CONF_DEBOUNCE_MODE] in DEBOUNCE_MODES, "Unknown debounce mode"
+        )
     )
 
 
@@ -84,7 +120,10 @@ class BinarySensorConfig:
         self.pin: int = data[CONF_PORT]
         self.mode: str = data[CONF_MODE]
         self.bounce_time_ms: int = data[CONF_BOUNCE_TIME]
+        self.debounce_mode: str = data[CONF_DEBOUNCE_MODE]
         self.invert_logic: bool = data[CONF_INVERT_LOGIC]
         self.default_state: bool = data[CONF_DEFAULT_STATE]
         self.edge_event_timeout_sec: int = data[CONF_EDGE_EVENT_TIMEOUT]
+        self.coalesce_window_ms: int = data[CONF_COALESCE_WINDOW]
+        self.counter_interval_sec: int = data[CONF_COUNTER_INTERVAL]
         self.unique_id: str = get_unique_id(data)
@@ -4,7 +4,13 @@ from typing import Literal
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
-from homeassistant.const import CONF_MODE, CONF_NAME, CONF_PORT, CONF_UNIQUE_ID
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_MODE,
+    CONF_NAME,
+    CONF_PORT,
+    CONF_UNIQUE_ID,
+)
 
 from . import (
     CONF_INVERT_LOGIC,
@@ -77,6 +83,7 @@ def create_cover_up_down_schema(data: dict) -> vol.Schema:
                 CONF_PIN_CLOSED_SENSOR, default=data[CONF_PIN_CLOSED_SENSOR]
             ): cv.positive_int,
             vol.Required(CONF_MODE, default=data[CONF_MODE]): dropdown(COVER_MODES),
+            vol.Optional(CONF_HOST, default=data[CONF_HOST]): cv.string,
             vol.Optional(CONF_UNIQUE_ID, default=data[CONF_UNIQUE_ID]): cv.string,
         }
     )
@@ -92,6 +99,7 @@ COVER_UP_DOWN_SCHEMA = create_cover_up_down_schema(
         CONF_RELAY_TIME: 15,
         CONF_PIN_CLOSED_SENSOR: 0,
         CONF_MODE: "Blind",
+        CONF_HOST: "",
         CONF_UNIQUE_ID: "",
     }
 )
@@ -152,6 +160,7 @@ def create_toggle_cover_schema(data: dict) -> vol.Schema:
                 CONF_PIN_CLOSED_SENSOR, default=data[CONF_PIN_CLOSED_SENSOR]
             ): cv.positive_int,
             vol.Required(CONF_MODE, default=data[CONF_MODE]): dropdown(COVER_MODES),
+            vol.Optional(CONF_HOST, default=data[CONF_HOST]): cv.string,
             vol.Optional(CONF_UNIQUE_ID, default=data[CONF_UNIQUE_ID]): cv.string,
         }
     )
@@ -165,6 +174,7 @@ COVER_TOGGLE_SCHEMA = create_toggle_cover_schema(
         CONF_RELAY_TIME: 0.4,
         CONF_PIN_CLOSED_SENSOR: 0,
         CONF_MODE: "Blind",
+        CONF_HOST: "",
         CONF_UNIQUE_ID: "",
     }
 )
@@ -1,6 +1,6 @@
 """Schema for the Fan entities."""
 
-from homeassistant.const import CONF_NAME, CONF_PORT, CONF_UNIQUE_ID
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_UNIQUE_ID
 
 from . import (
     CONF_DEFAULT_STATE,
@@ -16,6 +16,7 @@ FAN_SCHEMA = create_pwm_schema(
         CONF_FREQUENCY: 100,
         CONF_DEFAULT_STATE: False,
         CONF_INVERT_LOGIC: False,
+        CONF_HOST: "",
         CONF_UNIQUE_ID: "",
     }
 )
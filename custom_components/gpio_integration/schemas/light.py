@@ -2,7 +2,7 @@
 
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
-from homeassistant.const import CONF_NAME, CONF_PORT, CONF_UNIQUE_ID
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_UNIQUE_ID
 
 from . import (
     CONF_DEFAULT_STATE,
@@ -45,6 +45,7 @@ LIGHT_SCHEMA = create_pwm_schema(
         CONF_FREQUENCY: 0,
         CONF_DEFAULT_STATE: False,
         CONF_INVERT_LOGIC: False,
+        CONF_HOST: "",
         CONF_UNIQUE_ID: "",
     }
 )
@@ -114,6 +115,7 @@ def create_rgb_light_schema(data: dict) -> vol.Schema:
                     "comment": "Brightness correction factor blue color (0-100%)"
                 },
             ): number_slider(1),
+            vol.Optional(CONF_HOST, default=data[CONF_HOST]): cv.string,
             vol.Optional(CONF_UNIQUE_ID, default=data[CONF_UNIQUE_ID]): cv.string,
         }
     )
@@ -131,6 +133,7 @@ RGB_LIGHT_SCHEMA = create_rgb_light_schema(
         CONF_RED_INTENSITY: 100,
         CONF_GREEN_INTENSITY: 100,
         CONF_BLUE_INTENSITY: 100,
+        CONF_HOST: "",
         CONF_UNIQUE_ID: "",
     }
 )
@@ -19,6 +19,7 @@ class EntityTypes(Enum):
     SENSOR_DHT22 = "sensor_dht22"
     SENSOR_ANALOG_STEP = "sensor_analog_step"
     SENSOR_DISTANCE = "sensor_distance"
+    SENSOR_FREQUENCY = "sensor_frequency"
     SERVO = "servo"
 
 
@@ -3,7 +3,7 @@
 import voluptuous as vol
 
 import homeassistant.helpers.config_validation as cv
-from homeassistant.const import CONF_NAME, CONF_PORT, CONF_UNIQUE_ID
+from homeassistant.const import CONF_HOST, CONF_NAME, CONF_PORT, CONF_UNIQUE_ID
 
 from . import CONF_DEFAULT_STATE, CONF_FREQUENCY, CONF_INVERT_LOGIC, get_unique_id
 from ._validators import v_name, v_pin
@@ -33,6 +33,7 @@ def create_pwm_schema(data: dict) -> vol.Schema:
                 default=data[CONF_INVERT_LOGIC],
                 description={"comment": "Invert the logic of the output (low = on)"},
             ): cv.boolean,
+            vol.Optional(CONF_HOST, default=data[CONF_HOST]): cv.string,
             vol.Optional(CONF_UNIQUE_ID, default=data[CONF_UNIQUE_ID]): cv.string,
         }
     )
@@ -3,12 +3,26 @@
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant.const import (
+    CONF_HOST,
     CONF_NAME,
     CONF_PORT,
     CONF_UNIQUE_ID,
 )
 
-from .._devices import MCP_NAMES
+from .._calibration import (
+    CALIBRATION_LINEAR,
+    CALIBRATION_NAMES,
+    create_calibration,
+)
+from .._devices import MCP_NAMES, SINGLE_WIRE_PROTOCOL_NAMES
+from .._filters import (
+    FILTER_NAMES,
+    FILTER_NONE,
+    MAX_FILTER_WINDOW,
+    MIN_FILTER_WINDOW,
+    REDUCER_MEAN,
+    REDUCER_NAMES,
+)
 from . import (
     CONF_PIN_TRIGGER,
     EMPTY_VARIATION_DATA,
@@ -17,14 +31,18 @@ from . import (
     get_unique_id,
     validate_variation_data,
 )
-from ._validators import v_name, v_pin, v_positive, v_positive_or_zero
+from ._validators import v_assert, v_name, v_pin, v_positive, v_positive_or_zero
 from .main import EntityTypes
 
 CONF_MAX_DISTANCE = "max_distance"
+CONF_MEASURE_INTERVAL = "measure_interval_in_sec"
+CONF_MAX_RATE = "max_rate"
+CONF_TEMPERATURE_SENSOR = "temperature_sensor"
 SENSOR_VARIATIONS = {
-    EntityTypes.SENSOR_DHT22.value: "DHT22",
+    EntityTypes.SENSOR_DHT22.value: "DHT22 (DHT11, AM2302, AM2320)",
     EntityTypes.SENSOR_ANALOG_STEP.value: "Analog Step",
     EntityTypes.SENSOR_DISTANCE.value: "Distance",
+    EntityTypes.SENSOR_FREQUENCY.value: "Frequency (flow meter, anemometer, tachometer)",
 }
 
 
@@ -41,6 +59,10 @@ def validate_sensor_variation_data(data):
 
 ### Sensor Serial Data ###
 
+CONF_PROTOCOL = "protocol"
+CONF_FILTER = "filter"
+CONF_FILTER_WINDOW = "filter_window"
+
 
 def create_sensor_dht22_schema(data: dict) -> vol.Schema:
     return vol.Schema(
@@ -51,6 +73,18 @@ def create_sensor_dht22_schema(data: dict) -> vol.Schema:
                 default=data[CONF_PORT],
                 description={"comment": "GPIO pin number for the switch"},
             ): cv.positive_int,
+            vol.Optional(CONF_PROTOCOL, default=data[CONF_PROTOCOL]): dropdown(
+                SINGLE_WIRE_PROTOCOL_NAMES
+            ),
+            vol.Optional(CONF_FILTER, default=data[CONF_FILTER]): dropdown(
+                FILTER_NAMES
+            ),
+            vol.Optional(
+                CONF_FILTER_WINDOW,
+                default=data[CONF_FILTER_WINDOW],
+                description={"comment": "Number of samples the filter uses"},
+            ): cv.positive_int,
+            vol.Optional(CONF_HOST, default=data[CONF_HOST]): cv.string,
             vol.Optional(CONF_UNIQUE_ID, default=data[CONF_UNIQUE_ID]): cv.string,
         }
     )
@@ -60,13 +94,28 @@ SENSOR_DHT22_SCHEMA = create_sensor_dht22_schema(
     {
         CONF_NAME: None,
         CONF_PORT: None,
+        CONF_PROTOCOL: "DHT22",
+        CONF_FILTER: FILTER_NONE,
+        CONF_FILTER_WINDOW: 5,
+        CONF_HOST: "",
         CONF_UNIQUE_ID: "",
     }
 )
 
 
 def validate_sensor_dht22_data(data):
-    return v_name(data[CONF_NAME]) and v_pin(data[CONF_PORT])
+    return (
+        v_name(data[CONF_NAME])
+        and v_pin(data[CONF_PORT])
+        and v_assert(
+            data[CONF_PROTOCOL] in SINGLE_WIRE_PROTOCOL_NAMES, "Unknown protocol"
+        )
+        and v_assert(data[CONF_FILTER] in FILTER_NAMES, "Unknown filter")
+        and v_assert(
+            MIN_FILTER_WINDOW <= data[CONF_FILTER_WINDOW] <= MAX_FILTER_WINDOW,
+            f"Filter window must be in range {MIN_FILTER_WINDOW} - {MAX_FILTER_WINDOW}",
+        )
+    )
 
 
 ### Sensor Analog Step ###
@@ -78,6 +127,13 @@ CONF_MIN_VALUE = "min_value"
 CONF_STEP_VOLTAGE = "step_voltage"
 CONF_STEP_VALUE = "step_value"
 CONF_NATIVE_UNIT = "native_unit"
+CONF_OVERSAMPLING = "oversampling"
+CONF_REDUCER = "reducer"
+CONF_CALIBRATION = "calibration"
+CONF_CALIBRATION_DATA = "calibration_data"
+CONF_REFERENCE_VOLTAGE = "reference_voltage"
+
+MAX_OVERSAMPLING = 64
 
 
 def create_sensor_analog_step_schema(data: dict) -> vol.Schema:
@@ -97,6 +153,26 @@ def create_sensor_analog_step_schema(data: dict) -> vol.Schema:
                 CONF_STEP_VALUE, default=data[CONF_STEP_VALUE]
             ): cv.positive_float,
             vol.Required(CONF_NATIVE_UNIT, default=data[CONF_NATIVE_UNIT]): cv.string,
+            vol.Optional(
+                CONF_OVERSAMPLING,
+                default=data[CONF_OVERSAMPLING],
+                description={"comment": "Number of conversions per read"},
+            ): cv.positive_int,
+            vol.Optional(CONF_REDUCER, default=data[CONF_REDUCER]): dropdown(
+                REDUCER_NAMES
+            ),
+            vol.Optional(
+                CONF_REFERENCE_VOLTAGE, default=data[CONF_REFERENCE_VOLTAGE]
+            ): cv.positive_float,
+            vol.Optional(CONF_CALIBRATION, default=data[CONF_CALIBRATION]): dropdown(
+                CALIBRATION_NAMES
+            ),
+            vol.Optional(
+                CONF_CALIBRATION_DATA,
+                default=data[CONF_CALIBRATION_DATA],
+                description={"comment": "Table 'voltage:value, ...' or 'c0, c1, ...'"},
+            ): cv.string,
+            vol.Optional(CONF_HOST, default=data[CONF_HOST]): cv.string,
             vol.Optional(CONF_UNIQUE_ID, default=data[CONF_UNIQUE_ID]): cv.string,
         }
     )
@@ -112,6 +188,12 @@ SENSOR_ANALOG_STEP_SCHEMA = create_sensor_analog_step_schema(
         CONF_STEP_VOLTAGE: 0.1,
         CONF_STEP_VALUE: 1.0,
         CONF_NATIVE_UNIT: "",
+        CONF_OVERSAMPLING: 1,
+        CONF_REDUCER: REDUCER_MEAN,
+        CONF_REFERENCE_VOLTAGE: 3.3,
+        CONF_CALIBRATION: CALIBRATION_LINEAR,
+        CONF_CALIBRATION_DATA: "",
+        CONF_HOST: "",
         CONF_UNIQUE_ID: "",
     }
 )
@@ -126,15 +208,58 @@ def validate_sensor_analog_step_data(data):
         and v_positive(data[CONF_STEP_VOLTAGE])
         and v_positive(data[CONF_STEP_VALUE])
         and v_name(data[CONF_NATIVE_UNIT])
+        and v_assert(
+            1 <= data[CONF_OVERSAMPLING] <= MAX_OVERSAMPLING,
+            f"Oversampling must be in range 1 - {MAX_OVERSAMPLING}",
+        )
+        and v_assert(data[CONF_REDUCER] in REDUCER_NAMES, "Unknown reducer")
+        and v_positive(data[CONF_REFERENCE_VOLTAGE])
+        and v_assert(data[CONF_CALIBRATION] in CALIBRATION_NAMES, "Unknown calibration")
+        and v_calibration(data)
     )
 
 
+def v_calibration(data) -> bool:
+    """Validate the calibration table or polynomial can be parsed."""
+    if data[CONF_CALIBRATION] == CALIBRATION_LINEAR:
+        return True
+
+    try:
+        create_calibration(
+            data[CONF_CALIBRATION],
+            data[CONF_CALIBRATION_DATA],
+            data[CONF_REFERENCE_VOLTAGE],
+            None,
+        )
+    except ValueError as error:
+        raise ValueError(f"Invalid calibration data: {error}") from error
+
+    return True
+
+
 SENSOR_DISTANCE_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_NAME, default=None): cv.string,
         vol.Required(CONF_PORT, default=None): cv.positive_int,
         vol.Required(CONF_PIN_TRIGGER, default=None): cv.positive_int,
         vol.Required(CONF_MAX_DISTANCE, default=1.0): cv.positive_float,
+        vol.Optional(CONF_MEASURE_INTERVAL, default=2): cv.positive_int,
+        vol.Optional(
+            CONF_FILTER_WINDOW,
+            default=3,
+            description={"comment": "Number of measurements of the median"},
+        ): cv.positive_int,
+        vol.Optional(
+            CONF_MAX_RATE,
+            default=0.0,
+            description={"comment": "Max change of the distance in m/s (0 = off)"},
+        ): cv.positive_float,
+        vol.Optional(
+            CONF_TEMPERATURE_SENSOR,
+            default="",
+            description={"comment": "Unique ID of a DHT22 sensor"},
+        ): cv.string,
+        vol.Optional(CONF_HOST, default=""): cv.string,
         vol.Optional(CONF_UNIQUE_ID, default=""): cv.string,
     }
 )
@@ -146,6 +271,66 @@ def validate_sensor_distance_data(data):
         and v_pin(data[CONF_PORT])
         and v_pin(data[CONF_PIN_TRIGGER])
         and v_positive(data[CONF_MAX_DISTANCE])
+        and v_positive(data[CONF_MEASURE_INTERVAL])
+        and v_assert(
+            MIN_FILTER_WINDOW <= data[CONF_FILTER_WINDOW] <= MAX_FILTER_WINDOW,
+            f"Filter window must be in range {MIN_FILTER_WINDOW} - {MAX_FILTER_WINDOW}",
+        )
+        and v_positive_or_zero(data[CONF_MAX_RATE])
+    )
+
+
+### Sensor Frequency ###
+
+CONF_WINDOW = "window_in_sec"
+CONF_FACTOR = "factor"
+
+
+def create_sensor_frequency_schema(data: dict) -> vol.Schema:
+    return vol.Schema(
+        {
+            vol.Required(CONF_NAME, default=data[CONF_NAME]): cv.string,
+            vol.Required(
+                CONF_PORT,
+                default=data[CONF_PORT],
+                description={"comment": "GPIO pin number of the pulse input"},
+            ): cv.positive_int,
+            vol.Optional(
+                CONF_WINDOW,
+                default=data[CONF_WINDOW],
+                description={"comment": "Seconds between the frequency updates"},
+            ): cv.positive_int,
+            vol.Optional(
+                CONF_FACTOR,
+                default=data[CONF_FACTOR],
+                description={"comment": "The sensor value is frequency x factor"},
+            ): cv.positive_float,
+            vol.Optional(CONF_NATIVE_UNIT, default=data[CONF_NATIVE_UNIT]): cv.string,
+            vol.Optional(CONF_HOST, default=data[CONF_HOST]): cv.string,
+            vol.Optional(CONF_UNIQUE_ID, default=data[CONF_UNIQUE_ID]): cv.string,
+        }
+    )
+
+
+SENSOR_FREQUENCY_SCHEMA = create_sensor_frequency_schema(
+    {
+        CONF_NAME: None,
+        CONF_PORT: None,
+        CONF_WINDOW: 5,
+        CONF_FACTOR: 1.0,
+        CONF_NATIVE_UNIT: "Hz",
+        CONF_HOST: "",
+        CONF_UNIQUE_ID: "",
+    }
+)
+
+
+def validate_sensor_frequency_data(data):
+    return (
+        v_name(data[CONF_NAME])
+        and v_pin(data[CONF_PORT])
+        and v_positive(data[CONF_WINDOW])
+        and v_positive(data[CONF_FACTOR])
     )
 
 
@@ -155,6 +340,9 @@ class DHT22Config:
         self.pin: int = data[CONF_PORT]
         self.unique_id: str = get_unique_id(data)
         self.update_interval_sec: int = 20
+        self.protocol: str = data[CONF_PROTOCOL]
+        self.filter: str = data[CONF_FILTER]
+        self.filter_window: int = data[CONF_FILTER_WINDOW]
 
 
 class AnalogStepConfig:
@@ -168,6 +356,12 @@ class AnalogStepConfig:
         self.step_voltage: float = data[CONF_STEP_VOLTAGE]
         self.step_value: float = data[CONF_STEP_VALUE]
         self.native_unit: str = data[CONF_NATIVE_UNIT]
+        self.oversampling: int = data[CONF_OVERSAMPLING]
+        self.reducer: str = data[CONF_REDUCER]
+        self.reference_voltage: float = data[CONF_REFERENCE_VOLTAGE]
+        self.calibration: str = data[CONF_CALIBRATION]
+        self.calibration_data: str = data[CONF_CALIBRATION_DATA]
+        self.update_interval_sec: int = 5
 
 
 class DistanceSensorConfig:
@@ -177,3 +371,17 @@ class DistanceSensorConfig:
         self.trigger_pin: int = data[CONF_PIN_TRIGGER]
         self.max_distance: float = data[CONF_MAX_DISTANCE]
         self.unique_id: str = get_unique_id(data)
+        self.update_interval_sec: int = data[CONF_MEASURE_INTERVAL]
+        self.filter_window: int = data[CONF_FILTER_WINDOW]
+        self.max_rate: float = data[CONF_MAX_RATE]
+        self.temperature_sensor: str = data[CONF_TEMPERATURE_SENSOR]
+
+
+class FrequencySensorConfig:
+    def __init__(self, data: dict):
+        self.name: str = data[CONF_NAME]
+        self.pin: int = data[CONF_PORT]
+        self.window_sec: int = data[CONF_WINDOW]
+        self.factor: float = data[CONF_FACTOR]
+        self.native_unit: str = data[CONF_NATIVE_UNIT]
+        self.unique_id: str = get_unique_id(data)
@@ -3,6 +3,7 @@
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant.const import (
+    CONF_HOST,
     CONF_NAME,
     CONF_PORT,
     CONF_UNIQUE_ID,
@@ -26,6 +27,7 @@ SERVO_SCHEMA = vol.Schema(
         vol.Required(CONF_MIN_DUTY_CYCLE, default=1): cv.positive_int,
         vol.Required(CONF_MAX_DUTY_CYCLE, default=2): cv.positive_int,
         vol.Required(CONF_FREQUENCY, default=50): cv.positive_int,
+        vol.Optional(CONF_HOST, default=""): cv.string,
         vol.Optional(CONF_UNIQUE_ID, default=""): cv.string,
     }
 )
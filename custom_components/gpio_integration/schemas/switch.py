@@ -3,6 +3,7 @@
 import homeassistant.helpers.config_validation as cv
 import voluptuous as vol
 from homeassistant.const import (
+    CONF_HOST,
     CONF_NAME,
     CONF_PORT,
     CONF_UNIQUE_ID,
@@ -31,6 +32,7 @@ def create_switch_schema(data: dict) -> vol.Schema:
                 default=data[CONF_DEFAULT_STATE],
                 description={"comment": "Default state of the switch"},
             ): cv.boolean,
+            vol.Optional(CONF_HOST, default=data[CONF_HOST]): cv.string,
             vol.Optional(CONF_UNIQUE_ID, default=data[CONF_UNIQUE_ID]): cv.string,
         }
     )
@@ -42,6 +44,7 @@ SWITCH_SCHEMA = create_switch_schema(
         CONF_PORT: None,
         CONF_INVERT_LOGIC: False,
         CONF_DEFAULT_STATE: False,
+        CONF_HOST: "",
         CONF_UNIQUE_ID: "",
     }
 )
@@ -33,6 +33,9 @@ class GpioSensor(ClosableMixin, DeviceMixin, SensorEntity):
         self._attr_native_unit_of_measurement = sensor.unit
         if sensor.device_class is not None:
             self._attr_device_class = sensor.device_class
+        if sensor.entity_category is not None:
+            self._attr_entity_category = sensor.entity_category
+            self._attr_entity_registry_enabled_default = False
 
         self._io = sensor
 
@@ -44,6 +47,11 @@ class GpioSensor(ClosableMixin, DeviceMixin, SensorEntity):
     def _get_device_id(self) -> str:
         return self._io.device_id
 
+    async def async_added_to_hass(self) -> None:
+        """The controller is released when its last sensor is removed."""
+        self._io.open()
+        await super().async_added_to_hass()
+
     async def async_will_remove_from_hass(self) -> None:
         """Cleanup before removing from hass."""
         self._close()
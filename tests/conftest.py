@@ -4,9 +4,10 @@ import mocked_modules  # noqa: F401
 import pytest
 from gpiozero import Device
 
+from custom_components.gpio_integration._scheduler import Scheduler
 from tests.test__mocks import (
+    MockedCallLater,
     MockedGPIOThread,
-    MockedTrackTimeInterval,
     MockFactory,
     MockMCP,
     get_mock_mcp,
@@ -41,17 +42,43 @@ def mock_gpio_thread(request) -> Generator[MockFactory, None, None]:
 
 
 @pytest.fixture(scope="function")
-def mock_track_time_interval(request) -> Generator[MockedTrackTimeInterval, None, None]:
-    """Mock Event"""
+def mock_auto_update_later(request) -> Generator[MockedCallLater, None, None]:
+    """Mock async_call_later of the state auto-update"""
     import custom_components.gpio_integration._base as base
 
-    saved_track_time_interval = base.async_track_time_interval
+    saved_call_later = base.async_call_later
     try:
-        mock = MockedTrackTimeInterval()
-        base.async_track_time_interval = mock.caller
+        mock = MockedCallLater()
+        base.async_call_later = mock.caller
         yield mock
     finally:
-        base.async_track_time_interval = saved_track_time_interval
+        base.async_call_later = saved_call_later
+
+
+@pytest.fixture(scope="function")
+def mock_call_later(request) -> Generator[MockedCallLater, None, None]:
+    """Mock async_call_later of the binary sensor"""
+    import custom_components.gpio_integration.binary_sensor as binary_sensor
+
+    saved_call_later = binary_sensor.async_call_later
+    try:
+        mock = MockedCallLater()
+        binary_sensor.async_call_later = mock.caller
+        yield mock
+    finally:
+        binary_sensor.async_call_later = saved_call_later
+
+
+@pytest.fixture(scope="function")
+def manual_read_loop(monkeypatch) -> Scheduler:
+    """Run the auto read loops with `run_pending` (and the fake `clock`)"""
+    import custom_components.gpio_integration._base as base
+    from tests.test_scheduler import FakeClock
+
+    scheduler = Scheduler(min_gap_sec=0, clock=FakeClock(), autostart=False)
+    scheduler.clock = scheduler._clock
+    monkeypatch.setattr(base, "get_scheduler", lambda: scheduler)
+    return scheduler
 
 
 @pytest.fixture(scope="function")
@@ -61,6 +88,7 @@ def mock_MCP_chips(request) -> Generator[Callable[[int], MockMCP], None, None]:
 
     saved_MCP_MAP = devices.MCP_CLASS_MAP
     saved_factory = Device.pin_factory
+    devices._ANALOG_BUSES.clear()
     try:
         Device.pin_factory = lambda: None
         devices.MCP_CLASS_MAP = {
@@ -77,4 +105,5 @@ def mock_MCP_chips(request) -> Generator[Callable[[int], MockMCP], None, None]:
         yield get_mock_mcp
     finally:
         devices.MCP_CLASS_MAP = saved_MCP_MAP
+        devices._ANALOG_BUSES.clear()
         Device.pin_factory = saved_factory
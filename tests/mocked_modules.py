@@ -14,6 +14,11 @@ class Platform:
     NUMBER = "number"
 
 
+class EntityCategory:
+    CONFIG = "config"
+    DIAGNOSTIC = "diagnostic"
+
+
 class DeviceInfo:
     def __init__(self, identifiers, name, manufacturer, model, sw_version):
         self.identifiers = identifiers
@@ -41,10 +46,12 @@ sys.modules["voluptuous"].ALLOW_EXTRA = "ALLOW_EXTRA"
 sys.modules["homeassistant"] = Mock()
 sys.modules["homeassistant.const"] = Mock()
 sys.modules["homeassistant.const"].Platform = Platform
+sys.modules["homeassistant.const"].EntityCategory = EntityCategory
 sys.modules["homeassistant.const"].CONF_NAME = "CONF_NAME"
 sys.modules["homeassistant.const"].CONF_PORT = "CONF_PORT"
 sys.modules["homeassistant.const"].CONF_UNIQUE_ID = "CONF_UNIQUE_ID"
 sys.modules["homeassistant.core"] = Mock()
+sys.modules["homeassistant.core"].callback = lambda func: func
 sys.modules["homeassistant.config_entries"] = Mock()
 sys.modules["homeassistant.helpers"] = Mock()
 sys.modules["homeassistant.helpers.config_validation"] = Mock()
@@ -53,6 +60,7 @@ sys.modules["homeassistant.helpers.device_registry"].DeviceInfo = DeviceInfo
 sys.modules["homeassistant.helpers.entity_platform"] = Mock()
 sys.modules["homeassistant.helpers.event"] = Mock()
 sys.modules["homeassistant.helpers.selector"] = Mock()
+sys.modules["homeassistant.helpers.storage"] = Mock()
 sys.modules["homeassistant.helpers.typing"] = Mock()
 sys.modules["homeassistant.exceptions"] = Mock()
 sys.modules["homeassistant.components"] = Mock()
@@ -25,12 +25,22 @@ def assert_gpio_blink(pin, gpio, test: list[tuple[bool, float]]):
         assert test[idx][0] == val
 
 
+class MockedLoop:
+    def call_soon_threadsafe(self, callback, *args):
+        callback(*args)
+
+
+class MockedHass:
+    def __init__(self):
+        self.loop = MockedLoop()
+
+
 class MockedBaseEntity:
     ha_state_update_scheduled = False
     ha_state_update_scheduled_force_refresh = False
     ha_state_write = False
     ha_added_to_hass = False
-    hass = 1
+    hass = MockedHass()
 
     @property
     def name(self) -> str:
@@ -212,20 +222,29 @@ class MockedGPIOThread:
         return list(zip((state.state for state in pin_states), times))
 
 
-class MockedTrackTimeInterval:
+class MockedCallLater:
     def __init__(self):
         self._callback = None
-        self._interval = None
-        self._cancel_on_shutdown = False
+        self.delay = None
+        self.cancelled = False
 
-    def caller(self, hass, callback, interval, cancel_on_shutdown=False) -> int:
+    def caller(self, hass, delay, callback):
         self._callback = callback
-        self._interval = interval
-        self._cancel_on_shutdown = cancel_on_shutdown
-        return 0
+        self.delay = delay
+        self.cancelled = False
+        return self.cancel
+
+    def cancel(self):
+        self.cancelled = True
+
+    @property
+    def pending(self) -> bool:
+        return self._callback is not None and not self.cancelled
 
-    def tick(self):
-        self._callback()
+    def fire(self):
+        callback = self._callback
+        self._callback = None
+        callback(None)
 
 
 MOCK_MCP_INSTANCES: dict[int,] = {}
@@ -240,9 +259,17 @@ def get_mock_mcp(channel: int) -> MockPin:
 
 
 class MockMCP:
+    """
+    Mock of a MCP chip channel. A shared bus switches the `_channel` of a single
+    instance, so the values are read from the instance of the current channel.
+    """
+
     def __init__(self, channel=0, pin_factory=None) -> None:
+        self._channel = channel
         self._value = 0.0
+        self._values: list[float] = []
         self._closed = False
+        self.reads = 0
 
         MOCK_MCP_INSTANCES[channel] = self
 
@@ -252,6 +279,15 @@ class MockMCP:
     def close(self) -> None:
         self._closed = True
 
+    @property
+    def channel(self) -> int:
+        return self._channel
+
     @property
     def value(self) -> float:
-        return self._value
+        channel = get_mock_mcp(self._channel)
+        channel.reads += 1
+        if channel._values:
+            return channel._values.pop(0)
+
+        return channel._value
@@ -1,7 +1,18 @@
+from unittest.mock import Mock
+
 import pytest
 from homeassistant.const import CONF_MODE, CONF_PORT
 
-from custom_components.gpio_integration.binary_sensor import GpioBinarySensor
+import custom_components.gpio_integration._base as base
+import custom_components.gpio_integration._devices as devices
+from custom_components.gpio_integration._counter import PulseCounter
+from custom_components.gpio_integration._devices import BinarySensor
+from custom_components.gpio_integration._scheduler import Scheduler
+from custom_components.gpio_integration.binary_sensor import (
+    COUNTER_COALESCE_WINDOW_SEC,
+    GpioBinarySensor,
+)
+from custom_components.gpio_integration.controllers.sensor import PulseCounterController
 from custom_components.gpio_integration.schemas import (
     CONF_BOUNCE_TIME,
     CONF_DEFAULT_STATE,
@@ -10,13 +21,22 @@ from custom_components.gpio_integration.schemas import (
     CONF_NAME,
 )
 from custom_components.gpio_integration.schemas.binary_sensor import (
+    CONF_COALESCE_WINDOW,
+    CONF_COUNTER_INTERVAL,
+    CONF_DEBOUNCE_MODE,
     BinarySensorConfig,
 )
 from tests.test__mocks import get_next_pin
+from tests.test_scheduler import FakeClock
 
 
 def __create_config(
-    port=None, default_state=False, invert_logic=False, event_timeout=0
+    port=None,
+    default_state=False,
+    invert_logic=False,
+    event_timeout=0,
+    coalesce_window=0,
+    debounce_mode="factory",
 ):
     return BinarySensorConfig(
         {
@@ -27,6 +47,9 @@ def __create_config(
             CONF_EDGE_EVENT_TIMEOUT: event_timeout,
             CONF_DEFAULT_STATE: default_state,
             CONF_INVERT_LOGIC: invert_logic,
+            CONF_COALESCE_WINDOW: coalesce_window,
+            CONF_COUNTER_INTERVAL: 0,
+            CONF_DEBOUNCE_MODE: debounce_mode,
         }
     )
 
@@ -67,13 +90,44 @@ def test__GpioBinarySensor_update_should_set_state_inverted(mocked_factory):
         assert gpio.is_on is True
 
 
-def test__GpioBinarySensor_edge_events_should_trigger_update(mocked_factory):
+def test__GpioBinarySensor_edge_events_should_push_state(mocked_factory):
     number = get_next_pin()
     pin = mocked_factory.pin(number)
     with GpioBinarySensor(__create_config(number)) as gpio:
         pin._state = False
         pin.drive_high()
-        assert gpio.ha_state_update_scheduled is True
+        assert gpio.ha_state_write is True
+        assert gpio.ha_state_update_scheduled is False
+        assert gpio.is_on is True
+
+        gpio.ha_state_write = False
+        pin.drive_low()
+        assert gpio.ha_state_write is True
+        assert gpio.is_on is False
+
+
+def test__GpioBinarySensor_edge_events_should_not_read_pin(mocked_factory, monkeypatch):
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    with GpioBinarySensor(__create_config(number, invert_logic=True)) as gpio:
+        monkeypatch.setattr(BinarySensor, "is_active", property(Mock()))
+        pin._state = True
+        pin.drive_low()
+        assert gpio.is_on is True
+
+        pin.drive_high()
+        assert gpio.is_on is False
+        assert BinarySensor.is_active.fget.called is False
+
+
+def test__GpioBinarySensor_should_set_state_when_not_added_to_hass(mocked_factory):
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    with GpioBinarySensor(__create_config(number)) as gpio:
+        gpio.hass = None
+        pin.drive_high()
+        assert gpio.is_on is True
+        assert gpio.ha_state_write is False
 
 
 def test__GpioBinarySensor_RoE_should_init_default_state(mocked_factory):
@@ -93,7 +147,8 @@ def test__GpioBinarySensor_RoE_edge_events_should_update_state(mocked_factory):
         pin._state = False
         pin.drive_high()
 
-        assert gpio.ha_state_update_scheduled is True
+        assert gpio.ha_state_write is True
+        assert gpio.is_on is True
 
 
 def test__GpioBinarySensor_RoE_should_not_update_when_no_edge(mocked_factory):
@@ -134,40 +189,66 @@ def test__GpioBinarySensor_RoE_should_update_state_after_elapsed(mocked_factory)
 
 @pytest.mark.asyncio
 async def test__GpioBinarySensor_RoE_should_auto_update_to_off(
-    mocked_factory, mock_track_time_interval
+    mocked_factory, mock_auto_update_later
 ):
     number = get_next_pin()
+    pin = mocked_factory.pin(number)
     mocked_factory.set_ticks(1.5)  # set time to 1.5 sec
 
     with GpioBinarySensor(__create_config(number, event_timeout=2)) as gpio:
         await gpio.async_added_to_hass()
+        assert mock_auto_update_later.pending is False
 
-        gpio._state = True
-        gpio._event_occurred = True
+        _edge(pin, 1.5, True)
 
-        # 2 sec have passed, should auto update to off
-        mocked_factory.set_ticks(3.5)
-        mock_track_time_interval.tick()
+        assert gpio.is_on is True
+        assert mock_auto_update_later.pending is True
+        assert mock_auto_update_later.delay == pytest.approx(2.2)
+
+        # 2.2 sec have passed, should auto update to off
+        mocked_factory.set_ticks(3.7)
+        mock_auto_update_later.fire()
 
         assert gpio.ha_state_update_scheduled is True
+        assert mock_auto_update_later.pending is False
 
 
 @pytest.mark.asyncio
-async def test__GpioBinarySensor_RoE_should_auto_update_to_on(
-    mocked_factory, mock_track_time_interval
+async def test__GpioBinarySensor_RoE_should_extend_deadline_on_edges(
+    mocked_factory, mock_auto_update_later
 ):
     number = get_next_pin()
+    pin = mocked_factory.pin(number)
     mocked_factory.set_ticks(1.5)  # set time to 1.5 sec
 
     with GpioBinarySensor(__create_config(number, event_timeout=2)) as gpio:
         await gpio.async_added_to_hass()
+        _edge(pin, 1.5, True)
+        _edge(pin, 3.0, False)
 
-        gpio._state = False
-        gpio._event_occurred = True
+        # the last edge was 0.7 sec ago (<2), should stay on
+        mocked_factory.set_ticks(3.7)
+        mock_auto_update_later.fire()
 
-        # 1.99 sec have passed (<2), should auto update to on
-        mocked_factory.set_ticks(3.49)
-        mock_track_time_interval.tick()
+        assert gpio.ha_state_update_scheduled is False
+        assert mock_auto_update_later.pending is True
+        assert mock_auto_update_later.delay == pytest.approx(1.5)
+
+
+@pytest.mark.asyncio
+async def test__GpioBinarySensor_RoE_should_expire_default_state(
+    mocked_factory, mock_auto_update_later
+):
+    number = get_next_pin()
+    mocked_factory.set_ticks(1.5)  # set time to 1.5 sec
+    config = __create_config(number, default_state=True, event_timeout=2)
+
+    with GpioBinarySensor(config) as gpio:
+        await gpio.async_added_to_hass()
+        assert mock_auto_update_later.pending is True
+
+        mocked_factory.set_ticks(3.7)
+        mock_auto_update_later.fire()
 
         assert gpio.ha_state_update_scheduled is True
 
@@ -180,3 +261,229 @@ async def test__GpioBinarySensor_will_close_pin(mocked_factory):
     await gpio.async_will_remove_from_hass()
     assert gpio._io is None
     assert pin.closed is True
+
+
+def _toggle(pin, count):
+    for _ in range(count):
+        if pin._state:
+            pin.drive_low()
+        else:
+            pin.drive_high()
+
+
+def test__GpioBinarySensor_should_coalesce_edge_bursts(mocked_factory, mock_call_later):
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    pin._state = False
+    with GpioBinarySensor(__create_config(number, coalesce_window=500)) as gpio:
+        writes = []
+        gpio.async_write_ha_state = lambda: writes.append(
+            (gpio.is_on, gpio._attr_extra_state_attributes["edge_count"])
+        )
+
+        _toggle(pin, 1)
+        assert writes == [(True, 1)]
+        assert mock_call_later.delay == 0.5
+
+        _toggle(pin, 9)  # ends low
+        assert writes == [(True, 1)]
+
+        mock_call_later.fire()
+        assert writes == [(True, 1), (False, 10)]
+        assert mock_call_later.pending is True
+
+        mock_call_later.fire()  # no edges in the window
+        assert mock_call_later.pending is False
+
+        _toggle(pin, 1)
+        assert writes[-1] == (True, 1)
+
+
+def test__GpioBinarySensor_should_not_count_edges_without_coalescing(
+    mocked_factory,
+):
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    pin._state = False
+    with GpioBinarySensor(__create_config(number)) as gpio:
+        _toggle(pin, 3)
+
+        assert gpio.is_on is True
+        assert not hasattr(gpio, "_attr_extra_state_attributes")
+
+
+def test__GpioBinarySensor_should_write_once_per_window(
+    mocked_factory, mock_call_later
+):
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    pin._state = False
+    with GpioBinarySensor(__create_config(number, coalesce_window=100)) as gpio:
+        writes = []
+        gpio.async_write_ha_state = lambda: writes.append(gpio.is_on)
+
+        _toggle(pin, 1)
+        for _ in range(5):
+            _toggle(pin, 3)
+            mock_call_later.fire()
+
+        assert len(writes) == 6
+        assert writes[-1] is False
+        assert gpio.is_on is False
+
+
+def test__GpioBinarySensor_should_cancel_coalesce_window_on_close(
+    mocked_factory, mock_call_later
+):
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    pin._state = False
+    gpio = GpioBinarySensor(__create_config(number, coalesce_window=100))
+    _toggle(pin, 1)
+    gpio._close()
+    assert mock_call_later.cancelled is True
+
+
+def _edge(pin, ticks, state):
+    pin._state = state
+    pin._last_change = ticks
+    pin._call_when_changed()
+
+
+@pytest.fixture
+def debounce_scheduler(monkeypatch):
+    clock = FakeClock()
+    scheduler = Scheduler(min_gap_sec=0, clock=clock, autostart=False)
+    monkeypatch.setattr(devices, "get_timer_scheduler", lambda: scheduler)
+    return scheduler, clock
+
+
+def test__GpioBinarySensor_should_debounce_in_software(
+    mocked_factory, debounce_scheduler
+):
+    scheduler, clock = debounce_scheduler
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    mocked_factory.set_ticks(1.0)
+    config = __create_config(number, debounce_mode="stable")
+    with GpioBinarySensor(config) as gpio:
+        assert pin.bounce is None
+        _edge(pin, 1.001, True)
+        _edge(pin, 1.002, False)
+        _edge(pin, 1.003, True)
+
+        assert gpio.is_on is False
+        assert scheduler.jobs == 1
+
+        mocked_factory.set_ticks(1.009)
+        clock.now = 0.005
+        scheduler.run_pending()
+        assert gpio.is_on is True
+        assert gpio._io.active_time == pytest.approx(0.0)
+        assert scheduler.jobs == 0
+
+        _edge(pin, 1.010, False)
+        assert scheduler.jobs == 1
+
+
+def test__GpioBinarySensor_should_drop_software_debounced_glitches(
+    mocked_factory, debounce_scheduler
+):
+    scheduler, clock = debounce_scheduler
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    mocked_factory.set_ticks(1.0)
+    config = __create_config(number, debounce_mode="integrate")
+    with GpioBinarySensor(config) as gpio:
+        _edge(pin, 1.001, True)
+        _edge(pin, 1.002, False)
+
+        mocked_factory.set_ticks(1.01)
+        clock.now = 0.005
+        scheduler.run_pending()
+        assert gpio.is_on is False
+        assert gpio.ha_state_write is False
+        assert scheduler.jobs == 0
+
+
+def test__GpioBinarySensor_should_use_factory_bounce_time(mocked_factory):
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    with GpioBinarySensor(__create_config(number)) as gpio:
+        assert pin.bounce == 0.005
+        assert gpio._io._debouncer is None
+
+
+def test__GpioBinarySensor_should_count_pulses(mocked_factory):
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    clock = FakeClock()
+    counter = PulseCounter(False, clock)
+    with GpioBinarySensor(__create_config(number), counter):
+        for index in range(6):
+            clock.now = index * 0.5
+            _edge(pin, 1.0 + index * 0.5, index % 2 == 0)
+
+        assert counter.edges == 6
+        assert counter.pulses == 3
+
+
+def test__GpioBinarySensor_should_coalesce_pulses_of_the_counter(
+    mocked_factory, mock_call_later
+):
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    pin._state = False
+    counter = PulseCounter(False, FakeClock())
+    with GpioBinarySensor(__create_config(number), counter) as gpio:
+        writes = []
+        gpio.async_write_ha_state = lambda: writes.append(gpio.is_on)
+
+        _toggle(pin, 40)
+        assert counter.pulses == 20
+        assert writes == [True]
+        assert mock_call_later.delay == COUNTER_COALESCE_WINDOW_SEC
+
+        mock_call_later.fire()
+        assert writes == [True, False]
+
+
+def test__PulseCounterController_should_update_rates(mocked_factory, monkeypatch):
+    scheduler = Scheduler(min_gap_sec=0, clock=FakeClock(), autostart=False)
+    monkeypatch.setattr(base, "get_scheduler", lambda: scheduler)
+    config = BinarySensorConfig(
+        {
+            CONF_NAME: "Meter",
+            CONF_PORT: get_next_pin(),
+            CONF_MODE: "Door",
+            CONF_BOUNCE_TIME: 5,
+            CONF_EDGE_EVENT_TIMEOUT: 0,
+            CONF_DEFAULT_STATE: False,
+            CONF_INVERT_LOGIC: False,
+            CONF_COALESCE_WINDOW: 0,
+            CONF_COUNTER_INTERVAL: 60,
+            CONF_DEBOUNCE_MODE: "factory",
+        }
+    )
+    controller = PulseCounterController(config)
+    clock = FakeClock()
+    controller._io = PulseCounter(False, clock)
+    controller._snapshot = controller._io.snapshot()
+    sensors = {sensor.id: sensor for sensor in controller.get_sensors()}
+
+    assert scheduler.jobs == 1
+    assert sensors["meter_edge_rate"].state is None
+
+    for index in range(10):
+        clock.now = index * 3.0
+        controller.counter.edge(index % 2 == 0)
+
+    clock.now = 30.0
+    controller._read()
+
+    assert sensors["meter_pulses"].state == 5
+    assert sensors["meter_edge_rate"].state == 20.0
+    assert sensors["meter_duty_cycle"].state == 50.0
+
+    controller.release()
+    assert scheduler.jobs == 0
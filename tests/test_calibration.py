@@ -0,0 +1,74 @@
+import pytest
+
+from custom_components.gpio_integration._calibration import (
+    LinearStepCalibration,
+    LookupCalibration,
+    PolynomialCalibration,
+    TableCalibration,
+    create_calibration,
+    parse_coefficients,
+    parse_table,
+)
+
+
+def test__LinearStepCalibration_should_convert_steps():
+    calibration = LinearStepCalibration(0.5, 10, 0.01, 0.5)
+    assert calibration.value(0.61) == pytest.approx(15.5)
+    assert calibration.value(0.2) == 10
+
+
+@pytest.mark.parametrize(
+    "voltage,expected",
+    [(0.0, 100), (0.5, 100), (1.0, 62.5), (1.5, 25), (2.0, 15), (3.3, 5)],
+)
+def test__TableCalibration_should_interpolate(voltage, expected):
+    calibration = TableCalibration([(2.5, 5), (0.5, 100), (1.5, 25)])
+    assert calibration.value(voltage) == pytest.approx(expected)
+
+
+def test__TableCalibration_should_reject_invalid_tables():
+    with pytest.raises(ValueError):
+        TableCalibration([(0.5, 100)])
+    with pytest.raises(ValueError):
+        TableCalibration([(0.5, 100), (0.5, 10)])
+
+
+def test__PolynomialCalibration_should_evaluate_coefficients():
+    calibration = PolynomialCalibration([-10, 20, 2])
+    assert calibration.value(2.0) == pytest.approx(38.0)
+
+
+def test__LookupCalibration_should_match_the_calibration():
+    polynomial = PolynomialCalibration([-10, 20, 2])
+    lookup = LookupCalibration(polynomial, 3.3)
+    for voltage in [0.0, 0.123, 1.0, 2.718, 3.3]:
+        assert lookup.value(voltage) == pytest.approx(
+            polynomial.value(voltage), abs=1e-3
+        )
+
+    assert lookup.value(-1.0) == pytest.approx(-10)
+    assert lookup.value(5.0) == pytest.approx(polynomial.value(3.3))
+
+
+def test__parse_table_should_parse_points():
+    assert parse_table("0.5:10, 1.5 : 30") == [(0.5, 10.0), (1.5, 30.0)]
+    with pytest.raises(ValueError):
+        parse_table("0.5, 1.5:30")
+
+
+def test__parse_coefficients_should_parse_numbers():
+    assert parse_coefficients("-10, 20.5,0.3") == [-10.0, 20.5, 0.3]
+    with pytest.raises(ValueError):
+        parse_coefficients("a, 2")
+
+
+def test__create_calibration_should_precompute_table():
+    linear = LinearStepCalibration(0, 0, 1, 1)
+    assert create_calibration("linear", "", 3.3, linear) is linear
+
+    calibration = create_calibration("table", "0:0, 5:100", 5.0, linear)
+    assert isinstance(calibration, LookupCalibration)
+    assert calibration.value(2.5) == pytest.approx(50)
+
+    with pytest.raises(ValueError):
+        create_calibration("spline", "", 3.3, linear)
@@ -0,0 +1,73 @@
+import pytest
+
+from custom_components.gpio_integration._counter import (
+    PulseCounter,
+    PulseSnapshot,
+    pulse_rates,
+)
+from tests.test_scheduler import FakeClock
+
+
+def test__PulseCounter_should_count_edges_and_pulses():
+    clock = FakeClock()
+    counter = PulseCounter(False, clock)
+    for level in [True, False, True, False, True]:
+        counter.edge(level)
+
+    assert counter.edges == 5
+    assert counter.pulses == 3
+
+
+def test__PulseCounter_should_ignore_repeated_levels():
+    counter = PulseCounter(False, FakeClock())
+    counter.edge(False)
+    counter.edge(True)
+    counter.edge(True)
+
+    assert counter.edges == 1
+    assert counter.pulses == 1
+
+
+def test__PulseCounter_should_accumulate_active_time():
+    clock = FakeClock()
+    counter = PulseCounter(False, clock)
+    clock.now = 1.0
+    counter.edge(True)
+    clock.now = 1.5
+    counter.edge(False)
+    clock.now = 3.0
+    counter.edge(True)
+    clock.now = 4.0
+
+    snapshot = counter.snapshot()
+
+    assert snapshot.time == 4.0
+    assert snapshot.active_sec == pytest.approx(1.5)
+
+
+def test__PulseCounter_start_should_not_count_an_edge():
+    clock = FakeClock()
+    counter = PulseCounter(False, clock)
+    counter.start(True)
+    clock.now = 2.0
+
+    snapshot = counter.snapshot()
+
+    assert snapshot.edges == 0
+    assert snapshot.active_sec == pytest.approx(2.0)
+
+
+def test__pulse_rates_should_calculate_rates_between_snapshots():
+    previous = PulseSnapshot(10.0, 4, 2, 1.0)
+    current = PulseSnapshot(40.0, 14, 7, 7.0)
+
+    rates = pulse_rates(previous, current)
+
+    assert rates.edges_per_minute == 20.0
+    assert rates.duty_cycle == 20.0
+
+
+def test__pulse_rates_should_be_none_without_elapsed_time():
+    snapshot = PulseSnapshot(10.0, 4, 2, 1.0)
+
+    assert pulse_rates(snapshot, snapshot) == (None, None)
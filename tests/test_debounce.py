@@ -0,0 +1,73 @@
+import pytest
+
+from custom_components.gpio_integration._debounce import (
+    IntegratingDebouncer,
+    MajorityDebouncer,
+    StableDebouncer,
+    create_debouncer,
+)
+
+
+def _edges(debouncer, edges):
+    return [debouncer.edge(t, level) for t, level in edges]
+
+
+def test__StableDebouncer_should_ignore_glitches():
+    debouncer = StableDebouncer(0.01, False)
+    assert _edges(debouncer, [(1.0, True), (1.002, False)]) == [None, None]
+    assert debouncer.settle(1.02) is None
+    assert debouncer.pending is False
+
+
+def test__StableDebouncer_should_change_after_stable_time():
+    debouncer = StableDebouncer(0.01, False)
+    assert _edges(debouncer, [(1.0, True), (1.002, False), (1.003, True)]) == [
+        None,
+        None,
+        None,
+    ]
+    assert debouncer.pending is True
+    assert debouncer.settle(1.012) is None
+    assert debouncer.settle(1.013) is True
+    assert debouncer.output is True
+
+
+def test__IntegratingDebouncer_should_integrate_the_level_time():
+    debouncer = IntegratingDebouncer(0.01, False)
+    # 6ms high, 2ms low, 6ms high = integrator reaches 10ms at 1.014
+    changes = _edges(debouncer, [(1.0, True), (1.006, False), (1.008, True)])
+    assert changes == [None, None, None]
+    assert debouncer.settle(1.0135) is None
+    assert debouncer.settle(1.0141) is True
+
+    assert debouncer.edge(1.02, False) is None
+    assert debouncer.settle(1.03) is False
+
+
+def test__MajorityDebouncer_should_follow_the_majority_of_the_window():
+    debouncer = MajorityDebouncer(0.01, False)
+    assert debouncer.edge(1.0, True) is None
+    assert debouncer.edge(1.004, False) is None  # 4ms of 10ms high
+    assert debouncer.edge(1.005, True) is None  # 4ms high
+    assert debouncer.settle(1.0105) is True  # 9.5ms window: 4 + 5.5 high
+    assert debouncer.edge(1.011, False) is None
+    assert debouncer.settle(1.0175) is False
+
+
+def test__MajorityDebouncer_should_bound_edges():
+    debouncer = MajorityDebouncer(1.0, False)
+    for index in range(1000):
+        debouncer.edge(index / 10000, index % 2 == 0)
+
+    assert len(debouncer._edges) == 256
+
+
+def test__create_debouncer_should_return_by_mode():
+    assert create_debouncer("factory", 0.01, False) is None
+    assert repr(create_debouncer("stable", 0.01, False)) == "StableDebouncer(0.01s)"
+    assert isinstance(create_debouncer("integrate", 0.01, True), IntegratingDebouncer)
+    assert isinstance(create_debouncer("majority", 0.01, True), MajorityDebouncer)
+    with pytest.raises(ValueError):
+        create_debouncer("unknown", 0.01, False)
+    with pytest.raises(ValueError):
+        create_debouncer("stable", 0, False)
@@ -0,0 +1,82 @@
+import pytest
+
+from custom_components.gpio_integration._filters import (
+    EMAFilter,
+    HampelFilter,
+    MedianFilter,
+    RateLimitFilter,
+    ValueFilter,
+    create_filter,
+    reduce_samples,
+)
+
+
+def test__MedianFilter_should_return_median_of_window():
+    filter = MedianFilter(3)
+    assert filter.update(10) == 10
+    assert filter.update(20) == 15
+    assert filter.update(90) == 20
+    assert filter.update(30) == 30
+    assert sorted(filter.samples) == [20, 30, 90]
+
+
+def test__HampelFilter_should_replace_outliers_with_median():
+    filter = HampelFilter(5)
+    for value in (20.0, 20.2, 19.9, 20.1):
+        assert filter.update(value) == value
+
+    assert filter.update(60.0) == 20.1
+    assert filter.update(20.3) == 20.3
+
+
+def test__HampelFilter_should_follow_step_changes():
+    filter = HampelFilter(3)
+    values = [filter.update(value) for value in (20, 20, 30, 30, 30)]
+    assert values == [20, 20, 20, 30, 30]
+
+
+def test__EMAFilter_should_smooth_values():
+    filter = EMAFilter(3)
+    assert filter.update(10) == 10
+    assert filter.update(20) == 15
+    assert filter.update(20) == 17.5
+
+
+def test__RateLimitFilter_should_limit_step():
+    filter = RateLimitFilter(0.5)
+    values = [filter.update(value) for value in (10, 12, 11, 9, 9)]
+    assert values == [10, 10.5, 11, 10.5, 10]
+    assert RateLimitFilter(0).update(10) == 10
+    with pytest.raises(ValueError):
+        RateLimitFilter(-1)
+
+
+def test__WindowFilter_should_keep_fixed_memory():
+    filter = MedianFilter(5)
+    for value in range(1000):
+        filter.update(value)
+
+    assert len(filter._samples) == 5
+    assert filter.value == 997
+
+
+def test__create_filter_should_return_filter_by_name():
+    assert type(create_filter("none", 5)) is ValueFilter
+    assert repr(create_filter("median", 5)) == "MedianFilter(5)"
+    assert repr(create_filter("hampel", 7)) == "HampelFilter(7)"
+    assert repr(create_filter("ema", 3)) == "EMAFilter(3)"
+    with pytest.raises(ValueError):
+        create_filter("mean", 5)
+
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [("mean", 5.0), ("median", 2.5), ("trimmed_mean", 2.5)],
+)
+def test__reduce_samples_should_reduce(name, expected):
+    assert reduce_samples(name, [1.0, 2.0, 3.0, 14.0]) == expected
+
+
+def test__reduce_samples_should_reject_unknown_reducer():
+    with pytest.raises(ValueError):
+        reduce_samples("max", [1.0])
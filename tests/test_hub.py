@@ -1,5 +1,8 @@
+from unittest.mock import Mock
+
 import pytest
 from homeassistant.const import (
+    CONF_HOST,
     CONF_MODE,
     CONF_NAME,
     CONF_PORT,
@@ -7,7 +10,19 @@ from homeassistant.const import (
     Platform,
 )
 
-from custom_components.gpio_integration.hub import Hub
+import custom_components.gpio_integration as integration
+from custom_components.gpio_integration import (
+    DATA_PIN_FACTORIES,
+    DATA_PROBE_STORE,
+    async_setup,
+    async_setup_entry,
+    async_unload_entry,
+)
+from custom_components.gpio_integration._pin_factory import get_pin_factory_host
+from custom_components.gpio_integration._scheduler import Scheduler
+from custom_components.gpio_integration.config_flow import CONF_ENTITIES
+from custom_components.gpio_integration.core import import_attribute
+from custom_components.gpio_integration.hub import HUB_SCHEMAS, Hub
 from custom_components.gpio_integration.schemas import (
     CONF_DEFAULT_STATE,
     CONF_FREQUENCY,
@@ -19,7 +34,10 @@ from custom_components.gpio_integration.schemas import (
     CONF_RELAY_OPEN_PIN,
     CONF_RELAY_TIME,
 )
-from custom_components.gpio_integration.schemas.binary_sensor import BinarySensorConfig
+from custom_components.gpio_integration.schemas.binary_sensor import (
+    CONF_COUNTER_INTERVAL,
+    BinarySensorConfig,
+)
 from custom_components.gpio_integration.schemas.cover import ToggleRollerConfig
 from custom_components.gpio_integration.schemas.light import (
     CONF_BLUE_PIN,
@@ -110,3 +128,150 @@ def test__Hub_should_init(
 ):
     hub = _create_hub(key)
     _assert_hub(hub, type, platforms, config)
+
+
+def test__Hub_should_add_pulse_counter_sensors(monkeypatch):
+    import custom_components.gpio_integration._base as base
+
+    scheduler = Scheduler(min_gap_sec=0, autostart=False)
+    monkeypatch.setattr(base, "get_scheduler", lambda: scheduler)
+    hub = Hub(
+        {
+            "type": "binary_sensor",
+            CONF_NAME: "Test Name",
+            CONF_PORT: 1,
+            CONF_MODE: "Door",
+            CONF_COUNTER_INTERVAL: 60,
+        }
+    )
+
+    assert hub.platforms == [Platform.BINARY_SENSOR, Platform.SENSOR]
+    assert len(hub.sensors) == 3
+    hub.controller.release()
+
+
+def test__hub_schemas_should_match_config_flow_schemas():
+    for type, path in HUB_SCHEMAS.items():
+        assert import_attribute(path) is CONF_ENTITIES[type.value]["schema"], type
+
+
+def test__Hub_should_create_controller_on_the_entry_host(monkeypatch):
+    hosts = []
+    monkeypatch.setattr(
+        "custom_components.gpio_integration.controllers.cover.Roller",
+        lambda config: hosts.append(get_pin_factory_host()),
+    )
+    configs = {
+        "type": EntityTypes.COVER_UP_DOWN.value,
+        CONF_NAME: "Test Name",
+        CONF_MODE: 1,
+        CONF_RELAY_OPEN_PIN: 2,
+        CONF_RELAY_CLOSE_PIN: 3,
+        CONF_HOST: "pi2",
+    }
+
+    assert Hub(configs).host == "pi2"
+    assert hosts == ["pi2"]
+    assert get_pin_factory_host() == ""
+    assert _create_hub("switch").host == ""
+
+
+class _SetupCalls:
+    def __init__(self):
+        self.calls = []
+
+    async def async_forward_entry_setups(self, entry, platforms):
+        self.calls.append(("forward", platforms))
+
+    async def async_save(self):
+        self.calls.append(("save",))
+
+    async def async_add_executor_job(self, target, *args):
+        self.calls.append(("executor", target.__name__))
+        return target(*args)
+
+    async def async_unload_platforms(self, entry, platforms):
+        self.calls.append(("unload", platforms))
+        return True
+
+    async def async_load(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test__async_setup_entry_should_save_discovery_after_platforms():
+    setup = _SetupCalls()
+    hass = Mock()
+    hass.data = {DATA_PROBE_STORE: setup}
+    hass.config_entries = setup
+    hass.async_add_executor_job = setup.async_add_executor_job
+    entry = Mock()
+    entry.entry_id = "entry"
+    entry.data = {"type": "switch", CONF_NAME: "Test Name", CONF_PORT: 1}
+
+    assert await async_setup_entry(hass, entry) is True
+
+    assert setup.calls == [
+        ("executor", "_create_hub"),
+        ("forward", [Platform.SWITCH]),
+        ("save",),
+    ]
+
+
+@pytest.mark.asyncio
+async def test__async_setup_entry_should_hold_the_host_factory(monkeypatch):
+    factories = []
+    monkeypatch.setattr(
+        integration, "acquire_pin_factory", lambda host: factories.append(host) or host
+    )
+    monkeypatch.setattr(integration, "release_pin_factory", factories.remove)
+    monkeypatch.setattr(
+        "custom_components.gpio_integration.controllers.cover.Roller", Mock()
+    )
+    setup = _SetupCalls()
+    hass = Mock()
+    hass.data = {}
+    hass.config_entries = setup
+    hass.async_add_executor_job = setup.async_add_executor_job
+    entry = Mock()
+    entry.entry_id = "entry"
+    entry.data = {
+        "type": EntityTypes.COVER_UP_DOWN.value,
+        CONF_NAME: "Test Name",
+        CONF_MODE: 1,
+        CONF_RELAY_OPEN_PIN: 2,
+        CONF_RELAY_CLOSE_PIN: 3,
+        CONF_HOST: "pi2",
+    }
+
+    await async_setup_entry(hass, entry)
+    assert factories == ["pi2"]
+    assert hass.data[DATA_PIN_FACTORIES] == {"entry": "pi2"}
+
+    assert await async_unload_entry(hass, entry) is True
+    assert factories == []
+    assert hass.data[DATA_PIN_FACTORIES] == {}
+
+
+@pytest.mark.asyncio
+async def test__lost_host_should_reload_its_entries(monkeypatch):
+    listeners = []
+    monkeypatch.setattr(integration, "set_pin_factory_lost_listener", listeners.append)
+    monkeypatch.setattr(integration, "PinFactoryProbeStore", lambda hass: _SetupCalls())
+    hass = Mock()
+    hass.data = {}
+    hass.loop.call_soon_threadsafe = lambda callback, *args: callback(*args)
+    hass.config_entries.async_reload = lambda entry_id: entry_id
+    await async_setup(hass, {})
+    hass.data[integration.DOMAIN] = {
+        "entry1": _create_hub("switch"),
+        "entry2": _create_hub("switch"),
+        "entry3": _create_hub("switch"),
+    }
+    hass.data[integration.DOMAIN]["entry1"].host = "pi2"
+    hass.data[integration.DOMAIN]["entry3"].host = "pi2"
+
+    listeners[0]("pi2")
+
+    reloads = [call.args[0] for call in hass.async_create_task.call_args_list]
+    assert reloads == ["entry1", "entry3"]
@@ -0,0 +1,335 @@
+import pytest
+from gpiozero import Device
+
+import custom_components.gpio_integration._pin_factory as pin_factory
+from custom_components.gpio_integration._pin_factory import (
+    PIGPIO_CHECK_INTERVAL_SEC,
+    PiGPIOPool,
+    PinFactoryProbeStore,
+    PinFactoryUnavailable,
+    get_discovery,
+    get_pin_factory,
+    get_pin_factory_host,
+    get_probe_cache,
+    set_probe_cache,
+    use_pin_factory_host,
+)
+from custom_components.gpio_integration._scheduler import (
+    ExponentialBackoff,
+    Scheduler,
+)
+from tests.test_scheduler import FakeClock
+
+
+class MockStore:
+    def __init__(self, hass, version, key):
+        self.data = hass
+        self.saves = 0
+
+    async def async_load(self):
+        return self.data
+
+    async def async_save(self, data):
+        self.data = data
+        self.saves += 1
+
+
+class MockPinFactory:
+    created = []
+
+    def __init__(self):
+        MockPinFactory.created.append(type(self).__name__)
+
+
+class FailingPinFactory:
+    def __init__(self):
+        MockPinFactory.created.append("failing")
+        raise OSError("Failed to connect to localhost:8888")
+
+
+@pytest.fixture
+def probe_factories(monkeypatch):
+    """Factories 'first' (fails), 'second' and 'third', without a default factory."""
+    classes = {
+        "first": FailingPinFactory,
+        "second": type("SecondFactory", (MockPinFactory,), {}),
+        "third": type("ThirdFactory", (MockPinFactory,), {}),
+    }
+    monkeypatch.setattr(pin_factory, "PIN_FACTORIES", dict.fromkeys(classes, ""))
+    monkeypatch.setattr(
+        pin_factory, "_get_pin_factory_class_by_name", lambda name: classes[name]
+    )
+    monkeypatch.setattr(pin_factory, "Store", MockStore)
+    monkeypatch.setattr(Device, "pin_factory", None)
+    MockPinFactory.created = []
+    set_probe_cache(None)
+    yield
+    set_probe_cache(None)
+
+
+def test__get_pin_factory_should_record_discovery(probe_factories):
+    factory = get_pin_factory()
+
+    assert type(factory).__name__ == "SecondFactory"
+    assert get_probe_cache() == {
+        "factory": "second",
+        "failures": {"first": "Failed to connect to localhost:8888"},
+    }
+    discovery = get_discovery()
+    assert [probe["name"] for probe in discovery["probes"]] == ["first", "second"]
+    assert discovery["probes"][0]["error"] is not None
+    assert discovery["probes"][1]["error"] is None
+    assert discovery["total_ms"] >= 0
+
+
+def test__get_pin_factory_should_try_cached_factory_first(probe_factories):
+    set_probe_cache({"factory": "third", "failures": {"first": "error"}})
+
+    factory = get_pin_factory()
+
+    assert type(factory).__name__ == "ThirdFactory"
+    assert MockPinFactory.created == ["ThirdFactory"]
+    assert get_discovery()["cached_factory"] == "third"
+    assert get_probe_cache()["failures"] == {"first": "error"}
+
+
+def test__get_pin_factory_should_fall_back_from_cached_factory(probe_factories):
+    set_probe_cache({"factory": "first", "failures": {}})
+
+    factory = get_pin_factory()
+
+    assert type(factory).__name__ == "SecondFactory"
+    assert MockPinFactory.created == ["failing", "SecondFactory"]
+    assert get_probe_cache()["factory"] == "second"
+
+
+def test__set_probe_cache_should_ignore_unknown_factory(probe_factories):
+    set_probe_cache({"factory": "removed", "failures": {}})
+    assert get_probe_cache() == {}
+
+    set_probe_cache("invalid")
+    assert get_probe_cache() == {}
+
+
+@pytest.mark.asyncio
+async def test__PinFactoryProbeStore_should_save_only_changes(probe_factories):
+    # MockStore loads the data passed as `hass`
+    store = PinFactoryProbeStore({"factory": "second", "failures": {"first": "x"}})
+    await store.async_load()
+
+    get_pin_factory()
+    await store.async_save()
+    assert store._store.saves == 0
+
+    set_probe_cache({"factory": "third", "failures": {}})
+    await store.async_save()
+    assert store._store.saves == 1
+    assert store._store.data == {"factory": "third", "failures": {}}
+
+
+@pytest.mark.asyncio
+async def test__PinFactoryProbeStore_should_not_save_without_discovery(
+    probe_factories,
+):
+    store = PinFactoryProbeStore(None)
+    await store.async_load()
+    await store.async_save()
+
+    assert store._store.saves == 0
+
+
+class MockConnection:
+    def __init__(self):
+        self.connected = True
+        self.daemon_running = True
+
+    def get_current_tick(self):
+        if not self.daemon_running:
+            raise ConnectionResetError("Connection reset by peer")
+
+        return 0
+
+
+class MockRemoteFactory:
+    def __init__(self, host):
+        self.host = host
+        self.connection = MockConnection()
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class MockRemotes:
+    """Create the remote factories, the hosts in `offline` fail to connect."""
+
+    def __init__(self):
+        self.offline = set()
+        self.connects = []
+
+    def __call__(self, host):
+        self.connects.append(host)
+        if host in self.offline:
+            raise OSError(f"Failed to connect to {host}:8888")
+
+        return MockRemoteFactory(host)
+
+
+def _create_pool(scheduler=None):
+    remotes = MockRemotes()
+    clock = FakeClock()
+    backoff = ExponentialBackoff(5, 60, rand=lambda: 0)
+    pool = PiGPIOPool(
+        remotes, clock, backoff, scheduler or Scheduler(min_gap_sec=0, autostart=False)
+    )
+    return pool, remotes, clock
+
+
+def test__PiGPIOPool_should_share_factory_per_host():
+    pool, remotes, _ = _create_pool()
+
+    pi1 = pool.get("pi1")
+    pi2 = pool.get("pi2")
+
+    assert pool.get("pi1") is pi1
+    assert pi2 is not pi1
+    assert pi2.host == "pi2"
+    assert remotes.connects == ["pi1", "pi2"]
+
+
+def test__PiGPIOPool_should_reconnect_with_backoff():
+    pool, remotes, clock = _create_pool()
+    remotes.offline.add("pi1")
+
+    with pytest.raises(PinFactoryUnavailable):
+        pool.get("pi1")
+    clock.now = 4
+    with pytest.raises(PinFactoryUnavailable):
+        pool.get("pi1")
+    assert remotes.connects == ["pi1"]
+
+    # the second failure doubles the delay
+    clock.now = 5
+    with pytest.raises(PinFactoryUnavailable):
+        pool.get("pi1")
+    clock.now = 14
+    with pytest.raises(PinFactoryUnavailable):
+        pool.get("pi1")
+    assert remotes.connects == ["pi1", "pi1"]
+
+    remotes.offline.clear()
+    clock.now = 15
+    assert pool.get("pi1").host == "pi1"
+    # the other hosts are not blocked by the backoff of pi1
+    assert pool.get("pi2").host == "pi2"
+
+
+def test__PiGPIOPool_should_replace_lost_connection():
+    pool, remotes, _ = _create_pool()
+    pi1 = pool.get("pi1")
+    pi1.connection.connected = False
+
+    replaced = pool.get("pi1")
+
+    assert replaced is not pi1
+    assert pi1.closed is True
+    assert remotes.connects == ["pi1", "pi1"]
+
+
+def test__PiGPIOPool_check_should_probe_the_daemon():
+    scheduler = Scheduler(min_gap_sec=0, autostart=False)
+    pool, remotes, _ = _create_pool(scheduler)
+    lost = []
+    pool.on_lost = lost.append
+    pi1 = pool.acquire("pi1")
+
+    pool.check()
+    assert lost == []
+
+    # pigpio keeps `connected` set when the daemon goes away
+    pi1.connection.daemon_running = False
+    pool.check()
+
+    assert lost == ["pi1"]
+    assert pool.hosts == []
+    assert pool.get("pi1") is not pi1
+
+
+def test__PiGPIOPool_should_close_factory_after_the_last_release():
+    pool, remotes, _ = _create_pool()
+    entry1 = pool.acquire("pi1")
+    entry2 = pool.acquire("pi1")
+    assert entry1 is entry2
+
+    pool.release(entry1)
+    assert entry1.closed is False
+    assert pool.get("pi1") is entry1
+
+    pool.release(entry2)
+    assert entry1.closed is True
+    assert pool.hosts == []
+    assert remotes.connects == ["pi1"]
+
+
+def test__PiGPIOPool_should_keep_lost_factory_until_released():
+    clock = FakeClock()
+    scheduler = Scheduler(min_gap_sec=0, clock=clock, autostart=False)
+    pool, remotes, _ = _create_pool(scheduler)
+    lost = []
+    pool.on_lost = lost.append
+    entry1 = pool.acquire("pi1")
+    entry2 = pool.acquire("pi1")
+    pool.acquire("pi2")
+    assert scheduler.jobs == 1
+
+    # pigpio returns no connection once the socket is closed
+    entry1.connection = None
+    clock.now = PIGPIO_CHECK_INTERVAL_SEC
+    scheduler.run_pending()
+
+    assert lost == ["pi1"]
+    assert pool.hosts == ["pi2"]
+    # the entries of the lost host still hold the factory
+    assert entry1.closed is False
+
+    # the reloaded entry gets a new connection
+    pool.release(entry1)
+    replaced = pool.acquire("pi1")
+    assert replaced is not entry1
+    assert entry1.closed is False
+
+    pool.release(entry2)
+    assert entry1.closed is True
+    assert replaced.closed is False
+    assert remotes.connects == ["pi1", "pi2", "pi1"]
+
+
+def test__PiGPIOPool_should_close_all_factories():
+    scheduler = Scheduler(min_gap_sec=0, autostart=False)
+    pool, _, _ = _create_pool(scheduler)
+    pi1 = pool.acquire("pi1")
+    pi2 = pool.get("pi2")
+    pi1.connection.connected = False
+    pool.check()
+
+    pool.close()
+
+    assert pi1.closed is True
+    assert pi2.closed is True
+    assert pool.hosts == []
+    assert scheduler.jobs == 0
+
+
+def test__get_pin_factory_should_use_host_of_the_context(mocked_factory, monkeypatch):
+    pool, _, _ = _create_pool()
+    monkeypatch.setattr(pin_factory, "_PIGPIO_POOL", pool)
+
+    assert get_pin_factory() is mocked_factory
+    with use_pin_factory_host("pi1"):
+        assert get_pin_factory_host() == "pi1"
+        assert get_pin_factory().host == "pi1"
+        assert get_pin_factory("") is mocked_factory
+
+    assert get_pin_factory_host() == ""
+    assert get_pin_factory("pi2").host == "pi2"
+    assert pool.hosts == ["pi1", "pi2"]
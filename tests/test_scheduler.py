@@ -0,0 +1,270 @@
+import threading
+import time
+
+import pytest
+
+from custom_components.gpio_integration._base import AutoReadLoop
+from custom_components.gpio_integration._scheduler import (
+    ExponentialBackoff,
+    Scheduler,
+    get_scheduler,
+    get_timer_scheduler,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _create_scheduler(min_gap_sec=0.0):
+    clock = FakeClock()
+    return Scheduler(min_gap_sec=min_gap_sec, clock=clock, autostart=False), clock
+
+
+def test__Scheduler_should_run_jobs_when_due():
+    scheduler, clock = _create_scheduler()
+    calls = []
+    job_a = scheduler.schedule(lambda: calls.append("a"), 10)
+    job_b = scheduler.schedule(lambda: calls.append("b"), 5)
+    assert [job_a.due, job_b.due] == [0, 2.5]
+
+    assert scheduler.run_pending() == 2.5
+    assert calls == ["a"]
+    clock.now = 2.5
+    assert scheduler.run_pending() == 5
+    assert calls == ["a", "b"]
+
+    clock.now = 10
+    scheduler.run_pending()
+    assert calls == ["a", "b", "b", "a"]
+
+
+def test__Scheduler_should_keep_min_gap_between_jobs():
+    scheduler, clock = _create_scheduler(min_gap_sec=0.5)
+    calls = []
+    scheduler.schedule(lambda: calls.append("a"), 10, delay_sec=10)
+    scheduler.schedule(lambda: calls.append("b"), 10, delay_sec=10)
+
+    clock.now = 10
+    assert scheduler.run_pending() == 0.5
+    assert calls == ["a"]
+
+    clock.now = 10.5
+    scheduler.run_pending()
+    assert calls == ["a", "b"]
+
+
+def test__Scheduler_should_skip_missed_runs():
+    scheduler, clock = _create_scheduler()
+    calls = []
+    scheduler.schedule(lambda: calls.append(clock.now), 2)
+
+    clock.now = 7
+    assert scheduler.run_pending() == 1
+    assert calls == [7]
+
+
+def test__Scheduler_should_spread_jobs_with_same_interval():
+    scheduler, clock = _create_scheduler()
+    jobs = [scheduler.schedule(lambda: None, 20) for _ in range(4)]
+    assert [job.phase for job in jobs] == [0, 5, 10, 15]
+    assert [job.due for job in jobs] == [0, 5, 10, 15]
+
+
+def test__Scheduler_should_spread_jobs_across_the_shortest_interval():
+    scheduler, clock = _create_scheduler()
+    jobs = [scheduler.schedule(lambda: None, interval) for interval in (5, 2, 20)]
+    assert [round(job.phase, 2) for job in jobs] == [0, 0.67, 1.33]
+
+    # no run of a job meets a run of another one
+    runs = [
+        round(job.phase + cycle * job.interval_sec, 2)
+        for job in jobs
+        for cycle in range(int(60 / job.interval_sec))
+    ]
+    assert len(runs) == len(set(runs))
+
+
+def test__Scheduler_should_spread_jobs_when_added_or_removed():
+    scheduler, clock = _create_scheduler()
+    calls = []
+    job1 = scheduler.schedule(lambda: calls.append(1), 20)
+    job2 = scheduler.schedule(lambda: calls.append(2), 20)
+    assert [job1.due, job2.due] == [0, 10]
+
+    clock.now = 20
+    scheduler.run_pending()
+    assert calls == [1, 2]
+
+    job3 = scheduler.schedule(lambda: calls.append(3), 20)
+    assert [round(job.phase, 2) for job in (job1, job2, job3)] == [0, 6.67, 13.33]
+    assert [round(job.due, 2) for job in (job1, job2, job3)] == [40, 46.67, 33.33]
+
+    scheduler.cancel(job2)
+    assert [job1.phase, job3.phase] == [0, 10]
+    assert [job1.due, job3.due] == [40, 30]
+
+    clock.now = 30
+    scheduler.run_pending()
+    assert calls == [1, 2, 3]
+
+
+def test__Scheduler_should_not_run_cancelled_job():
+    scheduler, clock = _create_scheduler()
+    calls = []
+    job = scheduler.schedule(lambda: calls.append("a"), 1)
+    scheduler.cancel(job)
+
+    clock.now = 5
+    assert scheduler.run_pending() is None
+    assert calls == []
+    assert scheduler.jobs == 0
+
+
+def test__Scheduler_should_continue_after_failed_job():
+    scheduler, clock = _create_scheduler()
+    calls = []
+
+    def fail():
+        raise ValueError("failed")
+
+    scheduler.schedule(fail, 1)
+    scheduler.schedule(lambda: calls.append("a"), 1)
+
+    clock.now = 1
+    scheduler.run_pending()
+    assert calls == ["a"]
+
+
+def test__Scheduler_should_reject_invalid_interval():
+    scheduler, _ = _create_scheduler()
+    with pytest.raises(ValueError):
+        scheduler.schedule(lambda: None, 0)
+
+
+@pytest.mark.timeout(2)
+def test__Scheduler_should_use_single_thread():
+    scheduler = Scheduler(min_gap_sec=0.0)
+    threads = set()
+    done = threading.Event()
+
+    def read():
+        threads.add(threading.current_thread().name)
+        done.set()
+
+    count = threading.active_count()
+    jobs = [scheduler.schedule(read, 0.01) for _ in range(20)]
+    assert threading.active_count() == count + 1
+
+    done.wait()
+    scheduler.shutdown()
+
+    assert threads == {"gpio_integration_scheduler"}
+    assert [job.cancelled for job in jobs] == [True] * 20
+    for _ in range(100):
+        if not scheduler.is_alive:
+            break
+        time.sleep(0.01)
+
+    assert scheduler.is_alive is False
+
+
+def test__Scheduler_call_later_should_run_once():
+    scheduler, clock = _create_scheduler()
+    calls = []
+    scheduler.call_later(lambda: calls.append(clock.now), 3)
+    assert scheduler.jobs == 1
+
+    clock.now = 3
+    assert scheduler.run_pending() is None
+    clock.now = 10
+    scheduler.run_pending()
+    assert calls == [3]
+    assert scheduler.jobs == 0
+
+
+def test__Scheduler_call_later_should_be_cancellable():
+    scheduler, clock = _create_scheduler()
+    calls = []
+    job = scheduler.call_later(lambda: calls.append(clock.now), 3)
+    scheduler.cancel(job)
+
+    clock.now = 3
+    scheduler.run_pending()
+    assert calls == []
+    assert scheduler.jobs == 0
+
+
+def test__Scheduler_cancel_should_not_wait_for_running_job():
+    scheduler = Scheduler(min_gap_sec=0)
+    running = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def job_callback():
+        calls.append(1)
+        running.set()
+        release.wait(2)
+
+    job = scheduler.call_later(job_callback, 0)
+    assert running.wait(2)
+
+    # the running job waits for the caller, the caller must not wait for the job
+    started = time.monotonic()
+    scheduler.cancel(job, wait=False)
+    assert time.monotonic() - started < 1
+    release.set()
+    scheduler.shutdown()
+    assert calls == [1]
+
+
+def test__timer_scheduler_should_not_wait_for_the_reads():
+    reading = threading.Event()
+    read_done = threading.Event()
+    settled = threading.Event()
+
+    def blocking_read():
+        reading.set()
+        read_done.wait(2)
+
+    get_scheduler().call_later(blocking_read, 0)
+    assert reading.wait(1)
+    get_timer_scheduler().call_later(settled.set, 0.005)
+
+    assert settled.wait(0.5)
+    read_done.set()
+
+
+def test__ExponentialBackoff_should_double_up_to_max():
+    backoff = ExponentialBackoff(2, 10, jitter=0.5, rand=lambda: 1.0)
+    assert backoff.delay(0) == 3
+    assert backoff.delay(1) == 6
+    assert backoff.delay(2) == 12
+    assert backoff.delay(5) == 15
+    assert ExponentialBackoff(2, 10, rand=lambda: 0.0).delay(0) == 2
+
+
+class ReadLoop(AutoReadLoop):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def _read(self):
+        self.reads += 1
+
+
+def test__AutoReadLoop_should_register_in_shared_scheduler():
+    jobs = get_scheduler().jobs
+    loop1 = ReadLoop()
+    loop2 = ReadLoop()
+    loop1.start_auto_read_loop(20)
+    loop2.start_auto_read_loop(20)
+    assert get_scheduler().jobs == jobs + 2
+
+    loop1.stop_auto_read_loop()
+    loop2.stop_auto_read_loop()
+    assert get_scheduler().jobs == jobs
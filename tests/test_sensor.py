@@ -1,18 +1,55 @@
+from unittest.mock import Mock
+
 import pytest
 from homeassistant.const import CONF_PORT
 
-from custom_components.gpio_integration.controllers.sensor import DHT22Controller
+from custom_components.gpio_integration._devices import (
+    DHT22Data,
+    EdgeCapture,
+    PiGPIOEdgeBackend,
+    PiGPIOStartSignal,
+    SleepStartSignal,
+    WhenChangedEdgeBackend,
+    create_edge_backend,
+    create_start_signal,
+    SINGLE_WIRE_PROTOCOLS,
+)
+from custom_components.gpio_integration._scheduler import (
+    ExponentialBackoff,
+    Scheduler,
+)
+from custom_components.gpio_integration._stats import get_statistics
+from custom_components.gpio_integration.controllers import sensor as sensor_controllers
+from custom_components.gpio_integration.controllers.sensor import (
+    DHT22Controller,
+    get_temperature_source,
+)
+from custom_components.gpio_integration.core import DOMAIN
+from custom_components.gpio_integration.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.gpio_integration.hub import Hub
 from custom_components.gpio_integration.schemas import CONF_NAME
-from custom_components.gpio_integration.schemas.sensor import DHT22Config
+from custom_components.gpio_integration.schemas.sensor import (
+    CONF_FILTER,
+    CONF_FILTER_WINDOW,
+    CONF_PROTOCOL,
+    DHT22Config,
+    validate_sensor_dht22_data,
+)
 from custom_components.gpio_integration.sensor import GpioSensor
 from tests.test__mocks import get_next_pin
+from tests.test_scheduler import FakeClock
 
 
-def _create_config(port):
+def _create_config(port, filter="none", filter_window=5, protocol="DHT22"):
     return DHT22Config(
         {
             CONF_NAME: "Test Name",
             CONF_PORT: port,
+            CONF_PROTOCOL: protocol,
+            CONF_FILTER: filter,
+            CONF_FILTER_WINDOW: filter_window,
         }
     )
 
@@ -23,7 +60,7 @@ def test__DHT22_should_init_default_state(mocked_factory):
     config = _create_config(port)
     controller = DHT22Controller(config)
     sensors = controller.get_sensors()
-    assert len(sensors) == 2
+    assert len(sensors) == 8
     with GpioSensor(sensors[0]) as gpio:
         controller.stop_auto_read_loop()
 
@@ -38,14 +75,21 @@ def test__DHT22_should_init_default_state(mocked_factory):
         assert pin.bounce == 0.000_005
 
 
-def _send_DHT22_data(io, bits: str):
+def _send_DHT22_data(
+    io,
+    bits: str,
+    response=(0.000_08, 0.000_08),
+    bit_low=0.000_05,
+    zero=0.000_026,
+    one=0.000_07,
+):
     io.clear_states()
-    data = [(1, 0.01), (0, 0.000_08), (1, 0.000_08)]
+    data = [(1, 0.01), (0, response[0]), (1, response[1])]
     for bit in bits.replace(" ", ""):
-        data.append((0, 0.000_05))
-        data.append((1, 0.000_026 if bit == "0" else 0.000_07))
+        data.append((0, bit_low))
+        data.append((1, zero if bit == "0" else one))
 
-    data.append((0, 0.000_05))
+    data.append((0, bit_low))
 
     io._last_change = 0
     for bit, time in data:
@@ -91,6 +135,22 @@ def test__DHT22_should_retrieve_negative_temp(mocked_factory):
         assert temperature.native_value == -14.7
 
 
+def test__DHT22_should_be_temperature_source(mocked_factory):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = DHT22Controller(_create_config(port))
+    controller.stop_auto_read_loop()
+    assert get_temperature_source(controller.id) is controller
+    assert controller.temperature is None
+
+    controller._io.read()
+    _send_DHT22_data(pin, "00000010 10001100 00000001 01011111 11101110")
+    assert controller.temperature == 35.1
+
+    controller.release()
+    assert get_temperature_source(controller.id) is None
+
+
 @pytest.mark.asyncio
 async def test__DHT22_will_close_pin(mocked_factory):
     number = get_next_pin()
@@ -100,3 +160,646 @@ async def test__DHT22_will_close_pin(mocked_factory):
     await gpio.async_will_remove_from_hass()
     assert pin.closed is True
     assert gpio._io is None
+
+
+@pytest.mark.asyncio
+async def test__DHT22_should_keep_pin_until_last_sensor_is_removed(mocked_factory):
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    sensors = DHT22Controller(_create_config(number)).get_sensors()
+    temperature = GpioSensor(sensors[0])
+    success_rate = GpioSensor(sensors[2])
+    await temperature.async_added_to_hass()
+    await success_rate.async_added_to_hass()
+
+    await success_rate.async_will_remove_from_hass()
+    assert pin.closed is False
+
+    await temperature.async_will_remove_from_hass()
+    assert pin.closed is True
+
+
+def test__DHT22_should_retrieve_positive_temp_with_high_bit(mocked_factory):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = DHT22Controller(_create_config(port))
+    sensors = controller.get_sensors()
+    with GpioSensor(sensors[0]) as temperature:
+        controller.stop_auto_read_loop()
+
+        controller._io.read()
+        _send_DHT22_data(
+            pin,
+            "00000010 10001100 00000000 10000000 00001110",
+        )
+
+        assert temperature.native_value == 12.8
+
+
+def test__DHT22_should_stop_on_invalid_start_bits(mocked_factory):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = DHT22Controller(_create_config(port))
+    with GpioSensor(controller.get_sensors()[0]) as temperature:
+        controller.stop_auto_read_loop()
+
+        controller._io.read()
+        pin.clear_states()
+        pin._last_change = 0
+        for _ in range(90):
+            pin._state = not pin._state
+            pin._last_change += 0.000_05
+            if pin._when_changed is not None:
+                pin._call_when_changed()
+
+        assert pin._when_changed is None
+        assert temperature.native_value == 0.0
+
+
+DHT22_PROTOCOL = SINGLE_WIRE_PROTOCOLS["DHT22"]
+
+
+def test__frame_from_durations_should_decode_bits():
+    durations = [0.01, 0.08, 0.08] + [0.05, 0.026, 0.05, 0.07] * 20
+    assert DHT22_PROTOCOL.find_start(durations, 1) == 2
+    # the host high after the 18ms start low is not the response
+    assert DHT22_PROTOCOL.find_start([1, 18, 0.08] + durations[1:], 1) == 4
+    assert DHT22_PROTOCOL.frame_from_durations(durations, 2) == int("01" * 20, 2)
+
+
+def test__frame_from_durations_should_fail_on_invalid_bit():
+    durations = [0.08] + [0.05, 0.026] * 39 + [0.05, 0.1]
+    with pytest.raises(ValueError):
+        DHT22_PROTOCOL.frame_from_durations(durations, 0)
+
+
+def test__frame_from_durations_should_fail_on_incomplete_frame():
+    durations = [0.08] + [0.05, 0.026] * 39
+    with pytest.raises(ValueError):
+        DHT22_PROTOCOL.frame_from_durations(durations, 0)
+
+
+@pytest.mark.parametrize(
+    "protocol, frame, expected",
+    [
+        ("DHT22", "00000010 10001100 00000001 01011111 11101110", (35.1, 65.2)),
+        ("AM2302", "00000010 10001100 10000000 01100101 01110011", (-10.1, 65.2)),
+        ("AM2320", "00000010 10001100 00000001 01011111 11101110", (35.1, 65.2)),
+        ("DHT11", "00101101 00000011 00011000 00000101 01001101", (24.5, 45.3)),
+        ("DHT11", "00101101 00000011 00000010 10000101 10110111", (-2.5, 45.3)),
+        ("DHT11", "00101101 00000011 00011000 00000101 01001111", None),
+    ],
+)
+def test__SingleWireProtocol_should_decode_frame(protocol, frame, expected):
+    data = SINGLE_WIRE_PROTOCOLS[protocol].decode(int(frame.replace(" ", ""), 2))
+    if expected is None:
+        assert data is None
+    else:
+        assert (round(data.temperature, 1), round(data.humidity, 1)) == expected
+
+
+def test__DHT22_controller_should_read_DHT11(mocked_factory):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = DHT22Controller(_create_config(port, protocol="DHT11"))
+    controller.stop_auto_read_loop()
+    assert controller._io.protocol.min_sampling_sec == 1.0
+
+    controller._read()
+    _send_DHT22_data(pin, "00101101 00000011 00011000 00000101 01001101")
+
+    assert controller.get_state("test_name_T") == 24.5
+    assert controller.get_state("test_name_H") == 45.3
+    controller.release()
+
+
+def test__DHT22_controller_should_read_DHT11_timings(mocked_factory):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = DHT22Controller(_create_config(port, protocol="DHT11"))
+    controller.stop_auto_read_loop()
+
+    # 83us low and 87us high response, 54us bit low, 23us (0) and 74us (1)
+    controller._read()
+    _send_DHT22_data(
+        pin,
+        "00101101 00000011 00011000 00000101 01001101",
+        response=(0.000_083, 0.000_087),
+        bit_low=0.000_054,
+        zero=0.000_023,
+        one=0.000_074,
+    )
+
+    assert controller.statistics.successful_reads == 1
+    assert controller.get_state("test_name_T") == 24.5
+    assert controller.get_state("test_name_H") == 45.3
+    controller.release()
+
+
+def test__DHT22_should_count_successful_reads(mocked_factory):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = DHT22Controller(_create_config(port))
+    sensors = {sensor.id: sensor for sensor in controller.get_sensors()}
+    controller.stop_auto_read_loop()
+
+    controller._read()
+    _send_DHT22_data(pin, "00000010 10001100 00000001 01011111 11101110")
+
+    with GpioSensor(sensors["test_name_success_rate"]) as success_rate:
+        assert success_rate.native_value == 100.0
+        assert success_rate._attr_entity_category == "diagnostic"
+        assert success_rate._attr_entity_registry_enabled_default is False
+        assert GpioSensor(sensors["test_name_read_latency"]).native_value >= 0
+        assert GpioSensor(sensors["test_name_last_read_age"]).native_value >= 0
+
+        stats = get_statistics("test_name")["test_name"]
+        assert stats["reads"] == 1
+        assert stats["edges"]["last"] == 83
+        assert stats["read_latency_ms"]["count"] == 1
+
+
+def test__DHT22_should_count_check_sum_failures_and_retries(mocked_factory):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = DHT22Controller(_create_config(port))
+    controller.stop_auto_read_loop()
+
+    controller._read()
+    _send_DHT22_data(pin, "00000010 10001100 00000001 01011111 11101111")
+
+    assert controller.statistics.checksum_failures == 1
+    assert controller.statistics.retries == 1
+    assert controller.statistics.success_rate == 0.0
+    assert controller.get_state("test_name_checksum_failures") == 1
+    assert controller.get_state("test_name_retries") == 1
+    assert controller._retry_job is not None
+
+    controller.release()
+    assert controller._retry_job is None
+    assert get_statistics("test_name") == {}
+
+
+class ManualScheduler(Scheduler):
+    def __init__(self):
+        self.clock = FakeClock()
+        super().__init__(min_gap_sec=0, clock=self.clock, autostart=False)
+
+
+@pytest.fixture
+def manual_scheduler(monkeypatch):
+    scheduler = ManualScheduler()
+    monkeypatch.setattr(sensor_controllers, "get_scheduler", lambda: scheduler)
+    return scheduler
+
+
+def _create_manual_controller(port, scheduler):
+    controller = DHT22Controller(_create_config(port))
+    controller.stop_auto_read_loop()
+    controller._clock = scheduler.clock
+    controller._backoff = ExponentialBackoff(2, 16, jitter=0)
+    return controller
+
+
+def test__DHT22_should_retry_from_scheduler_with_backoff(
+    mocked_factory, manual_scheduler
+):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = _create_manual_controller(port, manual_scheduler)
+
+    controller._read()
+    _send_DHT22_data(pin, "00000010 10001100 00000001 01011111 11101111")
+    assert controller.statistics.reads == 1
+    assert manual_scheduler.run_pending() == 2
+
+    manual_scheduler.clock.now = 2
+    manual_scheduler.run_pending()
+    assert controller.statistics.reads == 2
+    _send_DHT22_data(pin, "00000010 10001100 00000001 01011111 11101111")
+    assert manual_scheduler.run_pending() == 4
+
+    manual_scheduler.clock.now = 6
+    manual_scheduler.run_pending()
+    _send_DHT22_data(pin, "00000010 10001100 00000001 01011111 11101110")
+    assert controller.statistics.reads == 3
+    assert controller.statistics.successful_reads == 1
+    assert controller.get_state("test_name_T") == 35.1
+    assert controller._retry == 0
+    assert list(controller._cycles) == [True]
+    assert manual_scheduler.jobs == 0
+    controller.release()
+
+
+def test__DHT22_should_stop_retrying_after_max_retries(
+    mocked_factory, manual_scheduler
+):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = _create_manual_controller(port, manual_scheduler)
+
+    controller._read()
+    for now in (2, 6, 14):
+        _send_DHT22_data(pin, "00000010 10001100 00000001 01011111 11101111")
+        manual_scheduler.clock.now = now
+        manual_scheduler.run_pending()
+
+    _send_DHT22_data(pin, "00000010 10001100 00000001 01011111 11101111")
+    assert controller.statistics.reads == 4
+    assert controller.statistics.retries == 3
+    assert manual_scheduler.jobs == 0
+    assert list(controller._cycles) == [False]
+    controller.release()
+
+
+def test__DHT22_should_count_invalid_frames_and_retry(mocked_factory, manual_scheduler):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = _create_manual_controller(port, manual_scheduler)
+
+    controller._read()
+    pin.clear_states()
+    pin._last_change = 0
+    # the 0.1ms high level of the first bit is neither 0 nor 1
+    levels = [(1, 0.01), (0, 0.000_08), (1, 0.000_08), (0, 0.000_05), (1, 0.000_1)]
+    levels += [(0, 0.000_05), (1, 0.000_026)] * 40
+    for level, duration in levels:
+        pin._state = 1 if level == 0 else 0
+        pin._last_change += duration
+        if pin._when_changed is not None:
+            pin._call_when_changed()
+
+    assert controller.statistics.frame_failures == 1
+    assert controller.statistics.retries == 1
+    assert controller._retry_job is not None
+    assert pin._when_changed is None
+    controller.release()
+
+
+def test__DHT22_should_count_timeout_and_retry(mocked_factory, manual_scheduler):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = _create_manual_controller(port, manual_scheduler)
+
+    controller._read()
+    assert controller._timeout_job is not None
+    manual_scheduler.clock.now = 0.5
+    manual_scheduler.run_pending()
+
+    assert controller.statistics.timeouts == 1
+    assert controller.statistics.retries == 1
+    assert controller._retry_job is not None
+    assert pin._when_changed is None
+
+    manual_scheduler.clock.now = 2.5
+    manual_scheduler.run_pending()
+    _send_DHT22_data(pin, "00000010 10001100 00000001 01011111 11101110")
+    assert controller.statistics.successful_reads == 1
+    assert controller._timeout_job is None
+    assert manual_scheduler.jobs == 0
+    controller.release()
+
+
+def test__DHT22_release_should_cancel_the_jobs_before_closing(
+    mocked_factory, manual_scheduler
+):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = _create_manual_controller(port, manual_scheduler)
+    controller._read()
+    _send_DHT22_data(pin, "00000010 10001100 00000001 01011111 11101111")
+    controller._read_pending = True
+    assert manual_scheduler.jobs == 1
+
+    jobs_at_close = []
+    close = controller._io.close
+    controller._io.close = (
+        lambda: jobs_at_close.append(manual_scheduler.jobs) or close()
+    )
+    controller.release()
+
+    assert jobs_at_close == [0]
+    assert controller._io is None
+    assert controller._read_pending is False
+
+
+def test__DHT22_periodic_read_should_replace_pending_retry(
+    mocked_factory, manual_scheduler
+):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = _create_manual_controller(port, manual_scheduler)
+
+    controller._read()
+    _send_DHT22_data(pin, "00000010 10001100 00000001 01011111 11101111")
+    assert manual_scheduler.jobs == 1
+
+    manual_scheduler.clock.now = 1
+    controller._read()
+    assert manual_scheduler.jobs == 0
+    assert controller.statistics.reads == 1  # within the 2s sampling period
+    assert list(controller._cycles) == [False]
+    controller.release()
+
+
+def test__DHT22_should_adapt_poll_interval_to_failure_rate(
+    mocked_factory, manual_scheduler
+):
+    port = get_next_pin()
+    controller = _create_manual_controller(port, manual_scheduler)
+    assert controller.poll_interval_sec == 20
+
+    controller._cycles.extend([False] * 5)
+    controller._read()
+    assert controller.poll_interval_sec == 40
+    controller._cycles.extend([False] * 10)
+    controller._read()
+    controller._cycles.extend([False] * 10)
+    controller._read()
+    assert controller.poll_interval_sec == 80
+    assert get_statistics("test_name")["test_name"]["poll_interval_sec"] == 80
+
+    controller._cycles.extend([True] * 10)
+    controller._read()
+    assert controller.poll_interval_sec == 40
+    controller._cycles.extend([True] * 10)
+    controller._read()
+    controller._cycles.extend([True] * 10)
+    controller._read()
+    assert controller.poll_interval_sec == 20
+    controller.release()
+
+
+def test__DHT22_should_count_start_bits_failures(mocked_factory):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = DHT22Controller(_create_config(port))
+    controller.stop_auto_read_loop()
+
+    controller._read()
+    pin.clear_states()
+    pin._last_change = 0
+    for _ in range(90):
+        pin._state = not pin._state
+        pin._last_change += 0.000_05
+        if pin._when_changed is not None:
+            pin._call_when_changed()
+
+    assert controller.get_state("test_name_start_failures") == 1
+    controller.release()
+
+
+@pytest.mark.asyncio
+async def test__DHT22_diagnostics_should_return_statistics(mocked_factory):
+    port = get_next_pin()
+    controller = DHT22Controller(_create_config(port))
+    controller.stop_auto_read_loop()
+    hub = Hub.__new__(Hub)
+    hub.controller = controller
+    hass = Mock()
+    hass.data = {DOMAIN: {"entry": hub}}
+    entry = Mock()
+    entry.entry_id = "entry"
+    entry.data = {"type": "sensor_dht22"}
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["type"] == "sensor_dht22"
+    assert diagnostics["statistics"]["test_name"]["reads"] == 0
+    controller.release()
+
+
+def _capture_edges(capture: EdgeCapture, edges: list[tuple[float, int]]):
+    for ticks, state in edges:
+        index = capture.count % capture.size
+        capture.ticks[index] = ticks
+        capture.states[index] = state
+        capture.arrivals[index] = ticks + 0.000_01 * capture.count
+        capture.count += 1
+
+
+def test__EdgeCapture_should_return_durations_from_origin():
+    capture = EdgeCapture(4)
+    capture.clear(1.0)
+    _capture_edges(capture, [(1.5, 0), (2.0, 1), (3.0, 0)])
+
+    assert capture.durations_ms(lambda a, b: a - b) == [500.0, 500.0, 1000.0]
+    assert list(capture.edge_states()) == [0, 1, 0]
+
+
+def test__EdgeCapture_should_keep_last_edges_when_wrapped():
+    capture = EdgeCapture(3)
+    capture.clear(0.0)
+    _capture_edges(capture, [(1.0, 0), (2.0, 1), (4.0, 0), (7.0, 1), (11.0, 0)])
+
+    assert capture.durations_ms(lambda a, b: a - b) == [3000.0, 4000.0]
+    assert list(capture.edge_states()) == [1, 0]
+
+
+def test__EdgeCapture_should_report_callback_latency():
+    capture = EdgeCapture(8)
+    capture.clear(0.0)
+    _capture_edges(capture, [(1.0, 0), (2.0, 1), (3.0, 0)])
+
+    stats = capture.stats(lambda a, b: a - b)
+    assert stats.edges == 3
+    assert round(stats.max_latency_us, 2) == 20.0
+    assert round(stats.mean_latency_us, 2) == 10.0
+
+
+def test__DHT22_should_report_capture_stats(mocked_factory):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = DHT22Controller(_create_config(port))
+    controller.stop_auto_read_loop()
+
+    controller._io.read()
+    _send_DHT22_data(pin, "00000010 10001100 00000001 01011111 11101110")
+
+    assert controller._io.capture_stats.edges == 83
+    controller.release()
+
+
+class _PiGPIOCallback:
+    def __init__(self, gpio, edge, func):
+        self.args = (gpio, edge)
+        self.func = func
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class _PiGPIOPin:
+    def __init__(self, number):
+        self._number = number
+        self.factory = self
+        self.connection = self
+        self.callbacks = []
+
+    def callback(self, gpio, edge, func):
+        self.callbacks.append(_PiGPIOCallback(gpio, edge, func))
+        return self.callbacks[-1]
+
+    script_status_value = 2  # pigpio.PI_SCRIPT_HALTED
+    scripts = {}
+    runs = []
+
+    def store_script(self, script):
+        self.scripts[7] = script
+        return 7
+
+    def script_status(self, id):
+        return (self.script_status_value, ())
+
+    def run_script(self, id):
+        self.runs.append(id)
+
+    def delete_script(self, id):
+        del self.scripts[id]
+
+
+def test__PiGPIOEdgeBackend_should_pass_daemon_ticks():
+    pin = _PiGPIOPin(4)
+    backend = PiGPIOEdgeBackend(pin)
+    edges = []
+    backend.start(lambda ticks, state: edges.append((ticks, state)))
+
+    callback = pin.callbacks[0]
+    assert callback.args == (4, 2)
+    callback.func(4, 1, 1000)
+    callback.func(4, 2, 1500)  # watchdog timeout
+    callback.func(4, 0, 2000)
+    assert edges == [(1000, 1), (2000, 0)]
+    assert backend.hardware_timestamps is True
+
+    backend.stop()
+    assert callback.cancelled is True
+
+    # pigpio.RISING_EDGE
+    PiGPIOEdgeBackend(pin, "rising").start(lambda ticks, state: None)
+    assert pin.callbacks[1].args == (4, 0)
+
+
+def test__create_edge_backend_should_fallback_to_when_changed(mocked_factory):
+    pin = mocked_factory.pin(get_next_pin())
+    backend = create_edge_backend(pin)
+    assert isinstance(backend, WhenChangedEdgeBackend)
+    assert backend.hardware_timestamps is False
+
+
+def test__PiGPIOStartSignal_should_run_daemon_script_after_starting_edges():
+    pin = _PiGPIOPin(4)
+    pin.scripts, pin.runs = {}, []
+    start_signal = PiGPIOStartSignal(pin, 0.018)
+    calls = []
+
+    start_signal.send(lambda: calls.append(list(pin.runs)))
+
+    assert pin.scripts[7] == (b"m 4 w w 4 1 mils 1 w 4 0 mils 18 w 4 1 mics 40 m 4 r")
+    assert calls == [[]]
+    assert pin.runs == [7]
+
+    start_signal.close()
+    assert pin.scripts == {}
+
+
+def test__PiGPIOStartSignal_should_fallback_while_script_is_initializing(
+    mocked_factory,
+):
+    pin = _PiGPIOPin(4)
+    pin.scripts, pin.runs = {}, []
+    pin.script_status_value = PiGPIOStartSignal.SCRIPT_INITING
+    start_signal = PiGPIOStartSignal(pin, 0.018)
+    start_signal._fallback = Mock()
+    start_edges = Mock()
+
+    start_signal.send(start_edges)
+
+    start_signal._fallback.send.assert_called_once_with(start_edges)
+    assert pin.runs == []
+
+
+@pytest.mark.parametrize("host_high_sec", [0.000_06, 0.000_075, 0.000_085])
+def test__DHT22_should_skip_edges_of_the_start_signal_script(
+    mocked_factory, host_high_sec
+):
+    port = get_next_pin()
+    controller = DHT22Controller(_create_config(port))
+    controller.stop_auto_read_loop()
+    controller._io.read()
+    controller._io._capture.clear(0.0)
+
+    # the script edges are captured: 1ms high, 18ms low and the host high
+    # (40us, the script overhead and the sensor delay) before the response
+    levels = [(1, 0.001), (0, 0.018), (1, host_high_sec)]
+    levels += [(0, 0.000_08), (1, 0.000_08)]
+    for bit in "0000001010001100000000010101111111101110":
+        levels += [(0, 0.000_05), (1, 0.000_026 if bit == "0" else 0.000_07)]
+
+    ticks = 0.0
+    for level, duration in levels:
+        ticks += duration
+        controller._io._capture_edge(ticks, level ^ 1)
+
+    assert controller.statistics.successful_reads == 1
+    assert controller.get_state("test_name_T") == 35.1
+    assert controller.get_state("test_name_H") == 65.2
+    controller.release()
+
+
+def test__create_start_signal_should_fallback_to_sleep(mocked_factory):
+    pin = mocked_factory.pin(get_next_pin())
+    assert isinstance(create_start_signal(pin, 0.018), SleepStartSignal)
+
+
+def test__DHT22_should_send_start_signal_and_record_its_time(mocked_factory):
+    port = get_next_pin()
+    pin = mocked_factory.pin(port)
+    controller = DHT22Controller(_create_config(port))
+    controller.stop_auto_read_loop()
+    pin.clear_states()
+
+    controller._read()
+
+    states = [state.state for state in pin.states]
+    assert states[:4] == [False, True, False, True]
+    assert pin._function == "input"
+    assert controller._io.start_signal == "sleep"
+    assert controller._io.start_signal_time.blocked_ms >= 19
+    stats = get_statistics("test_name")["test_name"]["start_signal"]
+    assert stats["backend"] == "sleep"
+    assert stats["blocked_ms"]["count"] == 1
+    assert stats["cpu_ms"]["last"] < stats["blocked_ms"]["last"]
+    controller.release()
+
+
+def test__DHT22_should_filter_outliers(mocked_factory):
+    port = get_next_pin()
+    controller = DHT22Controller(_create_config(port, "median", 3))
+    controller.stop_auto_read_loop()
+
+    for temperature in (21.0, 21.2, 85.0, 21.1):
+        controller._on_data(DHT22Data(temperature, 50.0))
+
+    assert controller.get_state("test_name_T") == 21.2
+    assert controller.get_state("test_name_H") == 50.0
+    controller.release()
+
+
+def test__DHT22_config_should_validate_filter():
+    data = {
+        CONF_NAME: "Test",
+        CONF_PORT: 4,
+        CONF_PROTOCOL: "DHT11",
+        CONF_FILTER: "ema",
+        CONF_FILTER_WINDOW: 5,
+    }
+    assert validate_sensor_dht22_data(data)
+
+    with pytest.raises(ValueError):
+        validate_sensor_dht22_data({**data, CONF_PROTOCOL: "DS18B20"})
+    with pytest.raises(ValueError):
+        validate_sensor_dht22_data({**data, CONF_FILTER: "mean"})
+    with pytest.raises(ValueError):
+        validate_sensor_dht22_data({**data, CONF_FILTER_WINDOW: 16})
@@ -1,18 +1,41 @@
 import pytest
+from gpiozero import Device
+from gpiozero.pins.mock import MockFactory as GpiozeroMockFactory
 
+import custom_components.gpio_integration._devices as devices
+import custom_components.gpio_integration._pin_factory as pin_factory
+
+from custom_components.gpio_integration._devices import (
+    AnalogBus,
+    attach_analog_channel,
+    detach_analog_channel,
+    select_analog_channel,
+)
+from custom_components.gpio_integration._pin_factory import (
+    PiGPIOPool,
+    use_pin_factory_host,
+)
+from custom_components.gpio_integration._scheduler import Scheduler
 from custom_components.gpio_integration.hub import Hub
 from custom_components.gpio_integration.schemas.main import EntityTypes
 from custom_components.gpio_integration.schemas.sensor import (
+    CONF_CALIBRATION,
+    CONF_CALIBRATION_DATA,
     CONF_CHANNEL,
     CONF_CHIP,
     CONF_MIN_VALUE,
     CONF_MIN_VOLTAGE,
     CONF_NAME,
     CONF_NATIVE_UNIT,
+    CONF_OVERSAMPLING,
+    CONF_REDUCER,
+    CONF_REFERENCE_VOLTAGE,
+    validate_sensor_analog_step_data,
     CONF_STEP_VALUE,
     CONF_STEP_VOLTAGE,
 )
 from custom_components.gpio_integration.sensor import GpioSensor
+from tests.test_scheduler import FakeClock
 
 
 def _create_config(
@@ -23,6 +46,11 @@ def _create_config(
     step_voltage=0.01,
     step_value=0.5,
     native_unit="C",
+    oversampling=1,
+    reducer="mean",
+    reference_voltage=3.3,
+    calibration="linear",
+    calibration_data="",
 ):
     return {
         "type": EntityTypes.SENSOR_ANALOG_STEP.value,
@@ -34,28 +62,35 @@ def _create_config(
         CONF_STEP_VOLTAGE: step_voltage,
         CONF_STEP_VALUE: step_value,
         CONF_NATIVE_UNIT: native_unit,
+        CONF_OVERSAMPLING: oversampling,
+        CONF_REDUCER: reducer,
+        CONF_REFERENCE_VOLTAGE: reference_voltage,
+        CONF_CALIBRATION: calibration,
+        CONF_CALIBRATION_DATA: calibration_data,
     }
 
 
-def test__Sensor_AnalogStep_should_init(mock_MCP_chips):
+def test__Sensor_AnalogStep_should_init(mock_MCP_chips, manual_read_loop):
     hub = Hub(_create_config())
-    assert len(hub.sensors) == 1
+    assert len(hub.sensors) == 3
     with GpioSensor(hub.sensors[0]) as sensor:
+        manual_read_loop.run_pending()
         assert sensor.name == "Test Name"
         assert sensor.unique_id == "test_name"
         assert sensor.native_value == 10
         assert sensor._attr_native_unit_of_measurement == "C"
 
 
-def test__Sensor_AnalogStep_should_read(mock_MCP_chips):
+def test__Sensor_AnalogStep_should_read(mock_MCP_chips, manual_read_loop):
     hub = Hub(_create_config(channel=0))
     device = mock_MCP_chips(0)
     with GpioSensor(hub.sensors[0]) as sensor:
         device._value = 0.61 / 3.3
+        manual_read_loop.run_pending()
         assert sensor.native_value == 15.5
 
 
-def test__Sensor_AnalogStep_should_read2(mock_MCP_chips):
+def test__Sensor_AnalogStep_should_read2(mock_MCP_chips, manual_read_loop):
     hub = Hub(
         _create_config(
             channel=0, min_voltage=0.3, min_value=-10, step_voltage=0.05, step_value=1
@@ -64,25 +99,82 @@ def test__Sensor_AnalogStep_should_read2(mock_MCP_chips):
     device = mock_MCP_chips(0)
     with GpioSensor(hub.sensors[0]) as sensor:
         device._value = 2.3 / 3.3
+        manual_read_loop.run_pending()
         assert round(sensor.native_value, 2) == 30
 
 
-def test__Sensor_AnalogStep_should_read_below_min_voltage(mock_MCP_chips):
+def test__Sensor_AnalogStep_should_read_below_min_voltage(
+    mock_MCP_chips, manual_read_loop
+):
     hub = Hub(_create_config(channel=0))
     device = mock_MCP_chips(0)
     with GpioSensor(hub.sensors[0]) as sensor:
         device._value = 0.2 / 3.3  # Below min voltage
+        manual_read_loop.run_pending()
         assert sensor.native_value == 10
 
 
-def test__Sensor_AnalogStep_should_not_be_device(mock_MCP_chips):
+def test__Sensor_AnalogStep_should_not_be_device(mock_MCP_chips, manual_read_loop):
     hub = Hub(_create_config(channel=0))
     with GpioSensor(hub.sensors[0]) as sensor:
         assert sensor.device_info is None
 
 
+def test__Sensor_AnalogStep_should_oversample(mock_MCP_chips, manual_read_loop):
+    hub = Hub(_create_config(channel=0, oversampling=4))
+    device = mock_MCP_chips(0)
+    device._values = [v / 3.3 for v in [0.60, 0.62, 0.61, 0.61]]
+    with GpioSensor(hub.sensors[0]) as sensor:
+        manual_read_loop.run_pending()
+        assert round(sensor.native_value, 2) == 15.5
+        assert device.reads == 4
+
+
+def test__Sensor_AnalogStep_should_reduce_with_median(mock_MCP_chips, manual_read_loop):
+    hub = Hub(_create_config(channel=0, oversampling=5, reducer="median"))
+    device = mock_MCP_chips(0)
+    device._values = [v / 3.3 for v in [0.61, 3.3, 0.61, 0.0, 0.61]]
+    with GpioSensor(hub.sensors[0]) as sensor:
+        manual_read_loop.run_pending()
+        assert round(sensor.native_value, 2) == 15.5
+
+
+def test__Sensor_AnalogStep_should_expose_sampling_diagnostics(
+    mock_MCP_chips, manual_read_loop
+):
+    hub = Hub(_create_config(channel=0, oversampling=8))
+    sensors = {sensor.id: sensor for sensor in hub.sensors}
+
+    assert sensors["test_name_oversampling"].state == 8
+    assert sensors["test_name_spi_time"].state is None
+    assert sensors["test_name_oversampling"].entity_category == "diagnostic"
+
+    manual_read_loop.run_pending()
+    assert sensors["test_name"].state == 10
+    assert sensors["test_name_spi_time"].state >= 0
+
+
+def test__Sensor_AnalogStep_should_read_in_the_background(
+    mock_MCP_chips, manual_read_loop
+):
+    hub = Hub(_create_config(channel=0))
+    device = mock_MCP_chips(0)
+    device._value = 0.61 / 3.3
+    with GpioSensor(hub.sensors[0]) as sensor:
+        assert manual_read_loop.jobs == 1
+        assert sensor.native_value is None
+        assert device.reads == 0
+
+        manual_read_loop.run_pending()
+        assert sensor.native_value == 15.5
+        assert sensor.native_value == 15.5
+        assert device.reads == 1
+
+    assert manual_read_loop.jobs == 0
+
+
 @pytest.mark.asyncio
-async def test__MCP_will_close_pin(mock_MCP_chips):
+async def test__MCP_will_close_pin(mock_MCP_chips, manual_read_loop):
     hub = Hub(_create_config(channel=0))
     device = mock_MCP_chips(0)
     gpio = GpioSensor(hub.sensors[0])
@@ -91,3 +183,170 @@ async def test__MCP_will_close_pin(mock_MCP_chips):
 
     assert gpio._io is None
     assert device._closed is True
+
+
+@pytest.mark.asyncio
+async def test__MCP_should_keep_reading_when_diagnostic_is_removed(
+    mock_MCP_chips, manual_read_loop
+):
+    hub = Hub(_create_config(channel=0))
+    device = mock_MCP_chips(0)
+    value = GpioSensor(hub.sensors[0])
+    spi_time = GpioSensor(hub.sensors[2])
+    await value.async_added_to_hass()
+    await spi_time.async_added_to_hass()
+
+    await spi_time.async_will_remove_from_hass()
+    assert device._closed is False
+    assert manual_read_loop.jobs == 1
+
+    await value.async_will_remove_from_hass()
+    assert device._closed is True
+    assert manual_read_loop.jobs == 0
+
+
+def test__Sensor_AnalogStep_channels_should_share_the_chip_bus(
+    mock_MCP_chips, manual_read_loop
+):
+    hub0 = Hub(_create_config(chip="MCP3008", channel=0))
+    hub1 = Hub(_create_config(chip="MCP3008", channel=1))
+    channel0 = mock_MCP_chips(0)
+    channel1 = mock_MCP_chips(1)
+    channel0._value = 0.61 / 3.3
+    channel1._value = 0.71 / 3.3
+    try:
+        assert hub0.controller._io is hub1.controller._io
+        assert hub0.controller._io.channels == [0, 1]
+
+        # the channels read at their own phase, the second one from the cache
+        manual_read_loop.run_pending()
+        manual_read_loop.clock.now = hub1.controller._read_job.due
+        manual_read_loop.run_pending()
+
+        assert round(hub0.sensors[0].state, 2) == 15.5
+        assert round(hub1.sensors[0].state, 2) == 20.5
+        # a single scan read both channels
+        assert channel0.reads == 1
+        assert channel1.reads == 1
+    finally:
+        hub0.controller.release()
+        hub1.controller.release()
+
+
+def test__AnalogBus_should_scan_again_when_the_cache_is_old(mock_MCP_chips):
+    clock = FakeClock()
+    bus = AnalogBus("MCP3008", clock)
+    bus.attach(2, 3)
+    channel = mock_MCP_chips(2)
+
+    bus.read(2)
+    bus.read(2)
+    assert channel.reads == 3
+
+    clock.now = 1.0
+    bus.read(2)
+    assert channel.reads == 6
+
+
+def test__AnalogBus_should_select_the_channel_of_the_gpiozero_MCP(monkeypatch):
+    # the gpiozero mock factory, it has a software SPI on the mock pins
+    factory = GpiozeroMockFactory()
+    monkeypatch.setattr(Device, "pin_factory", factory)
+    bus = AnalogBus("MCP3008")
+    bus.attach(2)
+    bus.attach(5)
+    commands = []
+
+    def transfer(words):
+        commands.append(words)
+        channel = (words[1] >> 4) & 0b111
+        return [0, 0, channel * 40]
+
+    bus._io._spi.transfer = transfer
+    try:
+        channel2 = bus.read(2).values[0]
+        channel5 = bus.read(5).values[0]
+    finally:
+        bus.close()
+        factory.close()
+
+    # start bit, single-ended and the channel bits of the MCP3008 command
+    assert commands == [[1, 0b10100000, 0], [1, 0b11010000, 0]]
+    assert channel5 == pytest.approx(channel2 * 5 / 2, rel=0.05)
+
+
+def test__select_analog_channel_should_fail_without_the_channel():
+    with pytest.raises(RuntimeError):
+        select_analog_channel(object(), 1)
+
+
+def test__AnalogBus_should_validate_the_channel(mock_MCP_chips):
+    bus = AnalogBus("MCP3002")
+    bus.attach(1)
+
+    with pytest.raises(ValueError):
+        bus.attach(2)
+    with pytest.raises(ValueError):
+        bus.attach(1)
+
+
+def test__AnalogBus_should_close_after_the_last_channel(mock_MCP_chips):
+    bus = attach_analog_channel("MCP3004", 0)
+    attach_analog_channel("MCP3004", 3)
+    device = bus._io
+
+    detach_analog_channel(bus, 0)
+    assert device._closed is False
+
+    detach_analog_channel(bus, 3)
+    assert device._closed is True
+    assert attach_analog_channel("MCP3004", 0) is not bus
+
+
+def test__AnalogBus_should_be_shared_per_host(mock_MCP_chips, monkeypatch):
+    pool = PiGPIOPool(
+        create=lambda host: Device.pin_factory,
+        scheduler=Scheduler(min_gap_sec=0, autostart=False),
+    )
+    monkeypatch.setattr(pin_factory, "_PIGPIO_POOL", pool)
+    local = attach_analog_channel("MCP3008", 0)
+    with use_pin_factory_host("pi2"):
+        remote = attach_analog_channel("MCP3008", 0)
+
+    assert remote is not local
+    assert remote.host == "pi2"
+    assert pool.hosts == ["pi2"]
+
+    detach_analog_channel(remote, 0)
+    assert devices._ANALOG_BUSES == {("", "MCP3008"): local}
+    detach_analog_channel(local, 0)
+
+
+def test__Sensor_AnalogStep_should_use_the_calibration_table(
+    mock_MCP_chips, manual_read_loop
+):
+    config = _create_config(
+        channel=0,
+        reference_voltage=5.0,
+        calibration="table",
+        calibration_data="0.5:100, 1.5:25, 2.5:5",
+    )
+    hub = Hub(config)
+    device = mock_MCP_chips(0)
+    with GpioSensor(hub.sensors[0]) as sensor:
+        device._value = 1.0 / 5.0
+        manual_read_loop.run_pending()
+        assert round(sensor.native_value, 2) == 62.5
+
+
+def test__Sensor_AnalogStep_should_validate_the_calibration_data():
+    config = _create_config(
+        channel=1, calibration="polynomial", calibration_data="1, x"
+    )
+    with pytest.raises(ValueError):
+        validate_sensor_analog_step_data(config)
+
+    config = _create_config(
+        channel=1, calibration="polynomial", calibration_data="1, 2"
+    )
+    assert validate_sensor_analog_step_data(config) is True
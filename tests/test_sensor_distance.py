@@ -1,14 +1,27 @@
 import pytest
 from homeassistant.const import CONF_PORT
 
-from custom_components.gpio_integration.controllers.sensor import DistanceController
+import custom_components.gpio_integration.controllers.sensor as sensor_controllers
+from custom_components.gpio_integration._devices import (
+    SPEED_OF_SOUND,
+    DistanceSensor,
+    speed_of_sound,
+)
+from custom_components.gpio_integration.controllers.sensor import (
+    DistanceController,
+    DistanceFilter,
+)
 from custom_components.gpio_integration.schemas import CONF_NAME, CONF_PIN_TRIGGER
 from custom_components.gpio_integration.schemas.sensor import (
+    CONF_FILTER_WINDOW,
     CONF_MAX_DISTANCE,
+    CONF_MAX_RATE,
+    CONF_MEASURE_INTERVAL,
+    CONF_TEMPERATURE_SENSOR,
     DistanceSensorConfig,
 )
 from custom_components.gpio_integration.sensor import GpioSensor
-from tests.test__mocks import MockFactory, MockGpioZeroDevice, get_next_pin
+from tests.test__mocks import MockFactory, get_next_pin
 
 
 class GpioServoTestCase:
@@ -17,52 +30,195 @@ class GpioServoTestCase:
         self.gpio_trigger = get_next_pin()
         self.pin_echo = factory.pin(self.gpio_echo)
         self.pin_trigger = factory.pin(self.gpio_trigger)
-        self.create = lambda max_distance=1: DistanceSensorConfig(
-            {
-                CONF_NAME: "Test Distance",
-                CONF_PORT: self.gpio_echo,
-                CONF_PIN_TRIGGER: self.gpio_trigger,
-                CONF_MAX_DISTANCE: max_distance,
-            }
+        self.create = lambda max_distance=1, max_rate=0.0, temperature="": (
+            DistanceSensorConfig(
+                {
+                    CONF_NAME: "Test Distance",
+                    CONF_PORT: self.gpio_echo,
+                    CONF_PIN_TRIGGER: self.gpio_trigger,
+                    CONF_MAX_DISTANCE: max_distance,
+                    CONF_MEASURE_INTERVAL: 2,
+                    CONF_FILTER_WINDOW: 3,
+                    CONF_MAX_RATE: max_rate,
+                    CONF_TEMPERATURE_SENSOR: temperature,
+                }
+            )
         )
 
 
-def test__Distance_should_init_default_state(mocked_factory):
+class MockTemperatureSource:
+    def __init__(self, temperature: float | None):
+        self.temperature = temperature
+
+
+def _echo(device: DistanceSensor, *distances: float | None):
+    """Answer the next triggers with the echo of the distances (None = no echo)."""
+    answers = list(distances)
+    device.cycle_sec = 0
+
+    def send_trigger():
+        device.trigger.on()
+        device.trigger.off()
+        distance = answers.pop(0)
+        if distance is not None:
+            device._echo_edge(1.0, 1)
+            device._echo_edge(1.0 + 2 * distance / SPEED_OF_SOUND, 0)
+
+    device._send_trigger = send_trigger
+
+
+def test__Distance_should_init_default_state(mocked_factory, manual_read_loop):
     tc = GpioServoTestCase(mocked_factory)
     ctrl = DistanceController(tc.create())
+    _echo(ctrl._io, 0.0)
     with GpioSensor(ctrl.get_sensors()[0]) as gpio:
-        with MockGpioZeroDevice(ctrl._io, 0.0):
-            assert gpio.native_value == 0.0
-            assert gpio._attr_name == "Test Distance"
-            assert gpio._attr_unique_id == "test_distance"
-            assert gpio._attr_native_unit_of_measurement == "m"
-            assert gpio._attr_device_class == "distance"
+        manual_read_loop.run_pending()
+        assert gpio.native_value == 0.0
+        assert gpio._attr_name == "Test Distance"
+        assert gpio._attr_unique_id == "test_distance"
+        assert gpio._attr_native_unit_of_measurement == "m"
+        assert gpio._attr_device_class == "distance"
 
-            assert tc.pin_echo._function == "input"
-            assert tc.pin_trigger._function == "output"
+        assert tc.pin_echo._function == "input"
+        assert tc.pin_trigger._function == "output"
 
 
-def test__Distance_should_get_value(mocked_factory):
+def test__Distance_should_get_median_value(mocked_factory, manual_read_loop):
     tc = GpioServoTestCase(mocked_factory)
     ctrl = DistanceController(tc.create(2))
+    _echo(ctrl._io, 1.2, 1.8, 0.1, 1.5)
     with GpioSensor(ctrl.get_sensors()[0]) as gpio:
-        with MockGpioZeroDevice(ctrl._io, 0.6) as md:
-            assert gpio.native_value == 1.2
+        manual_read_loop.run_pending()
+        assert gpio.native_value == 1.2
 
-            md.value = 0.9
-            assert gpio.native_value == 1.8
+        for now, expected in [(2, 1.5), (4, 1.2), (6, 1.5)]:
+            manual_read_loop.clock.now = now
+            manual_read_loop.run_pending()
+            assert gpio.native_value == expected
 
 
-@pytest.mark.timeout(2)
-def test__Distance_should_not_block(mocked_factory):
+def test__Distance_should_measure_only_on_schedule(mocked_factory, manual_read_loop):
+    tc = GpioServoTestCase(mocked_factory)
+    ctrl = DistanceController(tc.create(2))
+    _echo(ctrl._io, 0.5, 0.7)
+    with GpioSensor(ctrl.get_sensors()[0]) as gpio:
+        manual_read_loop.run_pending()
+        manual_read_loop.clock.now = 1
+        manual_read_loop.run_pending()
+        assert gpio.native_value == 0.5
+
+        manual_read_loop.clock.now = 2
+        manual_read_loop.run_pending()
+        assert gpio.native_value == 0.6
+
+
+def test__Distance_should_keep_value_without_echo(mocked_factory, manual_read_loop):
     tc = GpioServoTestCase(mocked_factory)
     ctrl = DistanceController(tc.create(2))
+    _echo(ctrl._io, 0.4, None)
     with GpioSensor(ctrl.get_sensors()[0]) as gpio:
-        assert gpio.native_value is not None
+        manual_read_loop.run_pending()
+        manual_read_loop.clock.now = 2
+        manual_read_loop.run_pending()
+        assert gpio.native_value == 0.4
+
+
+def test__Distance_should_limit_rate_of_change(mocked_factory, manual_read_loop):
+    tc = GpioServoTestCase(mocked_factory)
+    # 0.05 m/s with a 2 sec interval is 0.1 m per measurement
+    ctrl = DistanceController(tc.create(2, max_rate=0.05))
+    _echo(ctrl._io, 1.0, 1.5, 1.5, 1.5)
+    with GpioSensor(ctrl.get_sensors()[0]) as gpio:
+        values = []
+        for now in range(0, 8, 2):
+            manual_read_loop.clock.now = now
+            manual_read_loop.run_pending()
+            values.append(gpio.native_value)
+
+        assert values == [1.0, 1.1, 1.2, 1.3]
+
+
+def test__Distance_should_compensate_temperature(
+    mocked_factory, manual_read_loop, monkeypatch
+):
+    tc = GpioServoTestCase(mocked_factory)
+    ctrl = DistanceController(tc.create(2, temperature="tank_air"))
+    _echo(ctrl._io, 1.0)
+    source = MockTemperatureSource(-10.0)
+    monkeypatch.setitem(sensor_controllers._TEMPERATURE_SOURCES, "tank_air", source)
+    manual_read_loop.run_pending()
+
+    assert ctrl._io.speed_of_sound == pytest.approx(speed_of_sound(-10.0))
+    # the echo time of 1m at 20°C is a shorter distance in the colder air
+    assert ctrl.get_state(None) == pytest.approx(
+        speed_of_sound(-10.0) / SPEED_OF_SOUND, abs=0.001
+    )
+    ctrl.release()
+
+
+def test__Distance_should_ignore_missing_temperature(mocked_factory, manual_read_loop):
+    tc = GpioServoTestCase(mocked_factory)
+    ctrl = DistanceController(tc.create(2, temperature="missing"))
+    _echo(ctrl._io, 1.0)
+    manual_read_loop.run_pending()
+
+    assert ctrl._io.speed_of_sound == SPEED_OF_SOUND
+    assert ctrl.get_state(None) == 1.0
+    ctrl.release()
+
+
+def test__DistanceFilter_should_drop_short_echo_and_limit():
+    distance_filter = DistanceFilter(3, 0.2)
+    values = [distance_filter.update(d) for d in [1.0, 0.1, 1.0, 2.0, 2.0, 2.0]]
+    assert values == pytest.approx([1.0, 0.8, 1.0, 1.0, 1.2, 1.4])
+
+
+def test__speed_of_sound_should_follow_temperature():
+    assert speed_of_sound(0) == pytest.approx(331.3)
+    assert speed_of_sound(20) == pytest.approx(SPEED_OF_SOUND, abs=0.1)
+    assert speed_of_sound(-10) < speed_of_sound(0) < speed_of_sound(35)
+
+
+def test__DistanceSensor_should_time_echo_pin(mocked_factory):
+    echo = get_next_pin()
+    pin = mocked_factory.pin(echo)
+    device = DistanceSensor(echo, get_next_pin(), 2)
+    device.cycle_sec = 0
+
+    def send_trigger():
+        pin._state = 1
+        pin._last_change = 5.0
+        pin._call_when_changed()
+        pin._state = 0
+        pin._last_change = 5.0 + 2 * 0.8 / SPEED_OF_SOUND
+        pin._call_when_changed()
+
+    device._send_trigger = send_trigger
+
+    assert device.measure() == pytest.approx(0.8)
+    device.close()
+
+
+def test__DistanceSensor_should_clamp_to_max_distance(mocked_factory):
+    device = DistanceSensor(get_next_pin(), get_next_pin(), 1)
+    _echo(device, 3.0)
+    assert device.measure() == 1
+
+    # the echo started, but did not end before the timeout
+    device._send_trigger = lambda: device._echo_edge(1.0, 1)
+    assert device.measure() == 1
+    device.close()
+
+
+@pytest.mark.timeout(2)
+def test__DistanceSensor_should_not_block_without_echo(mocked_factory):
+    device = DistanceSensor(get_next_pin(), get_next_pin(), 2)
+    assert device.measure() is None
+    device.close()
 
 
 @pytest.mark.asyncio
-async def test__Distance_will_close_pin(mocked_factory):
+async def test__Distance_will_close_pin(mocked_factory, manual_read_loop):
     tc = GpioServoTestCase(mocked_factory)
     ctrl = DistanceController(tc.create())
     gpio = GpioSensor(ctrl.get_sensors()[0])
@@ -0,0 +1,145 @@
+import pytest
+from homeassistant.const import CONF_PORT
+
+import custom_components.gpio_integration._base as base
+from custom_components.gpio_integration._devices import FrequencyCounter
+from custom_components.gpio_integration._scheduler import Scheduler
+from custom_components.gpio_integration.controllers.sensor import FrequencyController
+from custom_components.gpio_integration.schemas import CONF_NAME
+from custom_components.gpio_integration.schemas.sensor import (
+    CONF_FACTOR,
+    CONF_NATIVE_UNIT,
+    CONF_WINDOW,
+    FrequencySensorConfig,
+)
+from custom_components.gpio_integration.sensor import GpioSensor
+from tests.test__mocks import get_next_pin
+from tests.test_scheduler import FakeClock
+
+
+@pytest.fixture
+def frequency_scheduler(monkeypatch):
+    scheduler = Scheduler(min_gap_sec=0, clock=FakeClock(), autostart=False)
+    monkeypatch.setattr(base, "get_scheduler", lambda: scheduler)
+    return scheduler
+
+
+def _create_config(port, factor=1.0, unit="Hz"):
+    return FrequencySensorConfig(
+        {
+            CONF_NAME: "Test Flow",
+            CONF_PORT: port,
+            CONF_WINDOW: 5,
+            CONF_FACTOR: factor,
+            CONF_NATIVE_UNIT: unit,
+        }
+    )
+
+
+def _pulses(device: FrequencyCounter, start: float, period: float, count: int):
+    for index in range(count):
+        ticks = start + index * period
+        device._count_edge(ticks, 1)
+        device._count_edge(ticks + period / 2, 0)
+
+
+def test__FrequencyCounter_should_count_pin_pulses(mocked_factory):
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    clock = FakeClock()
+    device = FrequencyCounter(number, clock=clock)
+    for _ in range(4):
+        pin.drive_high()
+        pin.drive_low()
+
+    clock.now = 2.0
+    window = device.window()
+
+    assert device.hardware_timestamps is False
+    assert window.pulses == 4
+    assert window.frequency_hz == 2.0
+    assert device.window().pulses == 0
+    device.close()
+
+
+def test__FrequencyCounter_should_subscribe_to_the_pulse_edges_only(mocked_factory):
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    edges = []
+    device = FrequencyCounter(number, clock=FakeClock())
+
+    def record_edge(ticks, state):
+        edges.append(state)
+
+    # gpiozero keeps a weak reference to the callback
+    device._backend.start(record_edge)
+    for _ in range(3):
+        pin.drive_high()
+        pin.drive_low()
+
+    assert pin.edges == "rising"
+    assert edges == [1, 1, 1]
+    device.close()
+
+    inverted = FrequencyCounter(get_next_pin(), active_high=False, clock=FakeClock())
+    assert inverted.pin.edges == "falling"
+    inverted.close()
+
+
+def test__FrequencyCounter_should_not_have_hardware_timestamps_after_close(
+    mocked_factory,
+):
+    device = FrequencyCounter(get_next_pin(), clock=FakeClock())
+    device.close()
+
+    assert device.hardware_timestamps is False
+
+
+def test__FrequencyCounter_should_use_tick_deltas(mocked_factory):
+    device = FrequencyCounter(get_next_pin(), clock=FakeClock())
+    device._backend.hardware_timestamps = True
+
+    # the first pulse starts the first interval
+    _pulses(device, 10.0, 0.01, 11)
+    window = device.window()
+
+    assert window.pulses == 11
+    assert window.frequency_hz == pytest.approx(100.0)
+
+    # the interval from the last pulse of the previous window is counted
+    _pulses(device, 10.12, 0.02, 5)
+    window = device.window()
+
+    assert window.pulses == 5
+    assert window.frequency_hz == pytest.approx(50.0)
+    assert device.window().frequency_hz == 0.0
+    device.close()
+
+
+def test__FrequencyController_should_scale_the_frequency(
+    mocked_factory, frequency_scheduler
+):
+    ctrl = FrequencyController(_create_config(get_next_pin(), 60, "rpm"))
+    ctrl._io._backend.hardware_timestamps = True
+    with GpioSensor(ctrl.get_sensors()[0]) as gpio:
+        assert frequency_scheduler.jobs == 1
+        assert gpio.native_value is None
+        assert gpio._attr_native_unit_of_measurement == "rpm"
+
+        _pulses(ctrl._io, 1.0, 0.04, 26)
+        ctrl._read()
+
+        assert gpio.native_value == pytest.approx(1500.0)
+
+
+@pytest.mark.asyncio
+async def test__FrequencyController_will_close_pin(mocked_factory, frequency_scheduler):
+    number = get_next_pin()
+    pin = mocked_factory.pin(number)
+    ctrl = FrequencyController(_create_config(number))
+    gpio = GpioSensor(ctrl.get_sensors()[0])
+
+    await gpio.async_will_remove_from_hass()
+
+    assert pin.closed is True
+    assert frequency_scheduler.jobs == 0